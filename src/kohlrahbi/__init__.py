@@ -5,17 +5,27 @@ import fnmatch
 import gc
 import re
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Optional
 
+import attrs
 import click
-import docx  # type:ignore[import]
 import tomlkit
 
+from kohlrahbi.ahb.ahbsubtablecache import AhbSubTableCache
 from kohlrahbi.ahb.ahbtable import AhbTable
 from kohlrahbi.ahbfilefinder import AhbFileFinder
+from kohlrahbi.buildcache import BuildCache
+from kohlrahbi.enums import ExtractionEngine
+from kohlrahbi.fingerprint import get_fingerprint_of_file
+from kohlrahbi.irdocument import IrDocument, get_ir_path
 from kohlrahbi.logger import logger
-from kohlrahbi.read_functions import get_ahb_table
+from kohlrahbi.lxmldocument import LxmlDocument
+from kohlrahbi.outputmanifest import OutputManifest
+from kohlrahbi.pruefiindex import PruefiIndex, TableLocation
+from kohlrahbi.read_functions import AhbDocument, get_ahb_tables, open_ahb_document
 from kohlrahbi.unfoldedahb.unfoldedahbtable import UnfoldedAhb
 
 _pruefi_pattern = re.compile(r"^[1-9]\d{4}$")
@@ -101,6 +111,279 @@ def load_all_known_pruefis_from_file(
     return pruefis
 
 
+def group_pruefis_by_ahb_file_path(pruefis: list[str], input_path: Path) -> dict[Path, list[str]]:
+    """
+    Finds the docx files which may contain the given pruefis and groups the pruefis by these files.
+    The files are ordered such that, for each pruefi, its candidate files are visited in the order
+    in which the AhbFileFinder returns them.
+    """
+    ahb_file_paths_by_pruefi: dict[str, list[Path]] = {}
+    for pruefi in pruefis:
+        logger.info("start looking for pruefi '%s'", pruefi)
+        try:
+            ahb_file_finder = AhbFileFinder.from_input_path(input_path=input_path)
+            ahb_file_paths: list[Path] = ahb_file_finder.get_docx_files_which_may_contain_searched_pruefi(
+                searched_pruefi=pruefi
+            )
+        except Exception as general_error:  # pylint:disable=broad-except
+            logger.exception(
+                "There was an uncaught error while processing the pruefi '%s': %s",
+                pruefi,
+                str(general_error),
+                exc_info=True,
+            )
+            continue
+
+        if not any(ahb_file_paths):
+            logger.warning("No docx file was found for pruefi '%s'", pruefi)
+            continue
+        ahb_file_paths_by_pruefi[pruefi] = ahb_file_paths
+
+    # all candidate lists are sub sequences of the list of the latest AHB docx files
+    all_ahb_file_finder = AhbFileFinder.from_input_path(input_path=input_path)
+    all_ahb_file_finder.filter_for_latest_ahb_docx_files()
+
+    result: dict[Path, list[str]] = {}
+    for ahb_file_path in all_ahb_file_finder.paths_to_docx_files:
+        pruefis_in_file = [
+            pruefi for pruefi, ahb_file_paths in ahb_file_paths_by_pruefi.items() if ahb_file_path in ahb_file_paths
+        ]
+        if any(pruefis_in_file):
+            result[ahb_file_path] = pruefis_in_file
+    return result
+
+
+def _get_body_child_index_range(
+    known_table_locations: dict[str, Optional[TableLocation]], pruefis: list[str]
+) -> Optional[TableLocation]:
+    """
+    Returns the range of the body children which contain the tables of all given pruefis,
+    if the table locations of all of them are known. Otherwise, None is returned and the whole document has to be read.
+    """
+    table_locations = [known_table_locations.get(pruefi) for pruefi in pruefis]
+    if not any(table_locations) or any(table_location is None for table_location in table_locations):
+        return None
+    return (
+        min(table_location[0] for table_location in table_locations if table_location is not None),
+        max(table_location[1] for table_location in table_locations if table_location is not None),
+    )
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class ExtractionOptions:
+    """
+    The options of the extraction which are the same for all docx files of a run.
+    """
+
+    engine: ExtractionEngine = ExtractionEngine.PYTHON_DOCX
+    #: if given, the parsed docx tables are taken from and stored in this cache
+    ahb_sub_table_cache: Optional[AhbSubTableCache] = None
+
+
+def extract_ahb_tables_from_file(
+    ahb_file_path: Path,
+    pruefis: list[str],
+    options: ExtractionOptions,
+    body_child_index_range: Optional[TableLocation] = None,
+    ir_path: Optional[Path] = None,
+) -> tuple[dict[str, AhbTable], dict[str, Optional[TableLocation]]]:
+    """
+    Opens the docx file and extracts the AHB tables of the given pruefis in a single walk through the document.
+    If the intermediate representation of the docx file exists at the given ir_path, it is read instead of the
+    docx file.
+    Returns the found AHB tables and their locations in the document (None for the pruefis which are not in it).
+    This function runs in the worker processes if the extraction is parallelized.
+    """
+    document: Optional[AhbDocument] = None
+    if ir_path is not None and ir_path.exists():
+        logger.info("reading the intermediate representation of '%s'", str(ahb_file_path))
+        document = IrDocument.from_file(ir_path)
+    if document is None:
+        document = open_ahb_document(path=ahb_file_path, engine=options.engine)
+    logger.info("start reading docx file '%s'", str(ahb_file_path))
+    table_locations: dict[str, Optional[TableLocation]] = {}
+    ahb_tables: dict[str, AhbTable] = get_ahb_tables(
+        document=document,
+        pruefis=pruefis,
+        table_locations=table_locations,
+        body_child_index_range=body_child_index_range,
+        ahb_sub_table_cache=options.ahb_sub_table_cache,
+    )
+    return ahb_tables, table_locations
+
+
+def group_pruefis_by_ahb_table(
+    ahb_tables: dict[str, AhbTable], table_locations: dict[str, Optional[TableLocation]]
+) -> list[tuple[AhbTable, list[str]]]:
+    """
+    Groups the pruefis whose AHB tables were read from the same docx tables and are equal, so that each group can be
+    unfolded at once. Returns the AHB table of each group together with the pruefis of the group.
+    """
+    groups: list[tuple[AhbTable, list[str]]] = []
+    groups_by_table_location: dict[TableLocation, list[tuple[AhbTable, list[str]]]] = {}
+    for pruefi, ahb_table in ahb_tables.items():
+        table_location = table_locations.get(pruefi)
+        candidate_groups = groups_by_table_location.get(table_location, []) if table_location is not None else []
+        group = next((group for group in candidate_groups if group[0].table == ahb_table.table), None)
+        if group is not None:
+            group[1].append(pruefi)
+            continue
+        group = (ahb_table, [pruefi])
+        groups.append(group)
+        if table_location is not None:
+            groups_by_table_location.setdefault(table_location, []).append(group)
+    return groups
+
+
+def unfold_ahb_table(ahb_table: AhbTable, pruefis: list[str]) -> dict[str, UnfoldedAhb]:
+    """
+    Unfolds the AHB table for all given pruefis at once.
+    If this fails, the pruefis are unfolded one by one, so that an error of one pruefi does not affect the others.
+    The errors are logged and the pruefis which could not be unfolded are missing in the result.
+    """
+    try:
+        return UnfoldedAhb.from_ahb_table_multi(ahb_table=ahb_table, pruefis=pruefis)
+    except Exception as general_error:  # pylint:disable=broad-except
+        if len(pruefis) == 1:
+            _log_error_of_pruefi(pruefi=pruefis[0], general_error=general_error)
+            return {}
+    # unfold the pruefis one by one to find out which of them cause the error
+    unfolded_ahbs: dict[str, UnfoldedAhb] = {}
+    for pruefi in pruefis:
+        unfolded_ahbs.update(unfold_ahb_table(ahb_table=ahb_table, pruefis=[pruefi]))
+    return unfolded_ahbs
+
+
+def dump_unfolded_ahb(
+    unfolded_ahb: UnfoldedAhb, output_path: Path, file_type: list[str], deterministic_guids: bool = False
+) -> dict[str, Path]:
+    """
+    Saves the unfolded AHB in all requested file types and returns the paths of the dumped files by file type.
+    This function runs in the worker processes if the extraction is parallelized.
+    """
+    pruefi = unfolded_ahb.meta_data.pruefidentifikator
+    dumped_file_paths: dict[str, Optional[Path]] = {}
+
+    if "xlsx" in file_type:
+        logger.info("💾 Saving xlsx file %s", pruefi)
+        dumped_file_paths["xlsx"] = unfolded_ahb.dump_xlsx(path_to_output_directory=output_path)
+
+    if "flatahb" in file_type:
+        logger.info("💾 Saving flatahb file %s", pruefi)
+        dumped_file_paths["flatahb"] = unfolded_ahb.dump_flatahb_json(
+            output_directory_path=output_path, deterministic_guids=deterministic_guids
+        )
+
+    if "csv" in file_type:
+        logger.info("💾 Saving csv file %s", pruefi)
+        dumped_file_paths["csv"] = unfolded_ahb.dump_csv(path_to_output_directory=output_path)
+
+    return {
+        dumped_file_type: dumped_file_path
+        for dumped_file_type, dumped_file_path in dumped_file_paths.items()
+        if dumped_file_path is not None
+    }
+
+
+def _get_ir_path_of_ahb_file(
+    cache_path: Optional[Path], fingerprints: dict[Path, str], ahb_file_path: Path
+) -> Optional[Path]:
+    """
+    Returns the path of the intermediate representation of the docx file, if there is a cache.
+    """
+    if cache_path is None:
+        return None
+    return get_ir_path(cache_path=cache_path, fingerprint=fingerprints[ahb_file_path])
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class _ParallelExtraction:
+    """
+    Extracts the AHB tables of the docx files in a pool of processes.
+    Each process reads whole docx files, so that every file is opened only once.
+    Like in a sequential run, a pruefi is only searched in its next candidate file, if it has not been found in the
+    previous one. So each pruefi is submitted with its first candidate file and, if it is not found there, with its
+    next candidate file and so on.
+    """
+
+    executor: ProcessPoolExecutor
+    options: ExtractionOptions
+    #: the candidate docx files of each pruefi, in the order in which they are searched
+    candidate_files_by_pruefi: dict[str, list[Path]]
+    known_table_locations_by_ahb_file_path: dict[Path, dict[str, Optional[TableLocation]]]
+    #: the paths of the intermediate representations of the docx files, if there is a cache
+    ir_paths: dict[Path, Optional[Path]]
+    #: the pending extractions of each docx file together with the pruefis which are searched in them
+    futures: dict[Path, list[tuple[list[str], Future]]] = attrs.field(factory=dict)
+
+    def submit(self, ahb_file_path: Path, pruefis: list[str]) -> None:
+        """
+        Submit the extraction of the given pruefis from the docx file.
+        """
+        futures_of_file = self.futures.setdefault(ahb_file_path, [])
+        if any(futures_of_file) and futures_of_file[-1][1].cancel():
+            # the previous extraction of this file has not started yet, so the file is read once for all pruefis
+            pruefis = futures_of_file.pop()[0] + pruefis
+        future = self.executor.submit(
+            extract_ahb_tables_from_file,
+            ahb_file_path=ahb_file_path,
+            pruefis=pruefis,
+            options=self.options,
+            body_child_index_range=_get_body_child_index_range(
+                self.known_table_locations_by_ahb_file_path[ahb_file_path], pruefis
+            ),
+            ir_path=self.ir_paths[ahb_file_path],
+        )
+        futures_of_file.append((pruefis, future))
+
+    def submit_to_next_candidate_files(self, ahb_file_path: Path, pruefis: list[str]) -> None:
+        """
+        Submit the pruefis, which have not been found in the given docx file, with their next candidate files.
+        """
+        pruefis_by_next_candidate_file: dict[Path, list[str]] = {}
+        for pruefi in pruefis:
+            candidate_files = self.candidate_files_by_pruefi[pruefi]
+            next_candidate_file_index = candidate_files.index(ahb_file_path) + 1
+            if next_candidate_file_index < len(candidate_files):
+                next_candidate_file = candidate_files[next_candidate_file_index]
+                pruefis_by_next_candidate_file.setdefault(next_candidate_file, []).append(pruefi)
+        for next_candidate_file, pruefis_of_file in pruefis_by_next_candidate_file.items():
+            self.submit(next_candidate_file, pruefis_of_file)
+
+    def get_results(
+        self, ahb_file_path: Path
+    ) -> tuple[list[str], dict[str, AhbTable], dict[str, Optional[TableLocation]]]:
+        """
+        Wait for the extractions of the docx file.
+        Returns the pruefis which have been searched together with the found AHB tables and their locations.
+        """
+        searched_pruefis: list[str] = []
+        ahb_tables: dict[str, AhbTable] = {}
+        table_locations: dict[str, Optional[TableLocation]] = {}
+        for pruefis, future in self.futures.pop(ahb_file_path, []):
+            ahb_tables_of_future, table_locations_of_future = future.result()
+            searched_pruefis.extend(pruefis)
+            ahb_tables.update(ahb_tables_of_future)
+            table_locations.update(table_locations_of_future)
+        return searched_pruefis, ahb_tables, table_locations
+
+    def cancel(self, ahb_file_path: Path) -> None:
+        """
+        Cancel the extractions of the docx file, because all its pruefis have been found in previous files.
+        """
+        for _, future in self.futures.pop(ahb_file_path, []):
+            future.cancel()
+
+
+def _log_error_of_pruefi(pruefi: str, general_error: Exception) -> None:
+    logger.exception(
+        "There was an uncaught error while processing the pruefi '%s': %s",
+        pruefi,
+        str(general_error),
+        exc_info=general_error,
+    )
+
+
 @click.command()
 @click.option(
     "-p",
@@ -136,8 +419,46 @@ def load_all_known_pruefis_from_file(
     is_flag=True,
     help="Confirm all prompts automatically.",
 )
-# pylint: disable=too-many-branches, too-many-statements, too-many-locals
-def main(pruefis: list[str], input_path: Path, output_path: Path, file_type: list[str], assume_yes: bool):
+@click.option(
+    "--cache-path",
+    type=click.Path(exists=False, dir_okay=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Define a directory for caches which are reused in later runs (e.g. an index of the pruefi locations).",
+)
+@click.option(
+    "--engine",
+    type=click.Choice([engine.value for engine in ExtractionEngine], case_sensitive=False),
+    default=ExtractionEngine.PYTHON_DOCX.value,
+    show_default=True,
+    help="Choose the engine which reads the docx files. All engines produce the same output, but lxml is faster"
+    " and lxml-streaming needs the least memory.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of processes which read the docx files in parallel. Each process reads whole docx files.",
+)
+@click.option(
+    "--deterministic-guids",
+    is_flag=True,
+    help="Derive the guids of the flatahb lines from their content instead of reusing the guids of existing files.",
+)
+# pylint: disable=too-many-branches, too-many-statements, too-many-locals, too-many-arguments
+# pylint: disable=too-many-positional-arguments
+def main(
+    pruefis: list[str],
+    input_path: Path,
+    output_path: Path,
+    file_type: list[str],
+    assume_yes: bool,
+    cache_path: Optional[Path],
+    engine: str,
+    jobs: int,
+    deterministic_guids: bool,
+):
     """
     A program to get a machine readable version of the AHBs docx files published by edi@energy.
     """
@@ -168,67 +489,268 @@ def main(pruefis: list[str], input_path: Path, output_path: Path, file_type: lis
     if len(valid_pruefis) != len(pruefis):
         click.secho("☝️ Not all given pruefidentifikatoren are valid.", fg="yellow")
         click.secho(f"I will continue with the following valid pruefis: {valid_pruefis}.", fg="yellow")
-    path_to_document_mapping: dict[Path, docx.Document] = {}
 
-    for pruefi in valid_pruefis:
-        try:
-            logger.info("start looking for pruefi '%s'", pruefi)
-            ahb_file_finder = AhbFileFinder.from_input_path(input_path=input_path)
-            ahb_file_paths: list[Path] = ahb_file_finder.get_docx_files_which_may_contain_searched_pruefi(
-                searched_pruefi=pruefi
+    pruefis_by_ahb_file_path: dict[Path, list[str]] = group_pruefis_by_ahb_file_path(
+        pruefis=valid_pruefis, input_path=input_path
+    )
+    pruefi_index: Optional[PruefiIndex] = None
+    build_cache: Optional[BuildCache] = None
+    ahb_sub_table_cache: Optional[AhbSubTableCache] = None
+    if cache_path is not None:
+        pruefi_index = PruefiIndex.from_file(cache_path / "pruefi_index.json")
+        build_cache = BuildCache.from_file(cache_path / "build_cache.json")
+        ahb_sub_table_cache = AhbSubTableCache(path=cache_path / "ahb_sub_tables")
+    extraction_options = ExtractionOptions(
+        engine=ExtractionEngine(engine.lower()), ahb_sub_table_cache=ahb_sub_table_cache
+    )
+    # lists the fingerprints of all files which are produced (or are up to date) in this run
+    output_manifest = OutputManifest(path=output_path / "manifest.json")
+
+    fingerprints: dict[Path, str] = {}
+    #: the fingerprints of the candidate docx files of each pruefi, in the order in which they are searched
+    source_fingerprints_by_pruefi: dict[str, list[str]] = {}
+    known_table_locations_by_ahb_file_path: dict[Path, dict[str, Optional[TableLocation]]] = {}
+    for ahb_file_path, pruefis_in_file in pruefis_by_ahb_file_path.items():
+        known_table_locations: dict[str, Optional[TableLocation]] = {}
+        if pruefi_index is not None:
+            fingerprints[ahb_file_path] = get_fingerprint_of_file(ahb_file_path)
+            for pruefi in pruefis_in_file:
+                source_fingerprints_by_pruefi.setdefault(pruefi, []).append(fingerprints[ahb_file_path])
+            known_table_locations = pruefi_index.get_table_locations(fingerprints[ahb_file_path])
+        # before we load a docx file, we check cheaply if the unknown pruefis appear in its text at all
+        pruefis_with_unknown_location = [pruefi for pruefi in pruefis_in_file if pruefi not in known_table_locations]
+        if any(pruefis_with_unknown_location):
+            pruefis_in_text = AhbFileFinder.get_pruefis_in_docx_file(ahb_file_path, pruefis_with_unknown_location)
+            pruefis_not_in_text: dict[str, Optional[TableLocation]] = {
+                pruefi: None for pruefi in pruefis_with_unknown_location if pruefi not in pruefis_in_text
+            }
+            if pruefi_index is not None and any(pruefis_not_in_text):
+                pruefi_index.add_table_locations(
+                    fingerprint=fingerprints[ahb_file_path],
+                    file_name=ahb_file_path.name,
+                    table_locations=pruefis_not_in_text,
+                )
+            known_table_locations = known_table_locations | pruefis_not_in_text
+        known_table_locations_by_ahb_file_path[ahb_file_path] = known_table_locations
+        # we know (from previous runs or from the text of the docx file) that these pruefis are not in this file
+        pruefis_by_ahb_file_path[ahb_file_path] = [
+            pruefi
+            for pruefi in pruefis_in_file
+            if pruefi not in known_table_locations or known_table_locations[pruefi] is not None
+        ]
+    if pruefi_index is not None:
+        pruefi_index.save()
+
+    if build_cache is not None:
+        # the pruefis whose docx files did not change since the last build are not extracted again
+        up_to_date_pruefis: set[str] = set()
+        for pruefi, source_fingerprints in source_fingerprints_by_pruefi.items():
+            up_to_date_output_file_paths = build_cache.get_up_to_date_output_file_paths(
+                pruefi=pruefi,
+                source_fingerprints=source_fingerprints,
+                output_path=output_path,
+                file_types=file_type,
+                deterministic_guids=deterministic_guids,
             )
-
-            if not any(ahb_file_paths):
-                logger.warning("No docx file was found for pruefi '%s'", pruefi)
+            if any(up_to_date_output_file_paths):
+                up_to_date_pruefis.add(pruefi)
+                for output_file_path in up_to_date_output_file_paths:
+                    output_manifest.add_file(output_file_path)
+        if any(up_to_date_pruefis):
+            logger.info("%i pruefis are up to date and will not be extracted again", len(up_to_date_pruefis))
+        pruefis_by_ahb_file_path = {
+            ahb_file_path: [pruefi for pruefi in pruefis_in_file if pruefi not in up_to_date_pruefis]
+            for ahb_file_path, pruefis_in_file in pruefis_by_ahb_file_path.items()
+        }
+
+    # with more than one job, the docx files are read in parallel by a pool of processes
+    executor: Optional[ProcessPoolExecutor]
+    with ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else nullcontext() as executor:
+        parallel_extraction: Optional[_ParallelExtraction] = None
+        if executor is not None:
+            candidate_files_by_pruefi: dict[str, list[Path]] = {}
+            for ahb_file_path, pruefis_in_file in pruefis_by_ahb_file_path.items():
+                for pruefi in pruefis_in_file:
+                    candidate_files_by_pruefi.setdefault(pruefi, []).append(ahb_file_path)
+            parallel_extraction = _ParallelExtraction(
+                executor=executor,
+                options=extraction_options,
+                candidate_files_by_pruefi=candidate_files_by_pruefi,
+                known_table_locations_by_ahb_file_path=known_table_locations_by_ahb_file_path,
+                ir_paths={
+                    ahb_file_path: _get_ir_path_of_ahb_file(cache_path, fingerprints, ahb_file_path)
+                    for ahb_file_path in pruefis_by_ahb_file_path
+                },
+            )
+            for ahb_file_path, pruefis_in_file in pruefis_by_ahb_file_path.items():
+                pruefis_with_this_first_candidate_file = [
+                    pruefi for pruefi in pruefis_in_file if candidate_files_by_pruefi[pruefi][0] == ahb_file_path
+                ]
+                if any(pruefis_with_this_first_candidate_file):
+                    parallel_extraction.submit(ahb_file_path, pruefis_with_this_first_candidate_file)
+        dump_futures: dict[str, Future] = {}
+        processed_pruefis: set[str] = set()
+
+        # we open each docx file only once and extract all pruefis from it in one walk through the document
+        for ahb_file_path, pruefis_in_file in pruefis_by_ahb_file_path.items():
+            # a pruefi is only searched in this file if it has not been found in any of its previous candidate files
+            searched_pruefis = [pruefi for pruefi in pruefis_in_file if pruefi not in processed_pruefis]
+            if not any(searched_pruefis):
+                if parallel_extraction is not None:
+                    parallel_extraction.cancel(ahb_file_path)
                 continue
+            known_table_locations = known_table_locations_by_ahb_file_path[ahb_file_path]
 
-            for ahb_file_path in ahb_file_paths:
-                if not (doc := path_to_document_mapping.get(ahb_file_path, None)):
-                    try:
-                        doc = docx.Document(ahb_file_path)  # Creating word reader object.
-                        path_to_document_mapping[ahb_file_path] = doc
-                        logger.debug("Saved %s document in cache", ahb_file_path)  # to not re-read it every time
-                    except IOError as ioe:
-                        logger.exception("There was an error opening the file '%s'", ahb_file_path, exc_info=True)
-                        raise click.Abort() from ioe
-
-                logger.info("start reading docx file '%s'", str(ahb_file_path))
-
-                ahb_table: AhbTable | None = get_ahb_table(
-                    document=doc,
-                    pruefi=pruefi,
+            try:
+                submitted_pruefis: list[str] = []
+                ahb_tables: dict[str, AhbTable] = {}
+                table_locations: dict[str, Optional[TableLocation]] = {}
+                if parallel_extraction is not None:
+                    submitted_pruefis, ahb_tables, table_locations = parallel_extraction.get_results(ahb_file_path)
+                # without parallel extraction all pruefis are searched here
+                pruefis_to_search_here = [pruefi for pruefi in searched_pruefis if pruefi not in submitted_pruefis]
+                if any(pruefis_to_search_here):
+                    body_child_index_range = _get_body_child_index_range(known_table_locations, pruefis_to_search_here)
+                    if body_child_index_range is not None:
+                        # the pruefi index tells us where the tables are, so we only have to read this part
+                        logger.info(
+                            "The pruefi index knows the tables of %s in '%s'",
+                            ", ".join(pruefis_to_search_here),
+                            ahb_file_path,
+                        )
+                    ahb_tables_found_here, table_locations_found_here = extract_ahb_tables_from_file(
+                        ahb_file_path=ahb_file_path,
+                        pruefis=pruefis_to_search_here,
+                        options=extraction_options,
+                        body_child_index_range=body_child_index_range,
+                        ir_path=_get_ir_path_of_ahb_file(cache_path, fingerprints, ahb_file_path),
+                    )
+                    ahb_tables.update(ahb_tables_found_here)
+                    table_locations.update(table_locations_found_here)
+            except IOError as ioe:
+                logger.exception("There was an error opening the file '%s'", ahb_file_path, exc_info=True)
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                raise click.Abort() from ioe
+            except Exception as general_error:  # pylint:disable=broad-except
+                logger.exception(
+                    "There was an uncaught error while processing the pruefis %s: %s",
+                    ", ".join(searched_pruefis),
+                    str(general_error),
+                    exc_info=True,
                 )
+                processed_pruefis.update(searched_pruefis)
+                continue
+            if pruefi_index is not None and any(pruefi not in known_table_locations for pruefi in searched_pruefis):
+                pruefi_index.add_table_locations(
+                    fingerprint=fingerprints[ahb_file_path],
+                    file_name=ahb_file_path.name,
+                    # pruefis whose tables could not be parsed are not in table_locations, so they are searched again
+                    table_locations={
+                        pruefi: table_locations[pruefi] for pruefi in searched_pruefis if pruefi in table_locations
+                    },
+                )
+                pruefi_index.save()
+
+            # the pruefis which have already been found in one of their previous candidate files are skipped
+            found_ahb_tables = {
+                pruefi: ahb_table for pruefi, ahb_table in ahb_tables.items() if pruefi not in processed_pruefis
+            }
+            processed_pruefis.update(found_ahb_tables)
+            if parallel_extraction is not None:
+                parallel_extraction.submit_to_next_candidate_files(
+                    ahb_file_path, [pruefi for pruefi in searched_pruefis if pruefi not in processed_pruefis]
+                )
+            # pruefis which share their AHB table are unfolded at once
+            for ahb_table, pruefis_of_ahb_table in group_pruefis_by_ahb_table(found_ahb_tables, table_locations):
+                unfolded_ahbs = unfold_ahb_table(ahb_table=ahb_table, pruefis=pruefis_of_ahb_table)
+                for pruefi, unfolded_ahb in unfolded_ahbs.items():
+                    if executor is not None:
+                        dump_futures[pruefi] = executor.submit(
+                            dump_unfolded_ahb,
+                            unfolded_ahb=unfolded_ahb,
+                            output_path=output_path,
+                            file_type=file_type,
+                            deterministic_guids=deterministic_guids,
+                        )
+                        continue
+                    try:
+                        dumped_file_paths = dump_unfolded_ahb(
+                            unfolded_ahb=unfolded_ahb,
+                            output_path=output_path,
+                            file_type=file_type,
+                            deterministic_guids=deterministic_guids,
+                        )
+                        for dumped_file_path in dumped_file_paths.values():
+                            output_manifest.add_file(dumped_file_path)
+                        if build_cache is not None:
+                            build_cache.add_build(
+                                pruefi=pruefi,
+                                source_fingerprints=source_fingerprints_by_pruefi[pruefi],
+                                output_path=output_path,
+                                output_file_paths=dumped_file_paths,
+                                deterministic_guids=deterministic_guids,
+                            )
+                    except Exception as general_error:  # pylint:disable=broad-except
+                        _log_error_of_pruefi(pruefi=pruefi, general_error=general_error)
+            del ahb_tables
+            gc.collect()
+            if build_cache is not None:
+                build_cache.save()
+
+        for pruefi, dump_future in dump_futures.items():
+            try:
+                dumped_file_paths = dump_future.result()
+                for dumped_file_path in dumped_file_paths.values():
+                    output_manifest.add_file(dumped_file_path)
+                if build_cache is not None:
+                    build_cache.add_build(
+                        pruefi=pruefi,
+                        source_fingerprints=source_fingerprints_by_pruefi[pruefi],
+                        output_path=output_path,
+                        output_file_paths=dumped_file_paths,
+                        deterministic_guids=deterministic_guids,
+                    )
+            except Exception as general_error:  # pylint:disable=broad-except
+                _log_error_of_pruefi(pruefi=pruefi, general_error=general_error)
+
+    if build_cache is not None:
+        build_cache.save()
+    output_manifest.save()
+    logger.info("The output manifest is saved at %s", output_manifest.path)
 
-                if ahb_table is None:
-                    continue
-
-                if isinstance(ahb_table, AhbTable):
-                    unfolded_ahb = UnfoldedAhb.from_ahb_table(ahb_table=ahb_table, pruefi=pruefi)
-
-                    if "xlsx" in file_type:
-                        logger.info("💾 Saving xlsx file %s", pruefi)
-                        unfolded_ahb.dump_xlsx(path_to_output_directory=output_path)
-
-                    if "flatahb" in file_type:
-                        logger.info("💾 Saving flatahb file %s", pruefi)
-                        unfolded_ahb.dump_flatahb_json(output_directory_path=output_path)
 
-                    if "csv" in file_type:
-                        logger.info("💾 Saving csv file %s", pruefi)
-                        unfolded_ahb.dump_csv(path_to_output_directory=output_path)
-                    break
-        except Exception as general_error:  # pylint:disable=broad-except
-            logger.exception(
-                "There was an uncaught error while processing the pruefi '%s': %s",
-                pruefi,
-                str(general_error),
-                exc_info=True,
-            )
+@click.command()
+@click.option(
+    "-i",
+    "--input_path",
+    type=click.Path(exists=True, dir_okay=True, file_okay=False, path_type=Path),
+    prompt="Input directory",
+    help="Define the path to the folder with the docx AHBs.",
+)
+@click.option(
+    "--cache-path",
+    type=click.Path(exists=False, dir_okay=True, file_okay=False, path_type=Path),
+    prompt="Cache directory",
+    help="Define the directory in which the intermediate representations are stored."
+    " Use the same directory as --cache-path of kohlrahbi.",
+)
+def extract_ir(input_path: Path, cache_path: Path):
+    """
+    Converts the latest docx AHBs into a compact intermediate representation (IR).
+    Later runs of kohlrahbi with the same --cache-path read the IR instead of the docx files.
+    """
+    check_python_version()
+    ahb_file_finder = AhbFileFinder.from_input_path(input_path=input_path)
+    ahb_file_finder.filter_for_latest_ahb_docx_files()
+    for ahb_file_path in ahb_file_finder.paths_to_docx_files:
+        ir_path = get_ir_path(cache_path=cache_path, fingerprint=get_fingerprint_of_file(ahb_file_path))
+        if ir_path.exists():
+            logger.info("The intermediate representation of '%s' exists already", ahb_file_path)
             continue
-        del ahb_table
-        if "unfolded_ahb" in locals():
-            del unfolded_ahb
-        gc.collect()
+        logger.info("Creating the intermediate representation of '%s'", ahb_file_path)
+        IrDocument.from_lxml_document(LxmlDocument.from_file(ahb_file_path)).to_file(ir_path)
+    click.secho(f"The intermediate representations are saved at {cache_path / 'ir'}", fg="green")
 
 
 if __name__ == "__main__":
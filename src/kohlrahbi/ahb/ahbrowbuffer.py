@@ -0,0 +1,67 @@
+"""
+This module contains the class AhbRowBuffer
+"""
+from typing import TYPE_CHECKING, Union
+
+from attrs import define, field
+
+from kohlrahbi.ahb.stringtable import StringTable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@define(auto_attribs=True, kw_only=True)
+class AhbRowBuffer:
+    """
+    The AhbRowBuffer collects the rows of an AHB (sub) table as plain lists of strings.
+    The cell parsers write into the current (last) row of the buffer.
+    """
+
+    column_headers: list[str]
+    rows: list[list[str]] = field(factory=list)
+    _column_indices: dict[str, int] = field(init=False)
+
+    def __attrs_post_init__(self):
+        self._column_indices = {column_header: index for index, column_header in enumerate(self.column_headers)}
+
+    def add_empty_row(self) -> None:
+        """
+        Adds a new row in which all values are empty strings. The new row becomes the current row.
+        """
+        self.rows.append([""] * len(self.column_headers))
+
+    def _get_column_index(self, column: Union[str, int]) -> int:
+        if isinstance(column, int):
+            return column
+        return self._column_indices[column]
+
+    def get_value(self, column: Union[str, int]) -> str:
+        """
+        Returns the value of the current row in the given column (either the column header or the column index).
+        """
+        return self.rows[-1][self._get_column_index(column)]
+
+    def set_value(self, column: Union[str, int], value: str) -> None:
+        """
+        Sets the value of the current row in the given column (either the column header or the column index).
+        """
+        self.rows[-1][self._get_column_index(column)] = value
+
+    def append_to_value(self, column: Union[str, int], text: str) -> None:
+        """
+        Appends the text to the value of the current row in the given column.
+        """
+        self.rows[-1][self._get_column_index(column)] += text
+
+    def to_string_table(self) -> StringTable:
+        """
+        Creates a StringTable with all rows of the buffer.
+        """
+        return StringTable(column_headers=list(self.column_headers), rows=self.rows)
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """
+        Creates a DataFrame with all rows of the buffer.
+        """
+        return self.to_string_table().to_dataframe()
@@ -2,16 +2,24 @@
 This module contains the AhbSubTable class.
 """
 
-from typing import Generator
+from typing import TYPE_CHECKING, Generator, Optional, Union
 
 import attrs
-import pandas as pd
 from docx.table import Table as DocxTable  # type:ignore[import]
 from docx.table import _Cell  # type:ignore[import]
 
+from kohlrahbi.ahb.ahbrowbuffer import AhbRowBuffer
+from kohlrahbi.ahb.ahbsubtablecache import AhbSubTableCache
 from kohlrahbi.ahb.ahbtablerow import AhbTableRow
+from kohlrahbi.ahb.stringtable import StringTable
+from kohlrahbi.cellfeatures import CellFeatures, EdifactStrukturCellFeatures
+from kohlrahbi.irdocument import IrTable
+from kohlrahbi.lxmldocument import LxmlTable
 from kohlrahbi.row_type_checker import RowType, get_row_type
-from kohlrahbi.seed import Seed
+from kohlrahbi.seed import AhbTableHeaderCache, Seed
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @attrs.define(auto_attribs=True, kw_only=True)
@@ -22,24 +30,22 @@ class AhbSubTable:
     """
 
     table_meta_data: Seed
-    table: pd.DataFrame
+    table: StringTable
 
     @staticmethod
     def _parse_docx_table(
-        table_meta_data: Seed, ahb_table_dataframe: pd.DataFrame, docx_table: DocxTable
-    ) -> pd.DataFrame:
-        for row in docx_table.rows:
-            sanitized_cells = list(AhbSubTable._iter_visible_cells(row=row))
-
-            current_edifact_struktur_cell = sanitized_cells[0]
+        table_meta_data: Seed, ahb_row_buffer: AhbRowBuffer, docx_table: Union[DocxTable, LxmlTable, IrTable]
+    ) -> None:
+        for sanitized_cells in AhbSubTable._iter_rows_of_visible_cell_features(docx_table=docx_table):
+            # the features of the edifact struktur cell are read once and shared by the row type check and the parser
+            edifact_struktur_cell = EdifactStrukturCellFeatures.from_cell_features(sanitized_cells[0])
 
             # check for row type
             current_row_type = get_row_type(
-                edifact_struktur_cell=current_edifact_struktur_cell,
+                edifact_struktur_cell=edifact_struktur_cell,
                 left_indent_position=table_meta_data.edifact_struktur_left_indent_position,
             )
 
-            edifact_struktur_cell = sanitized_cells[0]
             middle_cell = sanitized_cells[1]
             bedingung_cell = sanitized_cells[-1]
 
@@ -52,20 +58,9 @@ class AhbSubTable:
                     bedingung_cell=bedingung_cell,
                 )
 
-                ahb_table_row_dataframe = ahb_table_row.parse(row_type=current_row_type)
-
-                if ahb_table_row_dataframe is not None:
-                    ahb_table_dataframe = pd.concat([ahb_table_dataframe, ahb_table_row_dataframe], ignore_index=True)
-            # this case covers the page break situation
-            else:
-                ahb_table_row = AhbTableRow(
-                    seed=table_meta_data,
-                    edifact_struktur_cell=edifact_struktur_cell,
-                    middle_cell=middle_cell,
-                    bedingung_cell=bedingung_cell,
-                )
-
-                ahb_table_row.parse(row_type=table_meta_data.last_two_row_types[1])
+                ahb_table_row.parse(row_type=current_row_type, ahb_row_buffer=ahb_row_buffer)
+            # the else case covers the page break situation:
+            # the empty row after the repeated header contains no information, so nothing is written
 
             # An AhbSubTable can span over two pages.
             # But after every page break, even if we're still in the same subtable,
@@ -74,51 +69,71 @@ class AhbSubTable:
             # the last two row types.
             table_meta_data.last_two_row_types[1] = table_meta_data.last_two_row_types[0]
             table_meta_data.last_two_row_types[0] = current_row_type
-        return ahb_table_dataframe
 
     @staticmethod
-    def initialize_dataframe_with_columns(columns: list[str]) -> pd.DataFrame:
+    def initialize_dataframe_with_columns(columns: list[str]) -> "pd.DataFrame":
         """
         Initialize a new dataframe with the given columns
         """
-        return pd.DataFrame(
-            columns=columns,
-            dtype="str",
-        )
+        return StringTable(column_headers=columns).to_dataframe()
 
     @classmethod
-    def from_table_with_header(cls, docx_table: DocxTable) -> "AhbSubTable":
+    def _from_docx_table(
+        cls,
+        table_meta_data: Seed,
+        docx_table: Union[DocxTable, LxmlTable, IrTable],
+        ahb_sub_table_cache: Optional[AhbSubTableCache] = None,
+    ) -> "AhbSubTable":
         """
-        Create a new AhbSubTable instance from a docx table WITH header
+        Parse the docx table with the given seed or take the result from the cache, if the table was parsed before.
         """
+        ahb_row_buffer = AhbRowBuffer(column_headers=table_meta_data.column_headers)
+
+        if ahb_sub_table_cache is None:
+            cls._parse_docx_table(table_meta_data=table_meta_data, ahb_row_buffer=ahb_row_buffer, docx_table=docx_table)
+            return cls(table_meta_data=table_meta_data, table=ahb_row_buffer.to_string_table())
+
+        cache_key = ahb_sub_table_cache.get_key(docx_table=docx_table, seed=table_meta_data)
+        cached_parsing_result = ahb_sub_table_cache.load(cache_key)
+        if cached_parsing_result is not None:
+            # the seed has to be in the same state as if we had parsed the table
+            ahb_row_buffer.rows, table_meta_data.last_two_row_types = cached_parsing_result
+        else:
+            cls._parse_docx_table(table_meta_data=table_meta_data, ahb_row_buffer=ahb_row_buffer, docx_table=docx_table)
+            ahb_sub_table_cache.save(
+                cache_key, rows=ahb_row_buffer.rows, last_two_row_types=table_meta_data.last_two_row_types
+            )
+        return cls(table_meta_data=table_meta_data, table=ahb_row_buffer.to_string_table())
 
-        ahb_table_meta_data = Seed.from_table(docx_table=docx_table)
+    @classmethod
+    def from_table_with_header(
+        cls,
+        docx_table: Union[DocxTable, LxmlTable, IrTable],
+        ahb_sub_table_cache: Optional[AhbSubTableCache] = None,
+        table_header_cache: Optional[AhbTableHeaderCache] = None,
+    ) -> "AhbSubTable":
+        """
+        Create a new AhbSubTable instance from a docx table WITH header
+        """
 
-        ahb_table_dataframe = AhbSubTable.initialize_dataframe_with_columns(columns=ahb_table_meta_data.column_headers)
+        ahb_table_meta_data = Seed.from_table(docx_table=docx_table, table_header_cache=table_header_cache)
 
-        ahb_table_dataframe = cls._parse_docx_table(
-            table_meta_data=ahb_table_meta_data,
-            ahb_table_dataframe=ahb_table_dataframe,
-            docx_table=docx_table,
+        return cls._from_docx_table(
+            table_meta_data=ahb_table_meta_data, docx_table=docx_table, ahb_sub_table_cache=ahb_sub_table_cache
         )
 
-        return cls(table_meta_data=ahb_table_meta_data, table=ahb_table_dataframe)
-
     @classmethod
-    def from_headless_table(cls, tmd: Seed, docx_table: DocxTable) -> "AhbSubTable":
+    def from_headless_table(
+        cls,
+        tmd: Seed,
+        docx_table: Union[DocxTable, LxmlTable, IrTable],
+        ahb_sub_table_cache: Optional[AhbSubTableCache] = None,
+    ) -> "AhbSubTable":
         """
         Create a new AhbSubTable instance from a docx table WITHOUT header
         """
 
-        ahb_table_dataframe = AhbSubTable.initialize_dataframe_with_columns(columns=tmd.column_headers)
-
-        ahb_table_dataframe = cls._parse_docx_table(
-            table_meta_data=tmd,
-            ahb_table_dataframe=ahb_table_dataframe,
-            docx_table=docx_table,
-        )
-
-        return cls(table_meta_data=tmd, table=ahb_table_dataframe)
+        return cls._from_docx_table(table_meta_data=tmd, docx_table=docx_table, ahb_sub_table_cache=ahb_sub_table_cache)
 
     @staticmethod
     def _iter_visible_cells(row) -> Generator[_Cell, None, None]:
@@ -129,3 +144,16 @@ class AhbSubTable:
         table_row = row._tr  # pylint:disable=protected-access
         for table_column in table_row.tc_lst:
             yield _Cell(table_column, row.table)
+
+    @staticmethod
+    def _iter_rows_of_visible_cell_features(
+        docx_table: Union[DocxTable, LxmlTable, IrTable]
+    ) -> Generator[list[CellFeatures], None, None]:
+        """
+        Generate the features of the visible cells for each row of the given table.
+        """
+        if isinstance(docx_table, (LxmlTable, IrTable)):
+            yield from docx_table.iter_rows_of_visible_cells()
+            return
+        for row in docx_table.rows:
+            yield [CellFeatures.from_docx_cell(cell) for cell in AhbSubTable._iter_visible_cells(row=row)]
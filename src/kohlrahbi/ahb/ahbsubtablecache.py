@@ -0,0 +1,94 @@
+"""
+This module contains the AhbSubTableCache class.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import attrs
+from docx.table import Table as DocxTable  # type:ignore[import]
+from lxml import etree  # type:ignore[import]
+
+from kohlrahbi.enums import RowType
+from kohlrahbi.fingerprint import get_fingerprint_of_content
+from kohlrahbi.irdocument import IrTable
+from kohlrahbi.jsoncache import get_kohlrahbi_version
+from kohlrahbi.logger import logger
+from kohlrahbi.lxmldocument import LxmlTable
+from kohlrahbi.seed import Seed, _get_table_element
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class AhbSubTableCache:
+    """
+    The AhbSubTableCache stores the parsed rows of docx tables in a directory, so that they can be reused in later runs.
+    The parsing result of a docx table only depends on the raw XML of the table and on the seed it is parsed with.
+    So the entries are addressed by a hash of both (and of the kohlrahbi version), and identical tables are parsed
+    only once, even if they appear in different docx files or in different versions of an AHB.
+    """
+
+    path: Path
+    kohlrahbi_version: str = attrs.field(factory=get_kohlrahbi_version)
+
+    def get_key(self, docx_table: Union[DocxTable, LxmlTable, IrTable], seed: Seed) -> str:
+        """
+        Returns the key of the given table when it is parsed with the given seed.
+        The seed includes the last two row types, because they are the state which is passed from one table to the next.
+        """
+        hash_object = hashlib.sha256()
+        seed_parameters = [
+            self.kohlrahbi_version,
+            seed.column_headers,
+            seed.edifact_struktur_left_indent_position,
+            seed.middle_cell_left_indent_position,
+            seed.tabstop_positions,
+            seed.last_two_row_types,
+        ]
+        hash_object.update(json.dumps(seed_parameters).encode("utf-8"))
+        # the intermediate representation of a table contains the fingerprint of its XML, so it shares the entries
+        if isinstance(docx_table, IrTable):
+            table_fingerprint = docx_table.fingerprint
+        else:
+            table_fingerprint = get_fingerprint_of_content(etree.tostring(_get_table_element(docx_table)))
+        hash_object.update(table_fingerprint.encode("utf-8"))
+        return hash_object.hexdigest()
+
+    def _get_entry_path(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def load(self, key: str) -> Optional[tuple[list[list[str]], list[RowType]]]:
+        """
+        Returns the rows and the last two row types after parsing the table with the given key.
+        If the table is not in the cache (or the entry could not be read or is malformed), None is returned.
+        """
+        entry_path = self._get_entry_path(key)
+        if not entry_path.exists():
+            return None
+        try:
+            with open(entry_path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            rows = entry["rows"]
+            last_two_row_types = [RowType(row_type) for row_type in entry["last_two_row_types"]]
+        except (OSError, KeyError, TypeError, ValueError):
+            logger.warning("The cached sub table '%s' could not be read", entry_path, exc_info=True)
+            return None
+        if not isinstance(rows, list) or not all(
+            isinstance(row, list) and all(isinstance(cell, str) for cell in row) for row in rows
+        ):
+            logger.warning("The cached sub table '%s' is malformed", entry_path)
+            return None
+        return rows, last_two_row_types
+
+    def save(self, key: str, rows: list[list[str]], last_two_row_types: list[RowType]) -> None:
+        """
+        Stores the rows and the last two row types after parsing the table with the given key.
+        """
+        entry_path = self._get_entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        # the entry is written to a temporary file first, so that parallel processes never read incomplete entries
+        temporary_entry_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary_entry_path, "w", encoding="utf-8") as file:
+            json.dump({"rows": rows, "last_two_row_types": last_two_row_types}, file, ensure_ascii=False)
+        os.replace(temporary_entry_path, entry_path)
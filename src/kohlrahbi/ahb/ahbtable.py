@@ -5,11 +5,10 @@ from pathlib import Path
 from typing import Union
 
 import attrs
-import pandas as pd
 from maus.edifact import get_format_of_pruefidentifikator
-from more_itertools import peekable
 
 from kohlrahbi.ahb.ahbsubtable import AhbSubTable
+from kohlrahbi.ahb.stringtable import StringTable
 from kohlrahbi.logger import logger
 
 _column_letter_width_mapping: dict[str, Union[float, int]] = {
@@ -30,7 +29,7 @@ class AhbTable:
     This class contains the AHB table as you see it in the AHB documents, but in a machine readable format.
     """
 
-    table: pd.DataFrame
+    table: StringTable
 
     def fill_segment_gruppe_segment_dataelement(self) -> None:
         """
@@ -49,103 +48,90 @@ class AhbTable:
         Nachrichten-Kopfsegment
         Nachrichten-Kopfsegment     UNH
         Nachrichten-Kopfsegment     UNH    0062
-        """
-
-        latest_segement_gruppe: str = ""
-        latest_segement: str = ""
-        latest_datenelement: str = ""
-
-        for _, row in self.table.iterrows():
-            if row["Segment Gruppe"] != "":
-                latest_segement_gruppe = row["Segment Gruppe"]
-
-            if row["Segment"] != "":
-                latest_segement = row["Segment"]
 
-            if row["Datenelement"] != "":
-                latest_datenelement = row["Datenelement"]
-
-            if row["Segment Gruppe"] == "" and row["Codes und Qualifier"] != "" or row["Segment"] != "":
-                row["Segment Gruppe"] = latest_segement_gruppe
-                row["Segment"] = latest_segement
-                row["Datenelement"] = latest_datenelement
+        Lines with a code or a segment get the latest non-empty "Segment Gruppe", "Segment" and "Datenelement"
+        of the preceding lines (including the line itself), i.e. the three columns are forward filled for these lines.
+        """
+        column_indices_to_fill = [
+            self.table.column_index(column_header) for column_header in ["Segment Gruppe", "Segment", "Datenelement"]
+        ]
+        segment_gruppe_index, segment_index, _ = column_indices_to_fill
+        codes_und_qualifier_index = self.table.column_index("Codes und Qualifier")
+
+        latest_values = [""] * len(column_indices_to_fill)
+        for row in self.table.rows:
+            for position, column_index in enumerate(column_indices_to_fill):
+                if row[column_index] != "":
+                    latest_values[position] = row[column_index]
+            if (row[segment_gruppe_index] == "" and row[codes_und_qualifier_index] != "") or row[segment_index] != "":
+                for position, column_index in enumerate(column_indices_to_fill):
+                    row[column_index] = latest_values[position]
 
     @classmethod
     def from_ahb_sub_table(cls, ahb_sub_table: AhbSubTable) -> "AhbTable":
         """
         Create an AHB table from an AHB sub table
         """
-        return cls(table=ahb_sub_table.table)
+        return cls(table=ahb_sub_table.table.copy())
 
     def append_ahb_sub_table(self, ahb_sub_table: AhbSubTable) -> None:
         """
-        Append an AHB sub table to this AHB table instance
+        Append an AHB sub table to this AHB table instance.
+        The rows are copied, so that the sub table can be appended to the tables of other Prüfidentifikatoren, too.
         """
-        if self.table is None:
-            self.table = ahb_sub_table.table
-        else:
-            self.table = pd.concat([self.table, ahb_sub_table.table], ignore_index=True)
+        self.table.extend(ahb_sub_table.table)
 
     @staticmethod
-    def line_contains_only_segment_gruppe(raw_line: pd.Series) -> bool:
+    def lines_contain_only_segment_gruppe(table: StringTable) -> list[bool]:
         """
-        Returns true if the given raw line only contains some meaningful data in the "Segment Gruppe" key
+        Returns for each line of the given table, if it only contains some meaningful data
+        in the "Segment Gruppe" column
         """
-        for key, value in raw_line.items():
-            if key == "Segment Gruppe":
-                continue
-            if value is not None and len(value.strip()) > 0:
-                return False
-        return True
+        other_column_indices = [
+            column_index
+            for column_index, column_header in enumerate(table.column_headers)
+            if column_header != "Segment Gruppe"
+        ]
+        return [all(row[column_index].strip() == "" for column_index in other_column_indices) for row in table.rows]
 
     def sanitize(self) -> None:
         """
         In some cases there is the content of one cell splitted in two.
         We need to merge the content into one cell and delete the deprecated cell afterwards.
+
+        A line is merged with its next line, if it only contains a "Segment Gruppe" and the next line neither starts
+        a new segment group nor contains a segment. The conditions are evaluated for all lines at once by comparing
+        each line with its successor.
         """
-        index_of_lines_to_drop: list[int] = []
-
-        iterable_ahb_table = peekable(self.table.iterrows())
-        self.table.reset_index(drop=True, inplace=True)
-        for _, row in iterable_ahb_table:
-            index_of_next_row, next_row = iterable_ahb_table.peek(
-                (
-                    0,
-                    pd.Series(
-                        {
-                            "Segment Gruppe": "",
-                            "Segment": "",
-                            "Codes und Qualifier": "",
-                            "Beschreibung": "",
-                            "Bedingung": "",
-                        }
-                    ),
-                )
-            )
-
-            segment_gruppe_contains_multiple_lines = (
-                "Segment Gruppe" in row
-                and row["Segment Gruppe"]
-                and AhbTable.line_contains_only_segment_gruppe(row)
-                and not next_row["Segment Gruppe"].startswith("SG")
-                and not next_row["Segment"]
-            )
-            if segment_gruppe_contains_multiple_lines:
-                merged_segment_gruppe_content = " ".join([row["Segment Gruppe"], next_row["Segment Gruppe"]])
-                row["Segment Gruppe"] = merged_segment_gruppe_content.strip()
-
-                if not isinstance(index_of_next_row, int):
-                    raise TypeError(
-                        f"The 'index_of_next_row' must by of type `int` but it is '{type(index_of_next_row)}'"
-                    )
-
-                if index_of_next_row == 0:
-                    # this case is only for the first and last row. These lines should not get deleted.
-                    continue
-                index_of_lines_to_drop.append(index_of_next_row)
-
-        self.table.drop(index_of_lines_to_drop, inplace=True)
-        self.table.reset_index(drop=True, inplace=True)
+        table = self.table
+        if "Segment Gruppe" not in table.column_headers:
+            return
+
+        segment_gruppe_index = table.column_index("Segment Gruppe")
+        segment_gruppe = table.column("Segment Gruppe")
+        # the last line has no successor, so it is compared with an empty line
+        next_segment_gruppe = segment_gruppe[1:] + [""]
+        next_segment = table.column("Segment")[1:] + [""]
+
+        segment_gruppe_contains_multiple_lines: list[bool] = [
+            bool(segment_gruppe[index])
+            and line_contains_only_segment_gruppe
+            and not next_segment_gruppe[index].startswith("SG")
+            and not next_segment[index]
+            for index, line_contains_only_segment_gruppe in enumerate(AhbTable.lines_contain_only_segment_gruppe(table))
+        ]
+        if not any(segment_gruppe_contains_multiple_lines):
+            return
+
+        sanitized_rows: list[list[str]] = []
+        for index, row in enumerate(table.rows):
+            # the successor of a merged line is dropped; the last line has no successor, so nothing gets dropped for it
+            if index > 0 and segment_gruppe_contains_multiple_lines[index - 1]:
+                continue
+            if segment_gruppe_contains_multiple_lines[index]:
+                row[segment_gruppe_index] = (segment_gruppe[index] + " " + next_segment_gruppe[index]).strip()
+            sanitized_rows.append(row)
+        table.rows = sanitized_rows
 
     def to_csv(self, pruefi: str, path_to_output_directory: Path) -> None:
         """
@@ -163,9 +149,9 @@ class AhbTable:
 
         self.fill_segment_gruppe_segment_dataelement()
 
-        columns_to_export = list(self.table.columns)[:5] + [pruefi]
+        columns_to_export = self.table.column_headers[:5] + [pruefi]
         columns_to_export.append("Bedingung")
-        df_to_export = self.table[columns_to_export]
+        df_to_export = self.table.to_dataframe()[columns_to_export]
 
         df_to_export.to_csv(csv_output_directory_path / f"{pruefi}.csv")
         logger.info("The csv file for %s is saved at %s", pruefi, csv_output_directory_path / f"{pruefi}.csv")
@@ -187,9 +173,11 @@ class AhbTable:
 
         excel_file_name = f"{pruefi}.xlsx"
 
-        columns_to_export = list(self.table.columns)[:5] + [pruefi]
+        columns_to_export = self.table.column_headers[:5] + [pruefi]
         columns_to_export.append("Bedingung")
-        df_to_export = self.table[columns_to_export]
+        df_to_export = self.table.to_dataframe()[columns_to_export]
+
+        import pandas as pd  # pylint:disable=import-outside-toplevel
 
         try:
             # https://github.com/PyCQA/pylint/issues/3060 pylint: disable=abstract-class-instantiated
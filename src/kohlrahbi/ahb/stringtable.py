@@ -0,0 +1,100 @@
+"""
+This module contains the StringTable class.
+"""
+import math
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _to_string(value: Any) -> str:
+    """
+    Converts a value of a DataFrame to a string. Missing values (None or NaN) become empty strings.
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return str(value)
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class StringTable:
+    """
+    A StringTable is a lightweight table whose values are all strings.
+    The AHB tables only consist of a few string columns, so they are kept as plain lists of rows.
+    pandas is only imported when a table is converted to (or created from) a DataFrame, e.g. to export it.
+    """
+
+    column_headers: list[str]
+    rows: list[list[str]] = attrs.field(factory=list)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column_index(self, column_header: str) -> int:
+        """
+        Returns the index of the (first) column with the given header.
+        Raises a KeyError if there is no such column.
+        """
+        try:
+            return self.column_headers.index(column_header)
+        except ValueError as value_error:
+            raise KeyError(column_header) from value_error
+
+    def column(self, column_header: str) -> list[str]:
+        """
+        Returns the values of the (first) column with the given header.
+        """
+        column_index = self.column_index(column_header)
+        return [row[column_index] for row in self.rows]
+
+    def extend(self, other: "StringTable") -> None:
+        """
+        Appends copies of the rows of the other table to this table.
+        The values are assigned by column header. Columns which only exist in one of the tables are filled with empty
+        strings in the rows of the other table (like pandas.concat does, but without missing values).
+        """
+        if other.column_headers == self.column_headers:
+            self.rows.extend(list(row) for row in other.rows)
+            return
+        for column_header in other.column_headers:
+            if column_header not in self.column_headers:
+                self.column_headers.append(column_header)
+                for row in self.rows:
+                    row.append("")
+        other_column_indices = {
+            column_header: index for index, column_header in reversed(list(enumerate(other.column_headers)))
+        }
+        for row in other.rows:
+            self.rows.append(
+                [
+                    row[other_column_indices[column_header]] if column_header in other_column_indices else ""
+                    for column_header in self.column_headers
+                ]
+            )
+
+    def copy(self) -> "StringTable":
+        """
+        Returns a copy of the table; the rows of the copy can be modified without affecting this table.
+        """
+        return StringTable(column_headers=list(self.column_headers), rows=[list(row) for row in self.rows])
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """
+        Creates a DataFrame with all rows of the table.
+        """
+        import pandas as pd  # pylint:disable=import-outside-toplevel
+
+        return pd.DataFrame(self.rows, columns=self.column_headers, dtype="str")
+
+    @classmethod
+    def from_dataframe(cls, dataframe: "pd.DataFrame") -> "StringTable":
+        """
+        Creates a table from the given DataFrame. Missing values become empty strings.
+        """
+        return cls(
+            column_headers=[str(column_header) for column_header in dataframe.columns],
+            rows=[[_to_string(value) for value in row] for row in dataframe.values],
+        )
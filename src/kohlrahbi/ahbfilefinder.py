@@ -1,13 +1,40 @@
 """
 This module contains the AhbFileFinder class.
 """
+import re
+import zipfile
 from itertools import groupby
 from pathlib import Path
+from typing import Generator
 
 import attrs
 from maus.edifact import EdifactFormat, get_format_of_pruefidentifikator
 
 from kohlrahbi.logger import logger
+from kohlrahbi.lxmldocument import get_document_part_name
+
+_CHUNK_SIZE = 1024 * 1024
+_xml_tag_pattern = re.compile(rb"<[^>]*>")
+
+
+def _iter_text_chunks_of_docx_file(path: Path) -> Generator[bytes, None, None]:
+    """
+    Generate the text of the main document part of the docx file chunk by chunk.
+    The part is decompressed as a stream and the XML is not parsed: all tags are simply cut out.
+    So the text of all runs is joined, and a text which is split over several runs is found as a whole.
+    """
+    with zipfile.ZipFile(path) as package, package.open(get_document_part_name(package)) as document_part:
+        rest = b""
+        while chunk := document_part.read(_CHUNK_SIZE):
+            data = rest + chunk
+            # the data after the last tag start may be incomplete, so it is processed together with the next chunk
+            last_tag_start = data.rfind(b"<")
+            if last_tag_start == -1:
+                rest = data
+                continue
+            data, rest = data[:last_tag_start], data[last_tag_start:]
+            yield _xml_tag_pattern.sub(b"", data)
+        yield _xml_tag_pattern.sub(b"", rest)
 
 
 @attrs.define(auto_attribs=True, kw_only=True)
@@ -79,6 +106,28 @@ class AhbFileFinder:
 
         self.paths_to_docx_files = [path for path in self.paths_to_docx_files if str(edifact_format) in path.name]
 
+    @staticmethod
+    def get_pruefis_in_docx_file(path_to_ahb_document: Path, pruefis: list[str]) -> set[str]:
+        """
+        Returns those of the given pruefis which appear in the text of the docx file.
+        This is a cheap check, which does not load the docx file: If a pruefi is not returned, the docx file
+        does not contain its AHB table (but if it is returned, the docx file may still not contain its AHB table).
+        """
+        searched_pruefis: set[bytes] = {pruefi.encode("utf-8") for pruefi in pruefis}
+        found_pruefis: set[bytes] = set()
+        if not any(searched_pruefis):
+            return set()
+        # the end of the previous chunk is kept, so that we also find the pruefis which span two chunks
+        overlap_length = max(len(pruefi) for pruefi in searched_pruefis) - 1
+        previous_text_end = b""
+        for text_chunk in _iter_text_chunks_of_docx_file(path_to_ahb_document):
+            text = previous_text_end + text_chunk
+            found_pruefis.update(pruefi for pruefi in searched_pruefis - found_pruefis if pruefi in text)
+            if found_pruefis == searched_pruefis:
+                break
+            previous_text_end = text[-overlap_length:] if overlap_length > 0 else b""
+        return {pruefi.decode("utf-8") for pruefi in found_pruefis}
+
     def get_docx_files_which_may_contain_searched_pruefi(self, searched_pruefi: str) -> list[Path]:
         """
         This functions takes a pruefidentifikator and returns a list of docx files which can contain the searched pruefi
@@ -0,0 +1,94 @@
+"""
+This module contains the BuildCache class.
+"""
+from pathlib import Path
+
+import attrs
+
+from kohlrahbi.fingerprint import get_fingerprint_of_file
+from kohlrahbi.jsoncache import JsonCache
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class BuildCache(JsonCache):
+    """
+    The BuildCache remembers from which docx files the output files of a Prüfidentifikator have been built.
+    For every Prüfidentifikator it stores the fingerprints of its candidate docx files, the kohlrahbi version and
+    the fingerprints of the output files.
+    A Prüfidentifikator is up to date, if none of these changed. Then it does not have to be extracted again.
+    The cache is stored as json file to be reused in later runs.
+    """
+
+    #: maps each Prüfidentifikator to the inputs and the output files of its last build
+    entries: dict[str, dict] = attrs.field(factory=dict)
+
+    def _get_entry(self, pruefi: str, source_fingerprints: list[str], deterministic_guids: bool) -> dict:
+        """
+        Returns the entry of the Prüfidentifikator if it has been built from the same inputs, else an empty dict.
+        Entries with an unexpected format are treated like missing entries.
+        """
+        entry = self.entries.get(pruefi)
+        if (
+            not isinstance(entry, dict)
+            or entry.get("source_fingerprints") != source_fingerprints
+            or entry.get("kohlrahbi_version") != self.kohlrahbi_version
+            or entry.get("deterministic_guids") != deterministic_guids
+            or not isinstance(entry.get("output_files"), dict)
+        ):
+            return {}
+        return entry
+
+    def get_up_to_date_output_file_paths(
+        self,
+        pruefi: str,
+        source_fingerprints: list[str],
+        output_path: Path,
+        file_types: list[str],
+        deterministic_guids: bool,
+    ) -> list[Path]:
+        """
+        Returns the paths of the output files of the given file types, if the Prüfidentifikator is up to date.
+        This is the case if it has been built from the same docx files with the same kohlrahbi version and
+        the output files of all given file types still exist unchanged in the output path.
+        Otherwise an empty list is returned and the Prüfidentifikator has to be extracted (again).
+        """
+        output_files: dict[str, dict[str, str]] = self._get_entry(pruefi, source_fingerprints, deterministic_guids).get(
+            "output_files", {}
+        )
+        output_file_paths: list[Path] = []
+        for file_type in file_types:
+            output_file = output_files.get(file_type)
+            if not isinstance(output_file, dict) or not isinstance(output_file.get("path"), str):
+                return []
+            output_file_path = output_path / output_file["path"]
+            if not output_file_path.exists() or get_fingerprint_of_file(output_file_path) != output_file.get(
+                "fingerprint"
+            ):
+                return []
+            output_file_paths.append(output_file_path)
+        return output_file_paths
+
+    def add_build(
+        self,
+        pruefi: str,
+        source_fingerprints: list[str],
+        output_path: Path,
+        output_file_paths: dict[str, Path],
+        deterministic_guids: bool,
+    ) -> None:
+        """
+        Add the output files (by file type) which have been built for the given Prüfidentifikator.
+        The output files of other file types are kept, if they have been built from the same inputs.
+        """
+        entry = self._get_entry(pruefi, source_fingerprints, deterministic_guids) or {
+            "source_fingerprints": source_fingerprints,
+            "kohlrahbi_version": self.kohlrahbi_version,
+            "deterministic_guids": deterministic_guids,
+            "output_files": {},
+        }
+        for file_type, output_file_path in output_file_paths.items():
+            entry["output_files"][file_type] = {
+                "path": output_file_path.relative_to(output_path).as_posix(),
+                "fingerprint": get_fingerprint_of_file(output_file_path),
+            }
+        self.entries[pruefi] = entry
@@ -0,0 +1,130 @@
+"""
+This module contains the features of a docx table cell which are needed to parse an AHB table.
+Both extraction engines (python-docx and lxml) read the cells into these features, so all parsers work on the same
+input, independent of the engine which was used to read the docx file.
+"""
+from typing import Optional, Union
+
+import attrs
+from docx.shared import RGBColor  # type:ignore[import]
+from docx.table import _Cell  # type:ignore[import]
+from docx.text.paragraph import Paragraph  # type:ignore[import]
+
+
+# pylint: disable=too-few-public-methods
+@attrs.define(auto_attribs=True, kw_only=True, frozen=True)
+class RunFeatures:
+    """
+    The features of the first run of a paragraph.
+    """
+
+    bold: Optional[bool]  #: None if the bold property is not set
+    font_color: Optional[RGBColor]  #: None if the font color is not set or 'auto'
+
+
+# pylint: disable=too-few-public-methods
+@attrs.define(auto_attribs=True, kw_only=True, frozen=True)
+class ParagraphFeatures:
+    """
+    The features of a paragraph in a table cell.
+    """
+
+    text: str
+    left_indent: Optional[int]  #: in EMU, None if the paragraph has no left indent
+    tab_stop_positions: tuple[int, ...]  #: in EMU
+    first_run: Optional[RunFeatures]  #: None if the paragraph contains no runs
+
+    @classmethod
+    def from_docx_paragraph(cls, paragraph: Paragraph) -> "ParagraphFeatures":
+        """
+        Read the features of a python-docx paragraph
+        """
+        runs = paragraph.runs
+        first_run: Optional[RunFeatures] = None
+        if any(runs):
+            first_run = RunFeatures(bold=runs[0].bold, font_color=runs[0].font.color.rgb)
+        return cls(
+            text=paragraph.text,
+            left_indent=paragraph.paragraph_format.left_indent,
+            tab_stop_positions=tuple(tab_stop.position for tab_stop in paragraph.paragraph_format.tab_stops),
+            first_run=first_run,
+        )
+
+
+# pylint: disable=too-few-public-methods
+@attrs.define(auto_attribs=True, kw_only=True, frozen=True)
+class CellFeatures:
+    """
+    The features of a table cell, i.e. the features of all its paragraphs.
+    """
+
+    paragraphs: tuple[ParagraphFeatures, ...]
+    text: str  #: the text of all paragraphs joined by a line break (like the text of a python-docx cell)
+
+    @classmethod
+    def from_paragraphs(cls, paragraphs: tuple[ParagraphFeatures, ...]) -> "CellFeatures":
+        """
+        Create the features of a cell from the features of its paragraphs
+        """
+        return cls(paragraphs=paragraphs, text="\n".join(paragraph.text for paragraph in paragraphs))
+
+    @classmethod
+    def from_docx_cell(cls, cell: _Cell) -> "CellFeatures":
+        """
+        Read the features of a python-docx table cell
+        """
+        return cls.from_paragraphs(
+            tuple(ParagraphFeatures.from_docx_paragraph(paragraph) for paragraph in cell.paragraphs)
+        )
+
+
+def to_cell_features(cell: Union[_Cell, CellFeatures]) -> CellFeatures:
+    """
+    Returns the features of the given cell. This function is used as converter, so that all parsers accept both,
+    python-docx cells and cell features.
+    """
+    if isinstance(cell, CellFeatures):
+        return cell
+    return CellFeatures.from_docx_cell(cell)
+
+
+# pylint: disable=too-few-public-methods
+@attrs.define(auto_attribs=True, kw_only=True, frozen=True)
+class EdifactStrukturCellFeatures:
+    """
+    A snapshot of those features of an edifact struktur cell which decide the type of a row and how the cell is parsed.
+    The row type checker and the EdifactStrukturCell both read the cell several times, so the features are extracted
+    only once per row.
+    """
+
+    text: str  #: the text of the cell (paragraphs joined by a line break)
+    joined_text: str  #: the text of the paragraphs joined by a space
+    tab_count: int  #: the number of tabs in the text of the cell
+    #: the left indent of the first paragraph in EMU, None if it is not set or the cell has no paragraphs
+    left_indent: Optional[int]
+    first_run: Optional[RunFeatures]  #: the first run of the first paragraph, if any
+
+    @classmethod
+    def from_cell_features(cls, cell: CellFeatures) -> "EdifactStrukturCellFeatures":
+        """
+        Extract the snapshot from the features of a cell
+        """
+        first_paragraph: Optional[ParagraphFeatures] = cell.paragraphs[0] if any(cell.paragraphs) else None
+        return cls(
+            text=cell.text,
+            joined_text=" ".join(paragraph.text for paragraph in cell.paragraphs),
+            tab_count=cell.text.count("\t"),
+            left_indent=first_paragraph.left_indent if first_paragraph is not None else None,
+            first_run=first_paragraph.first_run if first_paragraph is not None else None,
+        )
+
+
+def to_edifact_struktur_cell_features(
+    cell: Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]
+) -> EdifactStrukturCellFeatures:
+    """
+    Returns the snapshot of the given edifact struktur cell. Like to_cell_features, this function is used as converter.
+    """
+    if isinstance(cell, EdifactStrukturCellFeatures):
+        return cell
+    return EdifactStrukturCellFeatures.from_cell_features(to_cell_features(cell))
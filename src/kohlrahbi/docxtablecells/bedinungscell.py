@@ -5,8 +5,9 @@ This module contains the class BedingungCell
 import re
 
 import attrs
-import pandas as pd
-from docx.table import _Cell  # type:ignore[import]
+
+from kohlrahbi.ahb.ahbrowbuffer import AhbRowBuffer
+from kohlrahbi.cellfeatures import CellFeatures, to_cell_features
 
 
 @attrs.define(auto_attribs=True, kw_only=True)
@@ -16,18 +17,16 @@ class BedingungCell:
     to extract the Bedingungen of an AHB Bedingung cell.
     """
 
-    table_cell: _Cell
+    table_cell: CellFeatures = attrs.field(converter=to_cell_features)
 
-    def parse(self, ahb_row_dataframe: pd.DataFrame) -> pd.DataFrame:
+    def parse(self, ahb_row_buffer: AhbRowBuffer) -> None:
         """
-        Parses a cell in the Bedingung column and puts the information into the appropriate column of the dataframe.
+        Parses a cell in the Bedingung column and puts the information into the appropriate column of the current row.
         """
 
         bedingung = self.beautify_bedingungen()
 
-        row_index = ahb_row_dataframe.index.max()
-        ahb_row_dataframe.at[row_index, "Bedingung"] += bedingung
-        return ahb_row_dataframe
+        ahb_row_buffer.append_to_value("Bedingung", bedingung)
 
     # pylint: disable=line-too-long
     def beautify_bedingungen(self) -> str:
@@ -1,16 +1,35 @@
 """
 This module contains the class BodyCell
 """
+from functools import lru_cache
+
 import attrs
-import pandas as pd
-from docx.table import _Cell  # type:ignore[import]
 from maus.reader.flat_ahb_reader import FlatAhbCsvReader
 
-from kohlrahbi.seed import get_tabstop_positions
+from kohlrahbi.ahb.ahbrowbuffer import AhbRowBuffer
+from kohlrahbi.cellfeatures import CellFeatures, ParagraphFeatures, to_cell_features
 
 INDEX_OF_CODES_AND_QUALIFIER_COLUMN = 3
 
 
+@lru_cache(maxsize=16)
+def _get_column_indices_by_tabstop_position(indicator_tabstop_positions: tuple[int, ...]) -> dict[int, tuple[int, ...]]:
+    """
+    Map each tabstop position of the indicator middle cell to the index of its column in the AHB row buffer.
+    The first tabstop belongs to the column after "Codes und Qualifier", the next one to the column after that etc.
+    The mapping is the same for all cells of an AHB table, so it is computed only once per table header.
+    """
+    column_indices_by_tabstop_position: dict[int, tuple[int, ...]] = {}
+    for column_index, indicator_tabstop_position in enumerate(
+        indicator_tabstop_positions, start=INDEX_OF_CODES_AND_QUALIFIER_COLUMN + 1
+    ):
+        column_indices_by_tabstop_position[indicator_tabstop_position] = (
+            *column_indices_by_tabstop_position.get(indicator_tabstop_position, ()),
+            column_index,
+        )
+    return column_indices_by_tabstop_position
+
+
 @attrs.define(auto_attribs=True, kw_only=True)
 class BodyCell:
     """
@@ -19,18 +38,18 @@ class BodyCell:
     as well as the conditions for each Prüfidentifikator.
     """
 
-    table_cell: _Cell
+    table_cell: CellFeatures = attrs.field(converter=to_cell_features)
     left_indent_position: int
     indicator_tabstop_positions: list[int]
 
     # I see why pylint is not happy about this many branches, but at the moment I have no clue how to avoid them.
     # pylint: disable=too-many-branches
-    def parse(self, ahb_row_dataframe: pd.DataFrame) -> pd.DataFrame:
+    def parse(self, ahb_row_buffer: AhbRowBuffer) -> None:
         """Parses a paragraph in the middle column and puts the information into the appropriate columns
 
         Args:
             paragraph (Paragraph): Current paragraph in the edifact struktur cell
-            dataframe (pd.DataFrame): Contains all infos
+            ahb_row_buffer (AhbRowBuffer): Contains all infos, the current row is the last row of the buffer
             left_indent_position (int): Position of the left indent from the indicator middle cell
             tabstop_positions (List[int]): All tabstop positions of the indicator middle cell
         """
@@ -38,16 +57,18 @@ class BodyCell:
         cell_is_empty = self.table_cell.paragraphs[0].text == ""
 
         if cell_is_empty:
-            return ahb_row_dataframe
+            return
 
         is_first_iteration = True
+        column_indices_by_tabstop_position = _get_column_indices_by_tabstop_position(
+            tuple(self.indicator_tabstop_positions)
+        )
 
         for paragraph in self.table_cell.paragraphs:
-            row_index = ahb_row_dataframe.index.max()
-            paragraph.text = paragraph.text.replace("\xa0", "")
-            splitted_text_at_tabs = paragraph.text.split("\t")
+            paragraph_text = paragraph.text.replace("\xa0", "")
+            splitted_text_at_tabs = paragraph_text.split("\t")
 
-            if paragraph.paragraph_format.left_indent == self.left_indent_position:
+            if paragraph.left_indent == self.left_indent_position:
                 # code or qualifier
 
                 if (
@@ -60,50 +81,39 @@ class BodyCell:
                     # code entry
                     if not is_first_iteration:
                         # a new code and it is not the first.
-                        # So we add a new row in dataframe and increase the row_index
-                        ahb_row_dataframe.loc[ahb_row_dataframe.index.max() + 1, :] = ""
-                        row_index = row_index + 1
+                        # So we add a new row to the buffer which becomes the current row
+                        ahb_row_buffer.add_empty_row()
 
                 else:
                     # qualifier entry
                     pass
 
-                ahb_row_dataframe.iat[row_index, INDEX_OF_CODES_AND_QUALIFIER_COLUMN] += splitted_text_at_tabs.pop(0)
-                column_indezes = list(range(4, 4 + len(self.indicator_tabstop_positions)))
+                ahb_row_buffer.append_to_value(INDEX_OF_CODES_AND_QUALIFIER_COLUMN, splitted_text_at_tabs.pop(0))
 
             else:
                 if splitted_text_at_tabs[0] == "":
                     del splitted_text_at_tabs[0]
-                column_indezes = list(range(4, 4 + len(self.indicator_tabstop_positions)))
 
             paragraph_contains_tabstops: bool = self.has_paragraph_tabstops(paragraph=paragraph)
 
             if paragraph_contains_tabstops:
-                tab_stops_in_current_paragraph = get_tabstop_positions(paragraph=paragraph)
-
-                for tabstop in tab_stops_in_current_paragraph:
-                    for indicator_tabstop_position, column_index in zip(
-                        self.indicator_tabstop_positions, column_indezes
-                    ):
-                        if tabstop == indicator_tabstop_position:
-                            ahb_row_dataframe.iat[row_index, column_index] += splitted_text_at_tabs.pop(0)
+                for tabstop in paragraph.tab_stop_positions:
+                    for column_index in column_indices_by_tabstop_position.get(tabstop, ()):
+                        ahb_row_buffer.append_to_value(column_index, splitted_text_at_tabs.pop(0))
 
             elif not paragraph_contains_tabstops and splitted_text_at_tabs:
                 # in splitted_text_at_tabs list must be an entry
-                ahb_row_dataframe.at[row_index, "Beschreibung"] += splitted_text_at_tabs.pop(0)
+                ahb_row_buffer.append_to_value("Beschreibung", splitted_text_at_tabs.pop(0))
             elif not paragraph_contains_tabstops:
                 pass
             else:
-                raise NotImplementedError(f"Could not parse paragraph in middle cell with {paragraph.text}")
+                raise NotImplementedError(f"Could not parse paragraph in middle cell with {paragraph_text}")
 
             # recognize that the first loop is over
             is_first_iteration = False
 
-        return ahb_row_dataframe
-
-    def has_paragraph_tabstops(self, paragraph) -> bool:
+    def has_paragraph_tabstops(self, paragraph: ParagraphFeatures) -> bool:
         """
         Checks if the given paragraph contains tabstops
         """
-        tab_stops = list(paragraph.paragraph_format.tab_stops)
-        return len(tab_stops) > 0
+        return len(paragraph.tab_stop_positions) > 0
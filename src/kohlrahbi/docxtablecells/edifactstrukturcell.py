@@ -4,8 +4,9 @@ This module contains the class EdifactStrukturCell
 import re
 
 import attrs
-import pandas as pd
-from docx.table import _Cell  # type:ignore[import]
+
+from kohlrahbi.ahb.ahbrowbuffer import AhbRowBuffer
+from kohlrahbi.cellfeatures import EdifactStrukturCellFeatures, to_edifact_struktur_cell_features
 
 _segment_group_pattern = re.compile(r"^SG\d+$")
 _segment_pattern = re.compile(r"^[A-Z]{3}$")
@@ -19,68 +20,61 @@ class EdifactStrukturCell:
     to extract the segment name, segment group, segment and data element.
     """
 
-    table_cell: _Cell
+    table_cell: EdifactStrukturCellFeatures = attrs.field(converter=to_edifact_struktur_cell_features)
     edifact_struktur_cell_left_indent_position: int
 
-    def parse(self, ahb_row_dataframe: pd.DataFrame) -> pd.DataFrame:
+    def parse(self, ahb_row_buffer: AhbRowBuffer) -> None:
         """Parses a paragraph in the edifact struktur column and puts the information into the appropriate columns
 
         Args:
             table_cell (Cell): edifact struktur cell
-            dataframe (pd.DataFrame): Contains all infos
-            row_index (int): Current index of the DataFrame
+            ahb_row_buffer (AhbRowBuffer): Contains all infos, the current row is the last row of the buffer
             edifact_struktur_cell_left_indent_position (int): Position of the left indent from the indicator edifact
                 struktur cell
         """
 
-        joined_text = " ".join(p.text for p in self.table_cell.paragraphs)
+        joined_text = self.table_cell.joined_text
         splitted_text_at_tabs = joined_text.split("\t")
-        tab_count = joined_text.count("\t")
-
-        row_index = ahb_row_dataframe.index.max()
+        tab_count = self.table_cell.tab_count
 
         # Check if the line starts on the far left
-        if (
-            self.table_cell.paragraphs[0].paragraph_format.left_indent
-            != self.edifact_struktur_cell_left_indent_position
-        ):
+        if self.table_cell.left_indent != self.edifact_struktur_cell_left_indent_position:
             if tab_count == 2:
-                ahb_row_dataframe.at[row_index, "Segment Gruppe"] = splitted_text_at_tabs[0]
-                ahb_row_dataframe.at[row_index, "Segment"] = splitted_text_at_tabs[1]
-                ahb_row_dataframe.at[row_index, "Datenelement"] = splitted_text_at_tabs[2]
+                ahb_row_buffer.set_value("Segment Gruppe", splitted_text_at_tabs[0])
+                ahb_row_buffer.set_value("Segment", splitted_text_at_tabs[1])
+                ahb_row_buffer.set_value("Datenelement", splitted_text_at_tabs[2])
             elif tab_count == 1:
-                ahb_row_dataframe.at[row_index, "Segment Gruppe"] = splitted_text_at_tabs[0]
-                ahb_row_dataframe.at[row_index, "Segment"] = splitted_text_at_tabs[1]
+                ahb_row_buffer.set_value("Segment Gruppe", splitted_text_at_tabs[0])
+                ahb_row_buffer.set_value("Segment", splitted_text_at_tabs[1])
             elif tab_count == 0 and joined_text.strip() != "":
-                is_segment_gruppe: bool = bool(self.table_cell.paragraphs[0].runs[0].bold) and bool(
-                    _segment_group_pattern.match(joined_text)
+                first_run = self.table_cell.first_run
+                is_segment_gruppe: bool = (
+                    first_run is not None and bool(first_run.bold) and bool(_segment_group_pattern.match(joined_text))
                 )
 
                 is_segment = bool(_segment_pattern.match(joined_text))
                 if is_segment_gruppe:
                     # Segmentgruppe: SG8
-                    ahb_row_dataframe.at[row_index, "Segment Gruppe"] = splitted_text_at_tabs[0]
+                    ahb_row_buffer.set_value("Segment Gruppe", splitted_text_at_tabs[0])
                 elif is_segment:
-                    ahb_row_dataframe.at[row_index, "Segment"] = splitted_text_at_tabs[0]
+                    ahb_row_buffer.set_value("Segment", splitted_text_at_tabs[0])
                 else:
                     # Segmentname: Referenzen auf die ID der\nTranche
-                    _sg_text = ahb_row_dataframe.at[row_index, "Segment Gruppe"]
+                    _sg_text = ahb_row_buffer.get_value("Segment Gruppe")
                     if _sg_text == "":
                         # Referenzen auf die ID der
-                        ahb_row_dataframe.at[row_index, "Segment Gruppe"] = splitted_text_at_tabs[0]
+                        ahb_row_buffer.set_value("Segment Gruppe", splitted_text_at_tabs[0])
                     else:
                         # Tranche
-                        ahb_row_dataframe.at[row_index, "Segment Gruppe"] += " " + splitted_text_at_tabs[0]
+                        ahb_row_buffer.append_to_value("Segment Gruppe", " " + splitted_text_at_tabs[0])
 
         # Now the text should start in middle of the EDIFACT Struktur column
         else:
             if tab_count == 1:
                 # Example: "UNH\t0062"
-                ahb_row_dataframe.at[row_index, "Segment"] = splitted_text_at_tabs[0]
-                ahb_row_dataframe.at[row_index, "Datenelement"] = splitted_text_at_tabs[1]
+                ahb_row_buffer.set_value("Segment", splitted_text_at_tabs[0])
+                ahb_row_buffer.set_value("Datenelement", splitted_text_at_tabs[1])
 
             elif tab_count == 0:
                 # Example: "UNH"
-                ahb_row_dataframe.at[row_index, "Segment"] = splitted_text_at_tabs[0]
-
-        return ahb_row_dataframe
+                ahb_row_buffer.set_value("Segment", splitted_text_at_tabs[0])
@@ -2,5 +2,7 @@
 Collect all enums for easier import
 """
 
+from .extraction_engine import ExtractionEngine
+from .flat_ahb_row_type import FlatAhbRowType
 from .row_type import RowType
 from .row_type_color import RowTypeColor
@@ -0,0 +1,17 @@
+"""
+This module contains the ExtractionEngine enumeration.
+"""
+
+from enum import StrEnum
+
+
+class ExtractionEngine(StrEnum):
+    """
+    The engines which can be used to read the AHB docx files.
+    All engines produce the same output.
+    """
+
+    PYTHON_DOCX = "python-docx"  #: reads the docx files with the python-docx object model
+    LXML = "lxml"  #: reads the word/document.xml directly with lxml; faster than python-docx
+    #: streams the word/document.xml with lxml; the memory usage does not depend on the size of the document
+    LXML_STREAMING = "lxml-streaming"
@@ -7,10 +7,15 @@ from enum import StrEnum, auto
 
 class FlatAhbRowType(StrEnum):
     """
-    All possible row types.
-    The RowType is defined by the first cell in each row.
+    All possible row types of an AHB table, which is unfolded into a flat AHB.
+    The FlatAhbRowType is defined by the columns "Segment Gruppe", "Segment", "Datenelement" and "Codes und Qualifier".
     Example content for each row type is documented at each enum member.
     """
 
-    SEGMENTOPENINGLINE = auto()  #: e.g. "Nachrichten-Kopfsegment"
-    # SECTIONNAME:
+    SECTIONNAME = auto()  #: e.g. "Nachrichten-Kopfsegment" (and nothing else in the row)
+    SEGMENTGROUP = auto()  #: e.g. "SG2"
+    SEGMENTOPENINGLINE = auto()  #: e.g. "SG3    CTA" followed by "SG3    CTA    3139    IC"
+    SEGMENT = auto()  #: e.g. "SG2    NAD"
+    DATAELEMENT = auto()  #: e.g. "SG2    NAD    3035    MR"
+    VALUEPOOLENTRY = auto()  #: e.g. "    MS    Dokumentenaussteller bzw. Absender" below a data element
+    OTHER = auto()  #: all rows which do not result in a line of the flat AHB
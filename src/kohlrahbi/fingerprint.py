@@ -0,0 +1,27 @@
+"""
+This module provides a function to calculate a fingerprint of a (docx) file.
+The fingerprint only depends on the content of the file, not on its name or modification date.
+So the same AHB document has the same fingerprint in every clone of the edi_energy_mirror.
+"""
+import hashlib
+from pathlib import Path
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def get_fingerprint_of_file(path: Path) -> str:
+    """
+    Returns the sha256 hex digest of the content of the given file.
+    """
+    hash_object = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(_CHUNK_SIZE):
+            hash_object.update(chunk)
+    return hash_object.hexdigest()
+
+
+def get_fingerprint_of_content(content: bytes) -> str:
+    """
+    Returns the sha256 hex digest of the given content, i.e. the fingerprint of a file with this content.
+    """
+    return hashlib.sha256(content).hexdigest()
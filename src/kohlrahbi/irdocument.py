@@ -0,0 +1,271 @@
+"""
+This module contains a compact intermediate representation (IR) of AHB docx files.
+The IR holds only those parts of a docx file which are consumed by the parsers:
+the headings, the body child index of each item and, for each table cell, the cell features
+(see kohlrahbi.cellfeatures).
+It is stored as gzip compressed json file, so that later runs can skip loading the docx file entirely.
+"""
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Generator, Optional, Union
+
+import attrs
+from docx.shared import RGBColor  # type:ignore[import]
+from lxml import etree  # type:ignore[import]
+
+from kohlrahbi.cellfeatures import CellFeatures, ParagraphFeatures, RunFeatures
+from kohlrahbi.fingerprint import get_fingerprint_of_content
+from kohlrahbi.logger import logger
+from kohlrahbi.lxmldocument import (
+    LxmlDocument,
+    LxmlParagraph,
+    LxmlTable,
+    filter_body_child_index_range,
+    get_cell_features,
+    get_grid_span,
+    is_heading_style_name,
+    is_vertically_merged_continuation,
+)
+
+#: the version of the IR file format; IR files of other versions are not read
+_IR_FORMAT_VERSION = 1
+
+
+def _paragraph_features_to_ir(paragraph: ParagraphFeatures) -> list:
+    first_run: Optional[list] = None
+    if paragraph.first_run is not None:
+        font_color = paragraph.first_run.font_color
+        first_run = [paragraph.first_run.bold, str(font_color) if font_color is not None else None]
+    return [paragraph.text, paragraph.left_indent, list(paragraph.tab_stop_positions), first_run]
+
+
+def _paragraph_features_from_ir(ir_paragraph: list) -> ParagraphFeatures:
+    text, left_indent, tab_stop_positions, ir_first_run = ir_paragraph
+    first_run: Optional[RunFeatures] = None
+    if ir_first_run is not None:
+        bold, font_color = ir_first_run
+        first_run = RunFeatures(
+            bold=bold, font_color=RGBColor.from_string(font_color) if font_color is not None else None
+        )
+    return ParagraphFeatures(
+        text=text, left_indent=left_indent, tab_stop_positions=tuple(tab_stop_positions), first_run=first_run
+    )
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class IrParagraph:
+    """
+    A heading from the body of a docx document.
+    """
+
+    text: str
+    style_name: Optional[str]  #: the (user interface) name of the paragraph style, e.g. 'Heading 1'
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class IrCell:
+    """
+    A visible cell of a table together with its position in the layout grid of the table.
+    """
+
+    features: CellFeatures
+    grid_span: int  #: the number of grid columns which are covered by the cell
+    #: True if the cell continues a vertically merged cell of the row above
+    is_vertically_merged_continuation: bool
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class IrTable:
+    """
+    A table from the body of a docx document.
+    It offers the same access to the cells as the LxmlTable.
+    """
+
+    #: the fingerprint of the raw XML of the table (the w:tbl element); it identifies the table in caches
+    fingerprint: str
+    column_count: int
+    rows: list[list[IrCell]]
+    _grid_cells: Optional[list[CellFeatures]] = attrs.field(default=None, init=False)
+
+    @classmethod
+    def from_lxml_table(cls, table: LxmlTable) -> "IrTable":
+        """
+        Read the cells of an lxml table
+        """
+        return cls(
+            fingerprint=get_fingerprint_of_content(etree.tostring(table.element)),
+            column_count=table.column_count,
+            rows=[
+                [
+                    IrCell(
+                        features=get_cell_features(cell_element),
+                        grid_span=get_grid_span(cell_element),
+                        is_vertically_merged_continuation=is_vertically_merged_continuation(cell_element),
+                    )
+                    for cell_element in cell_elements
+                ]
+                for cell_elements in table.iter_rows_of_visible_cell_elements()
+            ],
+        )
+
+    def _get_grid_cells(self) -> list[CellFeatures]:
+        """
+        Returns the cells of the layout grid, row by row, the same way python-docx determines its cells.
+        """
+        if self._grid_cells is None:
+            grid_cells: list[CellFeatures] = []
+            for row in self.rows:
+                for cell in row:
+                    for grid_span_index in range(cell.grid_span):
+                        if cell.is_vertically_merged_continuation:
+                            grid_cells.append(grid_cells[-self.column_count])
+                        elif grid_span_index > 0:
+                            grid_cells.append(grid_cells[-1])
+                        else:
+                            grid_cells.append(cell.features)
+            self._grid_cells = grid_cells
+        return self._grid_cells
+
+    def cell(self, row_idx: int, col_idx: int) -> CellFeatures:
+        """
+        Returns the features of the cell at the given grid position (like python-docx Table.cell)
+        """
+        return self._get_grid_cells()[col_idx + row_idx * self.column_count]
+
+    def iter_rows_of_visible_cells(self) -> Generator[list[CellFeatures], None, None]:
+        """
+        Generate the features of the cells you see in the word document for each row of the table.
+        """
+        for row in self.rows:
+            yield [cell.features for cell in row]
+
+    def to_ir(self) -> dict[str, Any]:
+        """
+        Returns the table as json serializable dictionary
+        """
+        return {
+            "fingerprint": self.fingerprint,
+            "column_count": self.column_count,
+            "rows": [
+                [
+                    [
+                        [_paragraph_features_to_ir(paragraph) for paragraph in cell.features.paragraphs],
+                        cell.grid_span,
+                        cell.is_vertically_merged_continuation,
+                    ]
+                    for cell in row
+                ]
+                for row in self.rows
+            ],
+        }
+
+    @classmethod
+    def from_ir(cls, ir_table: dict[str, Any]) -> "IrTable":
+        """
+        Create the table from its json serializable dictionary
+        """
+        return cls(
+            fingerprint=ir_table["fingerprint"],
+            column_count=ir_table["column_count"],
+            rows=[
+                [
+                    IrCell(
+                        features=CellFeatures.from_paragraphs(
+                            tuple(_paragraph_features_from_ir(ir_paragraph) for ir_paragraph in ir_paragraphs)
+                        ),
+                        grid_span=grid_span,
+                        is_vertically_merged_continuation=vertically_merged_continuation,
+                    )
+                    for ir_paragraphs, grid_span, vertically_merged_continuation in ir_row
+                ]
+                for ir_row in ir_table["rows"]
+            ],
+        )
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class IrDocument:
+    """
+    The intermediate representation of a docx document.
+    It contains the headings and the tables of the body together with their body child indices.
+    All other paragraphs of the body are not needed by the parsers, so they are left out.
+    """
+
+    items: list[tuple[int, Union[IrParagraph, IrTable]]]
+
+    @classmethod
+    def from_lxml_document(cls, document: LxmlDocument) -> "IrDocument":
+        """
+        Create the intermediate representation of a docx document which is read with lxml
+        """
+        items: list[tuple[int, Union[IrParagraph, IrTable]]] = []
+        for body_child_index, item in document.iter_paragraphs_and_tables():
+            if isinstance(item, LxmlParagraph):
+                if is_heading_style_name(item.style_name):
+                    items.append((body_child_index, IrParagraph(text=item.text, style_name=item.style_name)))
+            else:
+                items.append((body_child_index, IrTable.from_lxml_table(item)))
+        return cls(items=items)
+
+    @classmethod
+    def from_file(cls, path: Path) -> Optional["IrDocument"]:
+        """
+        Read the intermediate representation from the given file.
+        None is returned if the file could not be read, is malformed or was written with another version of the IR
+        file format.
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                ir_document = json.load(file)
+        except (OSError, EOFError, ValueError):
+            logger.warning("The intermediate representation '%s' could not be read", path, exc_info=True)
+            return None
+        if not isinstance(ir_document, dict) or ir_document.get("format_version") != _IR_FORMAT_VERSION:
+            logger.info("The intermediate representation '%s' has an outdated format", path)
+            return None
+        items: list[tuple[int, Union[IrParagraph, IrTable]]] = []
+        try:
+            for body_child_index, ir_paragraph, ir_table in ir_document["items"]:
+                if ir_table is not None:
+                    items.append((body_child_index, IrTable.from_ir(ir_table)))
+                else:
+                    items.append((body_child_index, IrParagraph(text=ir_paragraph[0], style_name=ir_paragraph[1])))
+        except (KeyError, TypeError, ValueError):
+            logger.warning("The intermediate representation '%s' is malformed", path, exc_info=True)
+            return None
+        return cls(items=items)
+
+    def to_file(self, path: Path) -> None:
+        """
+        Write the intermediate representation to the given file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        ir_items: list[list] = []
+        for body_child_index, item in self.items:
+            if isinstance(item, IrTable):
+                ir_items.append([body_child_index, None, item.to_ir()])
+            else:
+                ir_items.append([body_child_index, [item.text, item.style_name], None])
+        content = json.dumps({"format_version": _IR_FORMAT_VERSION, "items": ir_items}, ensure_ascii=False)
+        # the file is written to a temporary file first, so that there are never incomplete IR files
+        temporary_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary_path.write_bytes(gzip.compress(content.encode("utf-8")))
+        os.replace(temporary_path, path)
+
+    def iter_paragraphs_and_tables(
+        self, body_child_index_range: Optional[tuple[int, int]] = None
+    ) -> Generator[tuple[int, Union[IrParagraph, IrTable]], None, None]:
+        """
+        Yield each heading and table of the document body together with its index among the children of the body.
+        If a range is given, only the children from the first to the last index (inclusive) are yielded.
+        """
+        yield from filter_body_child_index_range(self.items, body_child_index_range)
+
+
+def get_ir_path(cache_path: Path, fingerprint: str) -> Path:
+    """
+    Returns the path of the intermediate representation of the docx file with the given fingerprint in the cache.
+    """
+    return cache_path / "ir" / f"{fingerprint}.json.gz"
@@ -0,0 +1,76 @@
+"""
+This module contains the base class of the caches which are stored as a json file.
+"""
+import hashlib
+import json
+import os
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Self
+
+import attrs
+
+from kohlrahbi.fingerprint import get_fingerprint_of_file
+from kohlrahbi.logger import logger
+
+
+@cache
+def get_kohlrahbi_version() -> str:
+    """
+    Returns the version of the installed kohlrahbi package (or "unknown" if the package is not installed) together with
+    a fingerprint of its source files. The version alone does not change in a development checkout, but the caches
+    have to be invalidated by every change of the parser.
+    """
+    try:
+        kohlrahbi_version = version("kohlrahbi")
+    except PackageNotFoundError:
+        kohlrahbi_version = "unknown"
+    package_path = Path(__file__).parent
+    hash_object = hashlib.sha256()
+    for source_file_path in sorted(package_path.rglob("*.py")):
+        hash_object.update(source_file_path.relative_to(package_path).as_posix().encode("utf-8"))
+        hash_object.update(get_fingerprint_of_file(source_file_path).encode("utf-8"))
+    return f"{kohlrahbi_version}+{hash_object.hexdigest()[:16]}"
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class JsonCache:
+    """
+    A JsonCache maps keys to entries (json objects) and is stored as json file to be reused in later runs.
+    If the file cannot be read or does not contain a json object, the cache starts empty.
+    The subclasses check the format of each entry when they use it, so that malformed entries are cache misses.
+    """
+
+    path: Path
+    kohlrahbi_version: str = attrs.field(factory=get_kohlrahbi_version)
+    entries: dict[str, dict] = attrs.field(factory=dict)
+
+    @classmethod
+    def from_file(cls, path: Path) -> Self:
+        """
+        Load the cache from the given json file. If the file does not exist (yet) an empty cache is returned.
+        """
+        if not path.exists():
+            return cls(path=path)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            logger.warning("The cache '%s' could not be read. I will create a new one.", path, exc_info=True)
+            return cls(path=path)
+        if not isinstance(entries, dict):
+            logger.warning("The cache '%s' has an unexpected format. I will create a new one.", path)
+            return cls(path=path)
+        return cls(path=path, entries=entries)
+
+    def save(self) -> None:
+        """
+        Write the cache to its json file.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # the cache is written to a temporary file first, so that an interrupted run never leaves an incomplete cache
+        temporary_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(self.entries, file, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.path)
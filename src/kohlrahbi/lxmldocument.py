@@ -0,0 +1,506 @@
+"""
+This module contains an lxml based reader for AHB docx files.
+It reads the word/document.xml directly with lxml and bypasses the python-docx object model.
+Instead of creating python-docx proxy objects for each cell, paragraph and run, it extracts exactly those features
+which are needed by the parsers (see kohlrahbi.cellfeatures).
+The extracted features are the same as the ones you get from python-docx.
+"""
+import posixpath
+import zipfile
+from pathlib import Path
+from typing import Generator, Iterable, Optional, TypeVar, Union
+
+import attrs
+from docx.oxml.simpletypes import ST_OnOff, ST_SignedTwipsMeasure  # type:ignore[import]
+from docx.shared import RGBColor  # type:ignore[import]
+from docx.styles import BabelFish  # type:ignore[import]
+from lxml import etree  # type:ignore[import]
+
+from kohlrahbi.cellfeatures import CellFeatures, ParagraphFeatures, RunFeatures
+
+_W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_RELATIONSHIPS_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/relationships"
+_OFFICE_DOCUMENT_RELATIONSHIP_TYPE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+_STYLES_RELATIONSHIP_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+
+def _w(tag: str) -> str:
+    """
+    Returns the clark notation of a tag in the wordprocessingml namespace, e.g. 'p' -> '{http://...}p'
+    """
+    return f"{{{_W_NAMESPACE}}}{tag}"
+
+
+_W_BODY = _w("body")
+_W_P = _w("p")
+_W_TBL = _w("tbl")
+_W_TBL_GRID = _w("tblGrid")
+_W_GRID_COL = _w("gridCol")
+_W_TR = _w("tr")
+_W_TC = _w("tc")
+_W_TC_PR = _w("tcPr")
+_W_GRID_SPAN = _w("gridSpan")
+_W_V_MERGE = _w("vMerge")
+_W_P_PR = _w("pPr")
+_W_P_STYLE = _w("pStyle")
+_W_IND = _w("ind")
+_W_TABS = _w("tabs")
+_W_TAB = _w("tab")
+_W_R = _w("r")
+_W_R_PR = _w("rPr")
+_W_T = _w("t")
+_W_BR = _w("br")
+_W_CR = _w("cr")
+_W_B = _w("b")
+_W_COLOR = _w("color")
+_W_STYLE = _w("style")
+_W_NAME = _w("name")
+_W_VAL = _w("val")
+_W_LEFT = _w("left")
+_W_POS = _w("pos")
+_W_TYPE = _w("type")
+_W_DEFAULT = _w("default")
+_W_STYLE_ID = _w("styleId")
+
+
+def _get_paragraph_text(paragraph_element) -> str:
+    """
+    Returns the text of a w:p element like the text property of a python-docx Paragraph.
+    """
+    text = ""
+    for run_element in paragraph_element.iterchildren(_W_R):
+        for child in run_element:
+            tag = child.tag
+            if tag == _W_T:
+                text += child.text or ""
+            elif tag == _W_TAB:
+                text += "\t"
+            elif tag in (_W_BR, _W_CR):
+                text += "\n"
+    return text
+
+
+def _get_run_features(run_element) -> RunFeatures:
+    """
+    Read the bold flag and the font color of a w:r element.
+    """
+    bold: Optional[bool] = None
+    font_color: Optional[RGBColor] = None
+    run_properties = run_element.find(_W_R_PR)
+    if run_properties is not None:
+        bold_element = run_properties.find(_W_B)
+        if bold_element is not None:
+            bold_value = bold_element.get(_W_VAL)
+            bold = True if bold_value is None else ST_OnOff.convert_from_xml(bold_value)
+        color_element = run_properties.find(_W_COLOR)
+        if color_element is not None and color_element.get(_W_VAL) != "auto":
+            font_color = RGBColor.from_string(color_element.get(_W_VAL))
+    return RunFeatures(bold=bold, font_color=font_color)
+
+
+def get_paragraph_features(paragraph_element) -> ParagraphFeatures:
+    """
+    Read the features of a w:p element.
+    """
+    left_indent: Optional[int] = None
+    tab_stop_positions: tuple[int, ...] = ()
+    paragraph_properties = paragraph_element.find(_W_P_PR)
+    if paragraph_properties is not None:
+        indentation = paragraph_properties.find(_W_IND)
+        if indentation is not None and indentation.get(_W_LEFT) is not None:
+            left_indent = ST_SignedTwipsMeasure.convert_from_xml(indentation.get(_W_LEFT))
+        tabs = paragraph_properties.find(_W_TABS)
+        if tabs is not None:
+            tab_stop_positions = tuple(
+                ST_SignedTwipsMeasure.convert_from_xml(tab.get(_W_POS)) for tab in tabs.iterchildren(_W_TAB)
+            )
+    first_run_element = paragraph_element.find(_W_R)
+    return ParagraphFeatures(
+        text=_get_paragraph_text(paragraph_element),
+        left_indent=left_indent,
+        tab_stop_positions=tab_stop_positions,
+        first_run=_get_run_features(first_run_element) if first_run_element is not None else None,
+    )
+
+
+def get_cell_features(cell_element) -> CellFeatures:
+    """
+    Read the features of a w:tc element.
+    """
+    return CellFeatures.from_paragraphs(
+        tuple(get_paragraph_features(paragraph_element) for paragraph_element in cell_element.iterchildren(_W_P))
+    )
+
+
+def get_grid_span(cell_element) -> int:
+    """
+    Returns the number of grid columns which are covered by the given w:tc element.
+    """
+    cell_properties = cell_element.find(_W_TC_PR)
+    if cell_properties is None:
+        return 1
+    grid_span = cell_properties.find(_W_GRID_SPAN)
+    if grid_span is None:
+        return 1
+    return int(grid_span.get(_W_VAL))
+
+
+def is_vertically_merged_continuation(cell_element) -> bool:
+    """
+    Returns True if the given w:tc element continues a vertically merged cell of the row above.
+    """
+    cell_properties = cell_element.find(_W_TC_PR)
+    if cell_properties is None:
+        return False
+    vertical_merge = cell_properties.find(_W_V_MERGE)
+    if vertical_merge is None:
+        return False
+    return vertical_merge.get(_W_VAL, "continue") == "continue"
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class LxmlParagraph:
+    """
+    A paragraph from the body of a docx document.
+    """
+
+    element: etree._Element
+    style_name: Optional[str]  #: the (user interface) name of the paragraph style, e.g. 'Heading 1'
+
+    @property
+    def text(self) -> str:
+        """
+        The text of the paragraph
+        """
+        return _get_paragraph_text(self.element)
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class LxmlTable:
+    """
+    A table from the body of a docx document.
+    It offers the same access to the cells as a python-docx Table, but returns the cell features instead of cells.
+    """
+
+    element: etree._Element
+    #: the w:tc elements of the layout grid (merged cells are repeated); it is only filled as far as it is needed
+    _grid_cell_elements: list = attrs.field(factory=list, init=False)
+    _grid_cell_element_iterator: Optional[Generator] = attrs.field(default=None, init=False)
+    _column_count: Optional[int] = attrs.field(default=None, init=False)
+
+    @property
+    def column_count(self) -> int:
+        """
+        The number of grid columns of the table
+        """
+        if self._column_count is None:
+            table_grid = self.element.find(_W_TBL_GRID)
+            if table_grid is None:
+                # like in python-docx, a table without grid is invalid
+                raise ValueError("The table has no grid (w:tblGrid)")
+            self._column_count = len(table_grid.findall(_W_GRID_COL))
+        return self._column_count
+
+    def _iter_grid_cell_elements(self) -> Generator:
+        """
+        Generate the w:tc elements of the layout grid, row by row, the same way python-docx determines its cells.
+        """
+        column_count = self.column_count
+        for row_element in self.element.iterchildren(_W_TR):
+            for cell_element in row_element.iterchildren(_W_TC):
+                cell_is_vertically_merged_continuation = is_vertically_merged_continuation(cell_element)
+                for grid_span_index in range(get_grid_span(cell_element)):
+                    if cell_is_vertically_merged_continuation:
+                        yield self._grid_cell_elements[-column_count]
+                    elif grid_span_index > 0:
+                        yield self._grid_cell_elements[-1]
+                    else:
+                        yield cell_element
+
+    def _get_grid_cell_elements(self, stop_index: int) -> list:
+        """
+        Returns the grid cell elements up to the given stop index (exclusive) or all of them if there are less.
+        """
+        if self._grid_cell_element_iterator is None:
+            self._grid_cell_element_iterator = self._iter_grid_cell_elements()
+        while len(self._grid_cell_elements) < stop_index:
+            try:
+                self._grid_cell_elements.append(next(self._grid_cell_element_iterator))
+            except StopIteration:
+                break
+        return self._grid_cell_elements[:stop_index]
+
+    def cell(self, row_idx: int, col_idx: int) -> CellFeatures:
+        """
+        Returns the features of the cell at the given grid position (like python-docx Table.cell)
+        """
+        cell_index = col_idx + row_idx * self.column_count
+        return get_cell_features(self._get_grid_cell_elements(stop_index=cell_index + 1)[cell_index])
+
+    def row_cells(self, row_idx: int) -> list[CellFeatures]:
+        """
+        Returns the features of all grid cells of the given row (like python-docx Table.row_cells)
+        """
+        start_index = row_idx * self.column_count
+        stop_index = start_index + self.column_count
+        return [
+            get_cell_features(cell_element)
+            for cell_element in self._get_grid_cell_elements(stop_index=stop_index)[start_index:stop_index]
+        ]
+
+    def iter_rows_of_visible_cell_elements(self) -> Generator[list, None, None]:
+        """
+        Generate the w:tc elements of the cells you see in the word document for each row of the table.
+        """
+        for row_element in self.element.iterchildren(_W_TR):
+            yield list(row_element.iterchildren(_W_TC))
+
+    def iter_rows_of_visible_cells(self) -> Generator[list[CellFeatures], None, None]:
+        """
+        Generate the features of the cells you see in the word document for each row of the table.
+        """
+        for cell_elements in self.iter_rows_of_visible_cell_elements():
+            yield [get_cell_features(cell_element) for cell_element in cell_elements]
+
+
+def _get_part_name_of_relationship(package: zipfile.ZipFile, source_part_name: str, relationship_type: str):
+    """
+    Returns the name of the part which is related to the source part by the given relationship type.
+    The source part name of the package itself is the empty string.
+    """
+    source_directory, source_file_name = posixpath.split(source_part_name)
+    relationships_part_name = posixpath.join(source_directory, "_rels", f"{source_file_name}.rels")
+    try:
+        relationships = etree.fromstring(package.read(relationships_part_name))
+    except KeyError:
+        return None
+    for relationship in relationships.iterchildren(f"{{{_RELATIONSHIPS_NAMESPACE}}}Relationship"):
+        if relationship.get("Type") == relationship_type and relationship.get("TargetMode") != "External":
+            target = relationship.get("Target")
+            if target is None:
+                continue
+            if target.startswith("/"):
+                return target[1:]
+            return posixpath.normpath(posixpath.join(source_directory, target))
+    return None
+
+
+def get_paragraph_style_names(styles_element) -> dict[Optional[str], Optional[str]]:
+    """
+    Map the style ids of all paragraph styles to their (user interface) names.
+    The styles_element is the root (w:styles) of the styles part; python-docx offers it as Document.styles.element.
+    The key None maps to the name of the default paragraph style; it is used for paragraphs without style and for
+    unknown style ids (like in python-docx).
+    """
+    style_names: dict[Optional[str], Optional[str]] = {None: None}
+    for style in styles_element.iterchildren(_W_STYLE):
+        if style.get(_W_TYPE, "paragraph") != "paragraph":
+            continue
+        name_element = style.find(_W_NAME)
+        style_name = BabelFish.internal2ui(name_element.get(_W_VAL)) if name_element is not None else None
+        style_id = style.get(_W_STYLE_ID)
+        # python-docx uses the first style with the searched id
+        if style_id not in style_names:
+            style_names[style_id] = style_name
+        # and the last default style
+        if style.get(_W_DEFAULT) is not None and ST_OnOff.convert_from_xml(style.get(_W_DEFAULT)):
+            style_names[None] = style_name
+    return style_names
+
+
+def _create_parser() -> etree.XMLParser:
+    # the same parser settings as in python-docx
+    return etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+
+
+def get_document_part_name(package: zipfile.ZipFile) -> str:
+    """
+    Returns the name of the main document part (usually 'word/document.xml') of the docx package.
+    Raises a ValueError if the package contains no main document part.
+    """
+    document_part_name = _get_part_name_of_relationship(package, "", _OFFICE_DOCUMENT_RELATIONSHIP_TYPE)
+    if document_part_name is None:
+        raise ValueError(f"The file '{package.filename}' contains no main document part")
+    return document_part_name
+
+
+def _read_paragraph_style_names(
+    package: zipfile.ZipFile, document_part_name: str
+) -> dict[Optional[str], Optional[str]]:
+    styles_part_name = _get_part_name_of_relationship(package, document_part_name, _STYLES_RELATIONSHIP_TYPE)
+    if styles_part_name is None:
+        return {None: None}
+    with package.open(styles_part_name) as styles_part:
+        return get_paragraph_style_names(etree.parse(styles_part, _create_parser()).getroot())
+
+
+def is_heading_style_name(style_name: Optional[str]) -> bool:
+    """
+    Returns True if the given paragraph style name is the name of a heading style, e.g. 'Heading 1'.
+    """
+    return style_name is not None and "Heading" in style_name
+
+
+def get_heading_flags_by_style_id(
+    paragraph_style_names: dict[Optional[str], Optional[str]]
+) -> dict[Optional[str], bool]:
+    """
+    Map the style ids of all paragraph styles to True if the style is a heading style.
+    Like in the paragraph_style_names, the key None stands for the default paragraph style.
+    """
+    return {style_id: is_heading_style_name(style_name) for style_id, style_name in paragraph_style_names.items()}
+
+
+def get_paragraph_style_id(paragraph_element) -> Optional[str]:
+    """
+    Returns the raw style id (w:pStyle) of the given w:p element or None if the paragraph has no style.
+    """
+    paragraph_properties = paragraph_element.find(_W_P_PR)
+    if paragraph_properties is None:
+        return None
+    paragraph_style = paragraph_properties.find(_W_P_STYLE)
+    if paragraph_style is None:
+        return None
+    return paragraph_style.get(_W_VAL)
+
+
+def _get_style_name(paragraph_style_names: dict[Optional[str], Optional[str]], paragraph_element) -> Optional[str]:
+    """
+    Returns the name of the style of the given w:p element.
+    """
+    style_id = get_paragraph_style_id(paragraph_element)
+    if style_id not in paragraph_style_names:
+        style_id = None
+    return paragraph_style_names[style_id]
+
+
+def _to_paragraph_or_table(
+    paragraph_style_names: dict[Optional[str], Optional[str]], body_child
+) -> Optional[Union[LxmlParagraph, LxmlTable]]:
+    if body_child.tag == _W_P:
+        return LxmlParagraph(element=body_child, style_name=_get_style_name(paragraph_style_names, body_child))
+    if body_child.tag == _W_TBL:
+        return LxmlTable(element=body_child)
+    return None
+
+
+T = TypeVar("T")
+
+
+def filter_body_child_index_range(
+    body_children: Iterable[tuple[int, T]], body_child_index_range: Optional[tuple[int, int]]
+) -> Generator[tuple[int, T], None, None]:
+    """
+    Yield those body children (together with their index among the children of the body) whose index is in the given
+    range from the first to the last index (inclusive). If no range is given, all body children are yielded.
+    The body children have to be ordered by their index, so that the iteration stops behind the range.
+    """
+    for body_child_index, body_child in body_children:
+        if body_child_index_range is not None:
+            if body_child_index < body_child_index_range[0]:
+                continue
+            if body_child_index > body_child_index_range[1]:
+                break
+        yield body_child_index, body_child
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class LxmlDocument:
+    """
+    A docx document whose body is read with lxml.
+    """
+
+    body: etree._Element
+    #: maps the paragraph style ids to the style names
+    paragraph_style_names: dict[Optional[str], Optional[str]]
+
+    @classmethod
+    def from_file(cls, path: Union[Path, str]) -> "LxmlDocument":
+        """
+        Read the main document part and the styles of the given docx file
+        """
+        with zipfile.ZipFile(path) as package:
+            document_part_name = get_document_part_name(package)
+            with package.open(document_part_name) as document_part:
+                document_element = etree.parse(document_part, _create_parser()).getroot()
+            paragraph_style_names = _read_paragraph_style_names(package, document_part_name)
+        body = document_element.find(_W_BODY)
+        if body is None:
+            raise ValueError(f"The file '{path}' contains no document body")
+        return cls(body=body, paragraph_style_names=paragraph_style_names)
+
+    def iter_paragraphs_and_tables(
+        self, body_child_index_range: Optional[tuple[int, int]] = None
+    ) -> Generator[tuple[int, Union[LxmlParagraph, LxmlTable]], None, None]:
+        """
+        Yield each paragraph and table of the document body together with its index among the children of the body.
+        If a range is given, only the children from the first to the last index (inclusive) are yielded.
+        """
+        for body_child_index, child in filter_body_child_index_range(
+            enumerate(self.body.iterchildren(tag=etree.Element)), body_child_index_range
+        ):
+            item = _to_paragraph_or_table(self.paragraph_style_names, child)
+            if item is not None:
+                yield body_child_index, item
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class StreamingLxmlDocument:
+    """
+    A docx document whose body is streamed with lxml iterparse.
+    In contrast to the LxmlDocument the whole document tree is never in memory:
+    The paragraphs and tables of the body are parsed one after another and they are cleared as soon as the next one
+    is requested. So the memory usage does not depend on the size of the document but only on the largest table.
+    """
+
+    path: Path
+    #: maps the paragraph style ids to the style names
+    paragraph_style_names: dict[Optional[str], Optional[str]]
+
+    @classmethod
+    def from_file(cls, path: Union[Path, str]) -> "StreamingLxmlDocument":
+        """
+        Read the styles of the given docx file; the body is read later on when iterating over it
+        """
+        with zipfile.ZipFile(path) as package:
+            paragraph_style_names = _read_paragraph_style_names(package, get_document_part_name(package))
+        return cls(path=Path(path), paragraph_style_names=paragraph_style_names)
+
+    def iter_paragraphs_and_tables(
+        self, body_child_index_range: Optional[tuple[int, int]] = None
+    ) -> Generator[tuple[int, Union[LxmlParagraph, LxmlTable]], None, None]:
+        """
+        Yield each paragraph and table of the document body together with its index among the children of the body.
+        If a range is given, only the children from the first to the last index (inclusive) are yielded.
+        A yielded item must not be used anymore after the next item has been requested.
+        """
+        for body_child_index, element in filter_body_child_index_range(
+            self._iter_body_children(), body_child_index_range
+        ):
+            item = _to_paragraph_or_table(self.paragraph_style_names, element)
+            if item is not None:
+                yield body_child_index, item
+
+    def _iter_body_children(self) -> Generator[tuple[int, etree._Element], None, None]:
+        """
+        Stream the paragraphs and tables of the document body together with their index among the children of the body.
+        """
+        number_of_consumed_body_children = 0
+        with zipfile.ZipFile(self.path) as package, package.open(get_document_part_name(package)) as document_part:
+            # the same parser settings as in python-docx
+            for _, element in etree.iterparse(
+                document_part, events=("end",), tag=(_W_P, _W_TBL), remove_blank_text=True, resolve_entities=False
+            ):
+                body = element.getparent()
+                if body is None or body.tag != _W_BODY:
+                    # paragraphs in tables are part of their table
+                    continue
+                # all children of the body in front of this element are done; we remove them to free the memory
+                for sibling in list(element.itersiblings(preceding=True)):
+                    if isinstance(sibling.tag, str):
+                        number_of_consumed_body_children += 1
+                    sibling.clear()
+                    body.remove(sibling)
+                yield number_of_consumed_body_children, element
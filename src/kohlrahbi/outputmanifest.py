@@ -0,0 +1,54 @@
+"""
+This module contains the OutputManifest class and a function to write output files only if their content changed.
+Unchanged output files are not touched, so that their modification date stays the same and downstream tools
+(e.g. rebuilds or git) do not see any changes.
+"""
+import json
+from pathlib import Path
+
+import attrs
+
+from kohlrahbi.fingerprint import get_fingerprint_of_content, get_fingerprint_of_file
+from kohlrahbi.logger import logger
+
+
+def write_file_if_changed(file_path: Path, content: bytes) -> bool:
+    """
+    Writes the content into the given file, unless the file has exactly this content already.
+    Returns True if the file was written and False if it was left untouched.
+    """
+    if (
+        file_path.exists()
+        and file_path.stat().st_size == len(content)
+        and get_fingerprint_of_file(file_path) == get_fingerprint_of_content(content)
+    ):
+        logger.debug("The file %s is unchanged", file_path)
+        return False
+    file_path.write_bytes(content)
+    return True
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class OutputManifest:
+    """
+    The OutputManifest lists all files which were produced in a run together with the fingerprints of their content.
+    It is stored as json file in the output directory, so that consumers can sync the output incrementally.
+    """
+
+    path: Path
+    #: maps the path of each produced file (relative to the directory of the manifest) to the fingerprint of its content
+    files: dict[str, str] = attrs.field(factory=dict)
+
+    def add_file(self, file_path: Path) -> None:
+        """
+        Add a produced file to the manifest.
+        """
+        self.files[file_path.relative_to(self.path.parent).as_posix()] = get_fingerprint_of_file(file_path)
+
+    def save(self) -> None:
+        """
+        Write the manifest to its json file.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        content = json.dumps({"files": self.files}, ensure_ascii=False, indent=2, sort_keys=True)
+        write_file_if_changed(self.path, content.encode("utf-8"))
@@ -0,0 +1,75 @@
+"""
+This module contains the PruefiIndex class.
+"""
+from typing import Any, Optional
+
+import attrs
+
+from kohlrahbi.jsoncache import JsonCache
+
+#: the range of the body child indices of all tables which belong to one Prüfidentifikator;
+#: the first index is the position of the table with the header, the second one the position of the last table
+TableLocation = tuple[int, int]
+
+
+@attrs.define(auto_attribs=True, kw_only=True)
+class PruefiIndex(JsonCache):
+    """
+    The PruefiIndex remembers where the AHB table of a Prüfidentifikator is located.
+    For every docx file it stores which Prüfidentifikatoren have been searched in this file and, if they were found,
+    the range of the body children which contain the tables of the Prüfidentifikator.
+    The docx files are identified by the fingerprint of their content, so the index stays valid if the files get
+    renamed or moved and entries of changed files are simply not used anymore.
+    Entries which have been created by another kohlrahbi version are not used either.
+    The index is built as a by-product of the extraction and stored as json file to be reused in later runs.
+    """
+
+    #: maps the fingerprint of a docx file to its name and the table locations of all searched Prüfidentifikatoren
+    entries: dict[str, dict] = attrs.field(factory=dict)
+
+    def _get_entry(self, fingerprint: str) -> dict:
+        """
+        Returns the entry of the docx file with the given fingerprint if it has been created by the same kohlrahbi
+        version, else an empty dict. Entries with an unexpected format are treated like missing entries.
+        """
+        entry = self.entries.get(fingerprint)
+        if (
+            not isinstance(entry, dict)
+            or entry.get("kohlrahbi_version") != self.kohlrahbi_version
+            or not isinstance(entry.get("pruefis"), dict)
+            or not all(_is_table_location(location) for location in entry["pruefis"].values())
+        ):
+            return {}
+        return entry
+
+    def get_table_locations(self, fingerprint: str) -> dict[str, Optional[TableLocation]]:
+        """
+        Returns the table locations of all Prüfidentifikatoren which have been searched in the docx file with the
+        given fingerprint. The location is None if the Prüfidentifikator was searched but not found in the file.
+        """
+        return {
+            pruefi: (location[0], location[1]) if location is not None else None
+            for pruefi, location in self._get_entry(fingerprint).get("pruefis", {}).items()
+        }
+
+    def add_table_locations(
+        self, fingerprint: str, file_name: str, table_locations: dict[str, Optional[TableLocation]]
+    ) -> None:
+        """
+        Add the table locations of the given Prüfidentifikatoren, which have been searched in the docx file with the
+        given fingerprint. Use None as location for a Prüfidentifikator that was searched but not found.
+        """
+        entry = self._get_entry(fingerprint) or {"kohlrahbi_version": self.kohlrahbi_version, "pruefis": {}}
+        entry["file_name"] = file_name
+        for pruefi, location in table_locations.items():
+            entry["pruefis"][pruefi] = list(location) if location is not None else None
+        self.entries[fingerprint] = entry
+
+
+def _is_table_location(location: Any) -> bool:
+    """
+    Checks if the location, which has been loaded from the json file, is None or a pair of body child indices.
+    """
+    return location is None or (
+        isinstance(location, list) and len(location) == 2 and all(isinstance(index, int) for index in location)
+    )
@@ -3,20 +3,53 @@ A collection of functions to get information from AHB tables.
 """
 import re
 from datetime import datetime
+from itertools import islice
+from pathlib import Path
 from typing import Generator, Optional, Union
 
+import docx  # type:ignore[import]
 import pytz
+from attrs import define, field
 from docx.document import Document  # type:ignore[import]
 from docx.oxml.table import CT_Tbl  # type:ignore[import]
 from docx.oxml.text.paragraph import CT_P  # type:ignore[import]
 from docx.table import Table, _Cell  # type:ignore[import]
 from docx.text.paragraph import Paragraph  # type:ignore[import]
+from lxml import etree  # type:ignore[import]
 from maus.edifact import EdifactFormatVersion, get_edifact_format_version
 
 from kohlrahbi.ahb.ahbsubtable import AhbSubTable
+from kohlrahbi.ahb.ahbsubtablecache import AhbSubTableCache
 from kohlrahbi.ahb.ahbtable import AhbTable
+from kohlrahbi.enums import ExtractionEngine
+from kohlrahbi.irdocument import IrDocument, IrParagraph, IrTable
 from kohlrahbi.logger import logger
-from kohlrahbi.seed import Seed
+from kohlrahbi.lxmldocument import (
+    LxmlDocument,
+    LxmlParagraph,
+    LxmlTable,
+    StreamingLxmlDocument,
+    get_heading_flags_by_style_id,
+    get_paragraph_style_id,
+    get_paragraph_style_names,
+    is_heading_style_name,
+)
+from kohlrahbi.pruefiindex import TableLocation
+from kohlrahbi.seed import AhbTableHeaderCache, Seed, is_ahb_table_with_header
+
+#: a docx document which is read by one of the extraction engines
+AhbDocument = Union[Document, LxmlDocument, StreamingLxmlDocument, IrDocument]
+
+
+def open_ahb_document(path: Path, engine: ExtractionEngine = ExtractionEngine.PYTHON_DOCX) -> AhbDocument:
+    """
+    Opens the docx file with the given extraction engine.
+    """
+    if engine is ExtractionEngine.LXML:
+        return LxmlDocument.from_file(path)
+    if engine is ExtractionEngine.LXML_STREAMING:
+        return StreamingLxmlDocument.from_file(path)
+    return docx.Document(path)
 
 
 def get_all_paragraphs_and_tables(parent: Union[Document, _Cell]) -> Generator[Union[Paragraph, Table], None, None]:
@@ -41,6 +74,27 @@ def get_all_paragraphs_and_tables(parent: Union[Document, _Cell]) -> Generator[U
             yield Table(child, parent)
 
 
+def _get_paragraphs_and_tables_with_body_child_index(
+    document: AhbDocument, body_child_index_range: Optional[TableLocation] = None
+) -> Generator[tuple[int, Union[Paragraph, Table, LxmlParagraph, LxmlTable, IrParagraph, IrTable]], None, None]:
+    """
+    Yield each paragraph and table of the document body together with its index among the children of the body.
+    If a range is given, only the children from the first to the last index (inclusive) are yielded.
+    """
+    if isinstance(document, (LxmlDocument, StreamingLxmlDocument, IrDocument)):
+        yield from document.iter_paragraphs_and_tables(body_child_index_range=body_child_index_range)
+        return
+    start_index, stop_index = (
+        (0, None) if body_child_index_range is None else (body_child_index_range[0], body_child_index_range[1] + 1)
+    )
+    body_children = document.element.body.iterchildren(tag=etree.Element)
+    for body_child_index, child in enumerate(islice(body_children, start_index, stop_index), start=start_index):
+        if isinstance(child, CT_P):
+            yield body_child_index, Paragraph(child, document)
+        elif isinstance(child, CT_Tbl):
+            yield body_child_index, Table(child, document)
+
+
 _validity_start_date_from_ahbname_pattern = re.compile(r"^.*(?P<germanLocalTimeStartDate>\d{8})\.docx$")
 """
 https://regex101.com/r/g4wWrT/1
@@ -66,88 +120,293 @@ def _get_format_version_from_ahbfile_name(ahb_docx_name: str) -> EdifactFormatVe
     return edifact_format_version
 
 
-def does_the_table_contain_pruefidentifikatoren(table: Table) -> bool:
+def does_the_table_contain_pruefidentifikatoren(table: Union[Table, LxmlTable, IrTable]) -> bool:
     """
     Checks if the given table is a AHB table with pruefidentifikatoren.
     """
 
-    return table.cell(row_idx=0, col_idx=0).text.strip() == "EDIFACT Struktur"
+    return is_ahb_table_with_header(table=table)
+
+
+def _get_heading_flags_by_style_id(document: AhbDocument) -> Optional[dict[Optional[str], bool]]:
+    """
+    Returns for each paragraph style id of a python-docx document whether the style is a heading style.
+    The map is computed once per document. The other engines resolve the style names while reading, so for them
+    None is returned.
+    """
+    if isinstance(document, Document):
+        return get_heading_flags_by_style_id(get_paragraph_style_names(document.styles.element))
+    return None
+
+
+def _is_heading(
+    paragraph: Union[Paragraph, LxmlParagraph, IrParagraph],
+    heading_flags_by_style_id: Optional[dict[Optional[str], bool]],
+) -> bool:
+    """
+    Returns True if the given paragraph has a heading style.
+    For python-docx paragraphs, the raw w:pStyle value is looked up in the heading flags of the document.
+    This avoids paragraph.style.name, which includes some xpath searches in the styles part for every paragraph.
+    """
+    if isinstance(paragraph, (LxmlParagraph, IrParagraph)):
+        return is_heading_style_name(paragraph.style_name)
+    if heading_flags_by_style_id is None:
+        return is_heading_style_name(paragraph.style.name)
+    # unknown style ids fall back to the default paragraph style (like in python-docx)
+    style_id = get_paragraph_style_id(paragraph._p)  # pylint:disable=protected-access
+    return heading_flags_by_style_id.get(style_id, heading_flags_by_style_id[None])
 
 
-def get_ahb_table(document: Document, pruefi: str) -> Optional[AhbTable]:
+@define(auto_attribs=True, kw_only=True)
+class _AhbTableCollector:
+    """
+    Holds the state of the search for the AHB table of one Prüfidentifikator while we walk through the document.
+    """
+
+    pruefi: str
+    #: the sub table which contains the header; its seed is used to parse all following headless tables
+    ahb_sub_table: Optional[AhbSubTable] = None
+    ahb_table: Optional[AhbTable] = None
+    searched_pruefi_is_found: bool = False
+    is_finished: bool = False
+    #: body child indices of the first and the last table of the AHB table
+    table_location: Optional[TableLocation] = None
+    #: True if parsing one of the tables of the AHB table raised an error
+    has_failed: bool = False
+
+    def fail(self, error: Exception) -> None:
+        """
+        Logs the error and stops the search for this Prüfidentifikator.
+        The other Prüfidentifikatoren of the document are not affected.
+        """
+        logger.error(
+            "There was an uncaught error while parsing the AHB table of the pruefi '%s'",
+            self.pruefi,
+            exc_info=error,
+        )
+        self.ahb_table = None
+        self.has_failed = True
+        self.is_finished = True
+
+
+@define(auto_attribs=True, kw_only=True)
+class _DocxTableParser:
+    """
+    Parses one docx table for all Prüfidentifikatoren whose AHB table contains it.
+    The parsing result of a docx table only depends on the table and the seed it is parsed with.
+    Prüfidentifikatoren which start in the same table share their seed, so each table is parsed only once.
+    Errors are remembered, too, so that only the Prüfidentifikatoren which need the table fail.
+    """
+
+    docx_table: Union[Table, LxmlTable, IrTable]
+    body_child_index: int
+    ahb_sub_table_cache: Optional[AhbSubTableCache] = None
+    table_header_cache: Optional[AhbTableHeaderCache] = None
+    #: the parsed sub tables (or the errors) by the id of their seed; the key None stands for the table with header
+    _results: dict[Optional[int], Union[AhbSubTable, Exception]] = field(factory=dict, init=False)
+
+    def parse_table_with_header(self) -> AhbSubTable:
+        """
+        Parses the docx table as the first table of an AHB table.
+        """
+        if None not in self._results:
+            try:
+                self._results[None] = AhbSubTable.from_table_with_header(
+                    docx_table=self.docx_table,
+                    ahb_sub_table_cache=self.ahb_sub_table_cache,
+                    table_header_cache=self.table_header_cache,
+                )
+            except Exception as general_error:  # pylint:disable=broad-except
+                self._results[None] = general_error
+        return self._get_result(None)
+
+    def parse_headless_table(self, table_meta_data: Seed) -> AhbSubTable:
+        """
+        Parses the docx table as a following table of the AHB table with the given seed.
+        """
+        if id(table_meta_data) not in self._results:
+            try:
+                self._results[id(table_meta_data)] = AhbSubTable.from_headless_table(
+                    docx_table=self.docx_table, tmd=table_meta_data, ahb_sub_table_cache=self.ahb_sub_table_cache
+                )
+            except Exception as general_error:  # pylint:disable=broad-except
+                self._results[id(table_meta_data)] = general_error
+        return self._get_result(id(table_meta_data))
+
+    def _get_result(self, key: Optional[int]) -> AhbSubTable:
+        result = self._results[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _add_docx_table_to_ahb_tables(
+    collectors: list[_AhbTableCollector], docx_table_parser: _DocxTableParser, seed: Optional[Seed]
+) -> None:
+    """
+    Adds the docx table to the AHB tables of all collectors which are not finished yet.
+    The seed is only given if the docx table contains Prüfidentifikatoren, i.e. if new AHB tables start in it.
+    """
+    body_child_index = docx_table_parser.body_child_index
+    for collector in collectors:
+        if collector.is_finished:
+            continue
+
+        if seed is not None:
+            collector.searched_pruefi_is_found = (
+                collector.pruefi in seed.pruefidentifikatoren and collector.ahb_table is None
+            )
+
+            if collector.searched_pruefi_is_found:
+                logger.info("👀 Found the AHB table with the Prüfidentifkator you are looking for %s", collector.pruefi)
+                logger.info("✨ Initializing new ahb table")
+                try:
+                    ahb_sub_table_with_header = docx_table_parser.parse_table_with_header()
+                except Exception as general_error:  # pylint:disable=broad-except
+                    collector.fail(general_error)
+                    continue
+                collector.ahb_sub_table = ahb_sub_table_with_header
+                # each Prüfidentifikator gets its own copy because the AhbTable gets modified later on
+                collector.ahb_table = AhbTable(table=ahb_sub_table_with_header.table.copy())
+                collector.table_location = (body_child_index, body_child_index)
+                continue
+
+        if collector.ahb_table is None or collector.ahb_sub_table is None or collector.table_location is None:
+            continue
+        try:
+            headless_ahb_sub_table = docx_table_parser.parse_headless_table(collector.ahb_sub_table.table_meta_data)
+        except Exception as general_error:  # pylint:disable=broad-except
+            collector.fail(general_error)
+            continue
+        collector.ahb_table.append_ahb_sub_table(ahb_sub_table=headless_ahb_sub_table)
+        collector.table_location = (collector.table_location[0], body_child_index)
+
+
+def get_ahb_table(document: AhbDocument, pruefi: str) -> Optional[AhbTable]:
     """
     Reads a docx file and extracts all information for each Prüfidentifikator.
     If the Prüfidentifikator is not found or we reached the end of the AHB document
     - indicated by the section 'Änderungshistorie' - it returns None.
 
     Args:
-        document (Document): AHB word document which is read by python-docx package
+        document (AhbDocument): AHB word document which is read by one of the extraction engines
+    """
+    return get_ahb_tables(document=document, pruefis=[pruefi]).get(pruefi)
+
+
+# pylint: disable=too-many-branches, too-many-locals, too-many-statements
+def get_ahb_tables(
+    document: AhbDocument,
+    pruefis: list[str],
+    table_locations: Optional[dict[str, Optional[TableLocation]]] = None,
+    body_child_index_range: Optional[TableLocation] = None,
+    ahb_sub_table_cache: Optional[AhbSubTableCache] = None,
+) -> dict[str, AhbTable]:
+    """
+    Reads a docx file once and extracts the AHB tables of all given Prüfidentifikatoren in a single walk.
+    The returned dictionary only contains those Prüfidentifikatoren whose AHB table was found.
+    A Prüfidentifikator whose table does not end before the section 'Änderungshistorie' is not returned
+    (same as in get_ahb_table).
+
+    Args:
+        document (AhbDocument): AHB word document which is read by one of the extraction engines
+        pruefis (list[str]): all Prüfidentifikatoren you are looking for
+        table_locations (dict[str, Optional[TableLocation]]): if given, the body child index range of the tables
+            of each found Prüfidentifikator is stored in this dictionary. None is stored for the Prüfidentifikatoren
+            which are not in the document; this is only known, if the whole document has been read and no error
+            occurred while parsing the tables of the Prüfidentifikator.
+        body_child_index_range (TableLocation): if given, only the body children in this range are read
+            (e.g. a range from the PruefiIndex)
+        ahb_sub_table_cache (AhbSubTableCache): if given, the parsed docx tables are taken from and stored in this cache
     """
 
     seed: Optional[Seed] = None
 
-    ahb_table: Optional[AhbTable] = None
-    is_ahb_table_initialized: bool = False
-    searched_pruefi_is_found: bool = False
+    collectors: list[_AhbTableCollector] = [_AhbTableCollector(pruefi=pruefi) for pruefi in dict.fromkeys(pruefis)]
+    result: dict[str, AhbTable] = {}
+    we_reached_the_end_of_the_ahb_document: bool = False
+    heading_flags_by_style_id = _get_heading_flags_by_style_id(document)
+    # the header of a table is needed to find its pruefis and to parse it, but it is read only once
+    table_header_cache = AhbTableHeaderCache()
 
     # Iterate through the whole word document
     logger.info("Start iterating through paragraphs and tables")
-    for item in get_all_paragraphs_and_tables(parent=document):
-        style_name = item.style.name  # this is a bit expensive. we should only call it once per item
-        # Check if we reached the end of the current AHB document and stop if it's true.
-        if isinstance(item, Paragraph) and "Änderungshistorie" in item.text and "Heading" in style_name:
-            # checking the style is quite expensive for the CPU because it includes some xpath searches;
-            # we should only check the style if the other (easier/cheap) checks returned True
-            logger.info(
-                "We reached the end of the document before any table containing the searched Prüfi %s was found", pruefi
-            )
-            del seed
-            return None
+    for body_child_index, item in _get_paragraphs_and_tables_with_body_child_index(
+        document=document, body_child_index_range=body_child_index_range
+    ):
+        active_collectors = [collector for collector in collectors if not collector.is_finished]
+        if not any(active_collectors):
+            break
 
-        # Check if there is just a text paragraph,
-        if isinstance(item, Paragraph) and not "Heading" in style_name:
-            continue
+        if isinstance(item, (Paragraph, LxmlParagraph, IrParagraph)):
+            paragraph_is_heading = _is_heading(paragraph=item, heading_flags_by_style_id=heading_flags_by_style_id)
 
-        if isinstance(item, Table) and does_the_table_contain_pruefidentifikatoren(table=item):
-            # check which pruefis
-            seed = Seed.from_table(docx_table=item)
-            logger.debug("Found a table with the following pruefis (A): %s", seed.pruefidentifikatoren)
+            # Check if we reached the end of the current AHB document and stop if it's true.
+            if paragraph_is_heading and "Änderungshistorie" in item.text:
+                for collector in active_collectors:
+                    logger.info(
+                        "We reached the end of the document before any table containing the searched Prüfi %s "
+                        "was found",
+                        collector.pruefi,
+                    )
+                    collector.ahb_table = None
+                    collector.is_finished = True
+                we_reached_the_end_of_the_ahb_document = True
+                break
 
-        we_reached_the_end_of_the_ahb_table_of_the_searched_pruefi: bool = (
-            seed is not None and pruefi not in seed.pruefidentifikatoren and searched_pruefi_is_found
-        )
+            # Check if there is just a text paragraph,
+            if not paragraph_is_heading:
+                continue
 
-        if we_reached_the_end_of_the_ahb_table_of_the_searched_pruefi:
-            del seed
-            seed = None
-            logger.info("🏁 We reached the end of the AHB table of the Prüfidentifikator '%s'", pruefi)
-            break
+        item_contains_pruefidentifikatoren: bool = isinstance(
+            item, (Table, LxmlTable, IrTable)
+        ) and does_the_table_contain_pruefidentifikatoren(table=item)
 
-        if isinstance(item, Table) and does_the_table_contain_pruefidentifikatoren(table=item):
+        if item_contains_pruefidentifikatoren:
             # check which pruefis
-            seed = Seed.from_table(docx_table=item)
-            logger.debug("Found a table with the following pruefis (B): %s", seed.pruefidentifikatoren)
+            seed = Seed.from_table(docx_table=item, table_header_cache=table_header_cache)
+            logger.debug("Found a table with the following pruefis: %s", seed.pruefidentifikatoren)
 
-            searched_pruefi_is_found = pruefi in seed.pruefidentifikatoren and not is_ahb_table_initialized
-
-            if searched_pruefi_is_found:
-                logger.info("👀 Found the AHB table with the Prüfidentifkator you are looking for %s", pruefi)
-                logger.info("✨ Initializing new ahb table")
-
-                ahb_sub_table = AhbSubTable.from_table_with_header(docx_table=item)
+        for collector in active_collectors:
+            we_reached_the_end_of_the_ahb_table_of_the_searched_pruefi: bool = (
+                seed is not None
+                and collector.pruefi not in seed.pruefidentifikatoren
+                and collector.searched_pruefi_is_found
+            )
+            if we_reached_the_end_of_the_ahb_table_of_the_searched_pruefi:
+                logger.info("🏁 We reached the end of the AHB table of the Prüfidentifikator '%s'", collector.pruefi)
+                collector.is_finished = True
 
-                ahb_table = AhbTable.from_ahb_sub_table(ahb_sub_table=ahb_sub_table)
+        if not isinstance(item, (Table, LxmlTable, IrTable)):
+            continue
 
-                is_ahb_table_initialized = True
-                continue
-        if isinstance(item, Table) and seed is not None and ahb_table is not None:
-            ahb_sub_table = AhbSubTable.from_headless_table(docx_table=item, tmd=ahb_sub_table.table_meta_data)
-            ahb_table.append_ahb_sub_table(ahb_sub_table=ahb_sub_table)
+        _add_docx_table_to_ahb_tables(
+            collectors=collectors,
+            docx_table_parser=_DocxTableParser(
+                docx_table=item,
+                body_child_index=body_child_index,
+                ahb_sub_table_cache=ahb_sub_table_cache,
+                table_header_cache=table_header_cache,
+            ),
+            seed=seed if item_contains_pruefidentifikatoren else None,
+        )
 
-    if ahb_table is None:
-        logger.warning("⛔️ Your searched pruefi '%s' was not found in the provided files.\n", pruefi)
-        return None
+    for collector in collectors:
+        if collector.ahb_table is None:
+            if not we_reached_the_end_of_the_ahb_document and not collector.has_failed:
+                logger.warning("⛔️ Your searched pruefi '%s' was not found in the provided files.\n", collector.pruefi)
+            pruefi_is_not_in_the_document = collector.table_location is None and not collector.has_failed
+            if table_locations is not None and body_child_index_range is None and pruefi_is_not_in_the_document:
+                table_locations[collector.pruefi] = None
+            continue
+        try:
+            collector.ahb_table.sanitize()
+        except Exception as general_error:  # pylint:disable=broad-except
+            collector.fail(general_error)
+            continue
+        result[collector.pruefi] = collector.ahb_table
+        if table_locations is not None and collector.table_location is not None:
+            table_locations[collector.pruefi] = collector.table_location
 
-    ahb_table.sanitize()
     del seed
-    return ahb_table
+    return result
@@ -1,11 +1,14 @@
 """
 This module contains all functions to define the type of a row of the tables in an AHB.
 """
+from typing import Union
+
 from docx.oxml import OxmlElement  # type:ignore[import]
 from docx.oxml.ns import qn  # type:ignore[import]
 from docx.shared import RGBColor  # type:ignore[import]
 from docx.table import _Cell  # type:ignore[import]
 
+from kohlrahbi.cellfeatures import CellFeatures, EdifactStrukturCellFeatures, to_edifact_struktur_cell_features
 from kohlrahbi.enums import RowType
 
 
@@ -21,129 +24,132 @@ def set_table_header_bg_color(cell, hex_color: str):
     return cell
 
 
-def is_row_header(edifact_struktur_cell: _Cell) -> bool:
+def is_row_header(edifact_struktur_cell: Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]) -> bool:
     """Checks if the current row is a header.
 
     Args:
-        edifact_struktur_cell (_Cell): Indicator cell
+        edifact_struktur_cell (Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]): Indicator cell
 
     Returns:
         bool:
     """
+    edifact_struktur_cell = to_edifact_struktur_cell_features(edifact_struktur_cell)
     if edifact_struktur_cell.text == "EDIFACT Struktur":
         return True
 
     return False
 
 
-def is_row_segmentname(edifact_struktur_cell: _Cell) -> bool:
+def is_row_segmentname(edifact_struktur_cell: Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]) -> bool:
     """Checks if the current row contains just a segment name.
        Example: "Nachrichten-Kopfsegment"
 
     Args:
-        edifact_struktur_cell (_Cell): Indicator cell
+        edifact_struktur_cell (Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]): Indicator cell
 
     Returns:
         bool:
     """
-    try:
-        return edifact_struktur_cell.paragraphs[0].runs[0].font.color.rgb == RGBColor(128, 128, 128)  # grey
-    except IndexError:
-        return False
+    edifact_struktur_cell = to_edifact_struktur_cell_features(edifact_struktur_cell)
+    first_run = edifact_struktur_cell.first_run
+    return first_run is not None and first_run.font_color == RGBColor(128, 128, 128)  # grey
 
 
-def is_row_segmentgruppe(edifact_struktur_cell: _Cell, left_indent_position: int) -> bool:
+def is_row_segmentgruppe(
+    edifact_struktur_cell: Union[_Cell, CellFeatures, EdifactStrukturCellFeatures], left_indent_position: int
+) -> bool:
     """Checks if the current row is a segmentgruppe.
        Example: "SG2"
 
     Args:
-        edifact_struktur_cell (_Cell): Indicator cell
+        edifact_struktur_cell (Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]): Indicator cell
         left_indent_position (int): Position of the left indent
 
     Returns:
         bool:
     """
+    edifact_struktur_cell = to_edifact_struktur_cell_features(edifact_struktur_cell)
     return (
-        edifact_struktur_cell.paragraphs[0].paragraph_format.left_indent != left_indent_position
-        and "\t" not in edifact_struktur_cell.text
+        edifact_struktur_cell.left_indent != left_indent_position
+        and edifact_struktur_cell.tab_count == 0
         and not edifact_struktur_cell.text == ""
     )
 
 
-def is_row_segment(edifact_struktur_cell: _Cell, left_indent_position: int) -> bool:
+def is_row_segment(
+    edifact_struktur_cell: Union[_Cell, CellFeatures, EdifactStrukturCellFeatures], left_indent_position: int
+) -> bool:
     """Checks if the current row is a segment.
        Example: "UNH", "SG2\tNAD"
 
     Args:
-        edifact_struktur_cell (_Cell): Indicator cell
+        edifact_struktur_cell (Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]): Indicator cell
         left_indent_position (int): Position of the left indent
 
     Returns:
         bool:
     """
+    edifact_struktur_cell = to_edifact_struktur_cell_features(edifact_struktur_cell)
     # |   UNH    |
     if (
-        edifact_struktur_cell.paragraphs[0].paragraph_format.left_indent == left_indent_position
-        and "\t" not in edifact_struktur_cell.text
+        edifact_struktur_cell.left_indent == left_indent_position
+        and edifact_struktur_cell.tab_count == 0
         and not edifact_struktur_cell.text == ""
     ):
         return True
 
     # | SG2\tNAD |
-    if (
-        not edifact_struktur_cell.paragraphs[0].paragraph_format.left_indent == left_indent_position
-        and edifact_struktur_cell.text.count("\t") == 1
-    ):
+    if not edifact_struktur_cell.left_indent == left_indent_position and edifact_struktur_cell.tab_count == 1:
         return True
 
     return False
 
 
-def is_row_datenelement(edifact_struktur_cell: _Cell, left_indent_position: int) -> bool:
+def is_row_datenelement(
+    edifact_struktur_cell: Union[_Cell, CellFeatures, EdifactStrukturCellFeatures], left_indent_position: int
+) -> bool:
     """Checks if the current row is a datenelement.
        Example: "UNH\t00062", "SG2\tNAD\t3035"
 
     Args:
-        edifact_struktur_cell (_Cell): Indicator cell
+        edifact_struktur_cell (Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]): Indicator cell
         left_indent_position (int): Position of the left indent
 
     Returns:
         bool:
     """
+    edifact_struktur_cell = to_edifact_struktur_cell_features(edifact_struktur_cell)
     # |   UNH\t0062 |
-    if (
-        edifact_struktur_cell.paragraphs[0].paragraph_format.left_indent == left_indent_position
-        and "\t" in edifact_struktur_cell.text
-    ):
+    if edifact_struktur_cell.left_indent == left_indent_position and edifact_struktur_cell.tab_count > 0:
         return True
 
     # | SG2\tNAD\t3035 |
-    if (
-        not edifact_struktur_cell.paragraphs[0].paragraph_format.left_indent == left_indent_position
-        and edifact_struktur_cell.text.count("\t") == 2
-    ):
+    if not edifact_struktur_cell.left_indent == left_indent_position and edifact_struktur_cell.tab_count == 2:
         return True
 
     return False
 
 
-def is_row_empty(edifact_struktur_cell: _Cell) -> bool:
+def is_row_empty(edifact_struktur_cell: Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]) -> bool:
     """Checks if the current row is empty.
        Example: ""
     Args:
-        edifact_struktur_cell (_Cell): Indicator cell
+        edifact_struktur_cell (Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]): Indicator cell
 
     Returns:
         bool:
     """
+    edifact_struktur_cell = to_edifact_struktur_cell_features(edifact_struktur_cell)
     return edifact_struktur_cell.text == ""
 
 
-def get_row_type(edifact_struktur_cell: _Cell, left_indent_position: int) -> RowType:
+def get_row_type(
+    edifact_struktur_cell: Union[_Cell, CellFeatures, EdifactStrukturCellFeatures], left_indent_position: int
+) -> RowType:
     """Defines the type of the current row.
 
     Args:
-        edifact_struktur_cell (_Cell): Indicator cell
+        edifact_struktur_cell (Union[_Cell, CellFeatures, EdifactStrukturCellFeatures]): Indicator cell
         left_indent_position (int): Position of the left indent
 
     Raises:
@@ -152,6 +158,7 @@ def get_row_type(edifact_struktur_cell: _Cell, left_indent_position: int) -> Row
     Returns:
         RowType: Type of the current row
     """
+    edifact_struktur_cell = to_edifact_struktur_cell_features(edifact_struktur_cell)
     if is_row_header(edifact_struktur_cell=edifact_struktur_cell):
         return RowType.HEADER
 
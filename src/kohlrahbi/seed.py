@@ -2,11 +2,16 @@
 This module provides a class to collect information which of need for all parsing functions
 """
 
-from attrs import define
+from typing import Optional, Union
+
+from attrs import define, field
 from docx.table import Table  # type:ignore[import]
 from docx.text.paragraph import Paragraph  # type:ignore[import]
+from lxml import etree  # type:ignore[import]
 
 from kohlrahbi.enums import RowType
+from kohlrahbi.irdocument import IrTable
+from kohlrahbi.lxmldocument import LxmlTable
 
 
 def get_tabstop_positions(paragraph: Paragraph) -> list[int]:
@@ -26,6 +31,96 @@ def get_tabstop_positions(paragraph: Paragraph) -> list[int]:
     return tabstop_positions
 
 
+def _get_table_element(table: Union[Table, LxmlTable]) -> etree._Element:
+    """
+    Returns the w:tbl element of a python-docx or lxml table
+    """
+    if isinstance(table, LxmlTable):
+        return table.element
+    return table._tbl  # pylint:disable=protected-access
+
+
+def _is_ahb_table_with_header_of_cells(table: Union[LxmlTable, IrTable]) -> bool:
+    return table.cell(row_idx=0, col_idx=0).text.strip() == "EDIFACT Struktur"
+
+
+@define(auto_attribs=True, kw_only=True, frozen=True)
+class _AhbTableHeader:
+    """
+    The information from the header of an AHB table which is needed to create a Seed
+    """
+
+    pruefidentifikatoren: tuple[str, ...]
+    edifact_struktur_left_indent_position: int
+    middle_cell_left_indent_position: int
+    tabstop_positions: tuple[int, ...]
+
+
+def _read_ahb_table_header_of_cells(table: Union[LxmlTable, IrTable]) -> _AhbTableHeader:
+    last_header_cell_text = table.cell(row_idx=0, col_idx=table.column_count - 1).text
+    look_up_term = "Prüfidentifikator"
+    cutter_index = last_header_cell_text.find(look_up_term) + 1
+    # +1 cause of \t after Prüfidentifikator
+    pruefidentifikatoren = last_header_cell_text[cutter_index + len(look_up_term) :].split("\t")
+
+    # edifact struktur cell
+    edifact_struktur_indicator_paragraph = table.cell(row_idx=4, col_idx=0).paragraphs[0]
+
+    # middle cell
+    middle_cell_indicator_paragraph = table.cell(row_idx=4, col_idx=1).paragraphs[0]
+
+    # all rows of the table are parsed relative to these indents, so there is no AHB table without them
+    if edifact_struktur_indicator_paragraph.left_indent is None or middle_cell_indicator_paragraph.left_indent is None:
+        raise ValueError(f"The header of the AHB table with the pruefis {pruefidentifikatoren} has no left indent")
+
+    return _AhbTableHeader(
+        pruefidentifikatoren=tuple(pruefidentifikatoren),
+        edifact_struktur_left_indent_position=edifact_struktur_indicator_paragraph.left_indent,
+        middle_cell_left_indent_position=middle_cell_indicator_paragraph.left_indent,
+        tabstop_positions=middle_cell_indicator_paragraph.tab_stop_positions,
+    )
+
+
+def _read_ahb_table_header(table: Union[Table, LxmlTable, IrTable]) -> _AhbTableHeader:
+    if isinstance(table, IrTable):
+        return _read_ahb_table_header_of_cells(table)
+    # the header is read directly from the w:tbl element, without building the cell grid of the whole table
+    return _read_ahb_table_header_of_cells(LxmlTable(element=_get_table_element(table)))
+
+
+def is_ahb_table_with_header(table: Union[Table, LxmlTable, IrTable]) -> bool:
+    """
+    Checks if the given table starts with the header of an AHB table, i.e. if it contains Prüfidentifikatoren.
+    """
+    if isinstance(table, IrTable):
+        return _is_ahb_table_with_header_of_cells(table)
+    return _is_ahb_table_with_header_of_cells(LxmlTable(element=_get_table_element(table)))
+
+
+@define(auto_attribs=True, kw_only=True)
+class AhbTableHeaderCache:
+    """
+    Remembers the headers of the AHB tables of one document, so that the header of each table is read only once,
+    although the seed of a table is created more than once (to find its Prüfidentifikatoren and to parse it).
+    A cache belongs to one walk through a document, so it does not keep the tables alive for longer.
+    """
+
+    #: the headers by the w:tbl elements of their tables
+    _table_headers: dict[etree._Element, _AhbTableHeader] = field(factory=dict, init=False)
+
+    def get_table_header(self, table: Union[Table, LxmlTable, IrTable]) -> _AhbTableHeader:
+        """
+        Returns the header of the given table, which is only read the first time it is asked for.
+        """
+        if isinstance(table, IrTable):
+            # the cells of an IR table are read already, so there is nothing to remember
+            return _read_ahb_table_header(table)
+        table_element = _get_table_element(table)
+        if table_element not in self._table_headers:
+            self._table_headers[table_element] = _read_ahb_table_header(table)
+        return self._table_headers[table_element]
+
+
 # pylint: disable=too-few-public-methods
 @define
 class Seed:
@@ -44,26 +139,20 @@ class Seed:
     # to decouple the data structure of Elixir from the input data
     # more information can be found on https://www.attrs.org/en/stable/init.html#initialization
     @classmethod
-    def from_table(cls, docx_table: Table) -> "Seed":
+    def from_table(
+        cls, docx_table: Union[Table, LxmlTable, IrTable], table_header_cache: Optional[AhbTableHeaderCache] = None
+    ) -> "Seed":
         """Prepare DataFrame for a new table with new Prüfidentifikatoren
 
         Args:
             item (Union[Paragraph, Table]): A paragraph or table from the docx
+            table_header_cache (AhbTableHeaderCache): if given, the header of the table is taken from this cache
         """
-        header_cells = [cell.text for cell in docx_table.row_cells(0)]
-        look_up_term = "Prüfidentifikator"
-        cutter_index = header_cells[-1].find(look_up_term) + 1
-        # +1 cause of \t after Prüfidentifikator
-        pruefidentifikatoren = header_cells[-1][cutter_index + len(look_up_term) :].split("\t")
-
-        # edifact struktur cell
-        edifact_struktur_indicator_paragraph = docx_table.cell(row_idx=4, col_idx=0).paragraphs[0]
-        edifact_struktur_left_indent_position = edifact_struktur_indicator_paragraph.paragraph_format.left_indent
-
-        # middle cell
-        middle_cell_indicator_paragraph = docx_table.cell(row_idx=4, col_idx=1).paragraphs[0]
-        middle_cell_left_indent_position = middle_cell_indicator_paragraph.paragraph_format.left_indent
-        tabstop_positions = get_tabstop_positions(middle_cell_indicator_paragraph)
+        if table_header_cache is not None:
+            table_header = table_header_cache.get_table_header(docx_table)
+        else:
+            table_header = _read_ahb_table_header(docx_table)
+        pruefidentifikatoren = list(table_header.pruefidentifikatoren)
 
         base_column_names: list = [
             "Segment Gruppe",
@@ -80,8 +169,8 @@ class Seed:
         return cls(
             pruefidentifikatoren=pruefidentifikatoren,
             column_headers=columns,
-            edifact_struktur_left_indent_position=edifact_struktur_left_indent_position,
-            middle_cell_left_indent_position=middle_cell_left_indent_position,
-            tabstop_positions=tabstop_positions,
+            edifact_struktur_left_indent_position=table_header.edifact_struktur_left_indent_position,
+            middle_cell_left_indent_position=table_header.middle_cell_left_indent_position,
+            tabstop_positions=list(table_header.tabstop_positions),
             last_two_row_types=last_two_row_types,
         )
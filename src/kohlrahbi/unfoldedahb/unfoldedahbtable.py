@@ -1,14 +1,17 @@
 """
 This module contains the UnfoldedAhbTable class.
 """
-import copy
 import json
 import re
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+from io import BytesIO
 from pathlib import Path
-from uuid import uuid4
+from typing import TYPE_CHECKING, Any, Optional
+from uuid import NAMESPACE_URL, UUID, uuid4, uuid5
 
 import attrs
-import pandas as pd
 from maus.edifact import get_format_of_pruefidentifikator
 from maus.models.anwendungshandbuch import (
     AhbLine,
@@ -17,25 +20,50 @@ from maus.models.anwendungshandbuch import (
     FlatAnwendungshandbuchSchema,
 )
 from maus.reader.flat_ahb_reader import FlatAhbCsvReader
-from more_itertools import first_true, peekable
 
 from kohlrahbi.ahb.ahbtable import AhbTable, _column_letter_width_mapping
+from kohlrahbi.ahb.stringtable import StringTable
+from kohlrahbi.enums import FlatAhbRowType
 from kohlrahbi.logger import logger
+from kohlrahbi.outputmanifest import write_file_if_changed
 from kohlrahbi.unfoldedahb.unfoldedahbline import UnfoldedAhbLine
 from kohlrahbi.unfoldedahb.unfoldedahbtablemetadata import UnfoldedAhbTableMetaData
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 _segment_group_pattern = re.compile(r"^SG\d+$")
 
 
-def _lines_are_equal_when_ignoring_guid(line1: AhbLine, line2: AhbLine) -> bool:
+def _matches_segment_group_pattern(segment_gruppe: list[str]) -> list[bool]:
+    """
+    returns for each value of the given column, if it is a segment group key, e.g. "SG2"
+    """
+    return [_segment_group_pattern.match(value) is not None for value in segment_gruppe]
+
+
+#: the namespace of the deterministic guids of the flat AHB lines
+_flat_ahb_line_guid_namespace: UUID = uuid5(NAMESPACE_URL, "https://github.com/Hochfrequenz/kohlrahbi/flatahb")
+
+_ahb_line_fields_without_guid: list[str] = [field.name for field in attrs.fields(AhbLine) if field.name != "guid"]
+
+#: the creation date written into the xlsx files; a fixed date makes the xlsx files reproducible
+_xlsx_creation_date = datetime(2023, 1, 1)
+
+
+def _get_content_key(line: AhbLine) -> tuple:
+    """
+    returns a hashable key of the line which is equal for two lines iff the lines are equal except for their guid
+    """
+    return tuple(getattr(line, field_name) for field_name in _ahb_line_fields_without_guid)
+
+
+def _get_deterministic_guid(pruefi: str, position: int, line: AhbLine) -> UUID:
     """
-    returns true iff the line1 and line2 are equal except for their guid
+    returns a guid which only depends on the pruefi, the position of the line in the flat AHB and its content
     """
-    line1_copy = copy.deepcopy(line1)
-    line2_copy = copy.deepcopy(line2)
-    line1_copy.guid = None
-    line2_copy.guid = None
-    return line1_copy == line2_copy
+    name = json.dumps([pruefi, position, *_get_content_key(line)], ensure_ascii=False)
+    return uuid5(_flat_ahb_line_guid_namespace, name)
 
 
 def _keep_guids_of_unchanged_lines_stable(
@@ -44,19 +72,26 @@ def _keep_guids_of_unchanged_lines_stable(
     """
     Modifies the instance of updated_ahb such that the guids of all lines that are unchanged are the same as in the
     existing_ahb. Only applies if metadata of both AHBs match.
+    Each updated line gets the guid of the first unchanged existing line after the last matched existing line.
     """
     if updated_ahb.meta == existing_ahb.meta:
+        existing_line_indices_by_content_key: dict[tuple, list[int]] = defaultdict(list)
+        for existing_index, existing_line in enumerate(existing_ahb.lines):
+            # the indices are appended in ascending order, so each list is sorted
+            existing_line_indices_by_content_key[_get_content_key(existing_line)].append(existing_index)
+
         existing_ahb_search_start_index = 0
-        for update_index, updated_line in enumerate(updated_ahb.lines.copy()):
-            if existing_line_match := first_true(  # ⚠ performance wise this goes like O(n^2)
-                existing_ahb.lines[existing_ahb_search_start_index:],
-                pred=lambda x: _lines_are_equal_when_ignoring_guid(
-                    x, updated_line  # pylint:disable=cell-var-from-loop
-                ),
-            ):
-                updated_ahb.lines[update_index].guid = existing_line_match.guid
-                # if we found a line match, we can start the next search at the next line in the next loop iteration
-                existing_ahb_search_start_index = existing_ahb.lines.index(existing_line_match) + 1
+        for updated_line in updated_ahb.lines:
+            existing_line_indices = existing_line_indices_by_content_key.get(_get_content_key(updated_line))
+            if not existing_line_indices:
+                continue
+            position = bisect_left(existing_line_indices, existing_ahb_search_start_index)
+            if position == len(existing_line_indices):
+                continue
+            existing_index = existing_line_indices[position]
+            updated_line.guid = existing_ahb.lines[existing_index].guid
+            # if we found a line match, we can start the next search at the next line in the next loop iteration
+            existing_ahb_search_start_index = existing_index + 1
 
 
 @attrs.define(auto_attribs=True, kw_only=True)
@@ -73,183 +108,274 @@ class UnfoldedAhb:
     )
 
     @classmethod
-    def from_ahb_table(cls, ahb_table: AhbTable, pruefi: str):
+    def from_ahb_table(cls, ahb_table: AhbTable, pruefi: str) -> "UnfoldedAhb":
         """
         This function creates an UnfoldedAhb from an AhbTable.
         """
-        unfolded_ahb_lines: list[UnfoldedAhbLine] = []
-        current_section_name: str = ""
-
-        # we need to peek one iteration in front of us
-        iterable_ahb_table = peekable(ahb_table.table.iterrows())
-
-        for index, series in enumerate(iterable_ahb_table):
-            row = series[1]
+        return cls.from_ahb_table_multi(ahb_table=ahb_table, pruefis=[pruefi])[pruefi]
 
-            current_section_name = UnfoldedAhb._get_section_name(
-                segment_gruppe_or_section_name=row["Segment Gruppe"], last_section_name=current_section_name
+    @classmethod
+    def from_ahb_table_multi(cls, ahb_table: AhbTable, pruefis: list[str]) -> dict[str, "UnfoldedAhb"]:
+        """
+        This function creates an UnfoldedAhb for each of the given Prüfidentifikatoren from an AhbTable which contains
+        the columns of all of them.
+        The table is unfolded only once, the Prüfidentifikatoren only differ in the Bedingungsausdruck of their lines.
+        """
+        table = ahb_table.table
+        for pruefi in pruefis:
+            if table.column_headers.count(pruefi) > 1:
+                raise ValueError(f"The AHB table contains more than one column for the Prüfidentifikator '{pruefi}'")
+
+        unfolded_ahb_line_fields = UnfoldedAhb._get_unfolded_ahb_line_fields(table=table)
+
+        unfolded_ahbs: dict[str, UnfoldedAhb] = {}
+        for pruefi in pruefis:
+            # the section name line of the last row takes the expression of the (non-existing) next row
+            ahb_expressions: list[str] = table.column(pruefi) + [""]
+            unfolded_ahbs[pruefi] = cls(
+                unfolded_ahb_lines=[
+                    UnfoldedAhbLine(**line_fields, bedinung_ausdruck=ahb_expressions[ahb_expression_row_index] or None)
+                    for line_fields, ahb_expression_row_index in unfolded_ahb_line_fields
+                ],
+                meta_data=UnfoldedAhbTableMetaData(
+                    pruefidentifikator=pruefi,
+                ),
             )
+        return unfolded_ahbs
 
-            if UnfoldedAhb._is_section_name(ahb_row=row):
-                _, next_row = iterable_ahb_table.peek()
-                ahb_expression = next_row[pruefi]
-
-                if _segment_group_pattern.match(next_row["Segment Gruppe"]):
-                    segment_group_key = next_row["Segment Gruppe"]
-                else:
-                    segment_group_key = None
-
-                unfolded_ahb_lines.append(
-                    UnfoldedAhbLine(
-                        index=index,
-                        segment_name=current_section_name,
-                        segment_gruppe=segment_group_key,
-                        segment=None,
-                        datenelement=None,
-                        code=None,
-                        qualifier=None,
-                        beschreibung=None,
-                        bedinung_ausdruck=ahb_expression or None,
-                        bedingung=None,
+    # pylint: disable=too-many-locals
+    @staticmethod
+    def _get_unfolded_ahb_line_fields(table: StringTable) -> list[tuple[dict[str, Any], int]]:
+        """
+        Returns the fields of all unfolded AHB lines of the given AHB table, except for the Bedingungsausdruck,
+        which depends on the Prüfidentifikator. Instead, each line comes with the index of the row, from which the
+        Bedingungsausdruck has to be taken.
+        The type of each row is determined for the whole table at once, then the lines are created from the plain
+        values of each row.
+        """
+        row_types = UnfoldedAhb._get_row_types(table=table)
+        segment_gruppe = table.column("Segment Gruppe")
+        section_names = UnfoldedAhb._get_section_names(segment_gruppe=segment_gruppe)
+        # a section name line gets its segment group from the next row
+        next_segment_gruppe = segment_gruppe[1:] + [""]
+
+        unfolded_ahb_line_fields: list[tuple[dict[str, Any], int]] = []
+        for index, (
+            row_type,
+            section_name,
+            segment_gruppe,
+            segment,
+            datenelement,
+            codes_und_qualifier,
+            beschreibung,
+            bedingung,
+            next_row_segment_gruppe,
+        ) in enumerate(
+            zip(
+                row_types,
+                section_names,
+                segment_gruppe,
+                table.column("Segment"),
+                table.column("Datenelement"),
+                table.column("Codes und Qualifier"),
+                table.column("Beschreibung"),
+                table.column("Bedingung"),
+                next_segment_gruppe,
+            )
+        ):
+            if row_type is FlatAhbRowType.SECTIONNAME:
+                unfolded_ahb_line_fields.append(
+                    (
+                        {
+                            "index": index,
+                            "segment_name": section_name,
+                            "segment_gruppe": (
+                                next_row_segment_gruppe
+                                if _segment_group_pattern.match(next_row_segment_gruppe)
+                                else None
+                            ),
+                            "segment": None,
+                            "datenelement": None,
+                            "code": None,
+                            "qualifier": None,
+                            "beschreibung": None,
+                            "bedingung": None,
+                        },
+                        index + 1,
                     )
                 )
                 continue
 
-            if UnfoldedAhb._is_segment_group(ahb_row=row):
+            if row_type is FlatAhbRowType.SEGMENTGROUP:
                 value_pool_entry, description = FlatAhbCsvReader.separate_value_pool_entry_and_name(
-                    row["Codes und Qualifier"], row["Beschreibung"]
+                    codes_und_qualifier, beschreibung
                 )
-                unfolded_ahb_lines.append(
-                    UnfoldedAhbLine(
-                        index=index,
-                        segment_name=current_section_name,
-                        segment_gruppe=row["Segment Gruppe"] or None,
-                        segment=row["Segment"] or None,
-                        datenelement=row["Datenelement"] or None,
-                        code=value_pool_entry,
-                        qualifier="",
-                        beschreibung=description,
-                        bedinung_ausdruck=row[pruefi] or None,
-                        bedingung=row["Beschreibung"],
+                unfolded_ahb_line_fields.append(
+                    (
+                        {
+                            "index": index,
+                            "segment_name": section_name,
+                            "segment_gruppe": segment_gruppe or None,
+                            "segment": segment or None,
+                            "datenelement": datenelement or None,
+                            "code": value_pool_entry,
+                            "qualifier": "",
+                            "beschreibung": description,
+                            "bedingung": beschreibung,
+                        },
+                        index,
                     )
                 )
-
-            if UnfoldedAhb._is_segment_opening_line(ahb_row=row):
-                unfolded_ahb_lines.append(
-                    UnfoldedAhbLine(
-                        index=index,
-                        segment_name=current_section_name,
-                        segment_gruppe=None,
-                        segment=row["Segment"] or None,
-                        datenelement=None,
-                        code=None,
-                        qualifier="",
-                        beschreibung=None,
-                        bedinung_ausdruck=row[pruefi] or None,
-                        bedingung=row["Beschreibung"],
+                if not datenelement:
+                    continue
+                # a segment group row with a data element additionally results in a data element line
+
+            if row_type is FlatAhbRowType.SEGMENTOPENINGLINE:
+                unfolded_ahb_line_fields.append(
+                    (
+                        {
+                            "index": index,
+                            "segment_name": section_name,
+                            "segment_gruppe": None,
+                            "segment": segment or None,
+                            "datenelement": None,
+                            "code": None,
+                            "qualifier": "",
+                            "beschreibung": None,
+                            "bedingung": beschreibung,
+                        },
+                        index,
                     )
                 )
                 continue
 
-            if UnfoldedAhb._is_just_segment(ahb_row=row):
+            if row_type is FlatAhbRowType.SEGMENT:
                 value_pool_entry, description = FlatAhbCsvReader.separate_value_pool_entry_and_name(
-                    row["Codes und Qualifier"], row["Beschreibung"]
+                    codes_und_qualifier, beschreibung
                 )
-                unfolded_ahb_lines.append(
-                    UnfoldedAhbLine(
-                        index=index,
-                        segment_name=current_section_name,
-                        segment_gruppe=row["Segment Gruppe"] or None,
-                        segment=row["Segment"] or None,
-                        datenelement=row["Datenelement"] or None,
-                        code=value_pool_entry,
-                        qualifier="",
-                        beschreibung=description,
-                        bedinung_ausdruck=row[pruefi] or None,
-                        bedingung=row["Beschreibung"],
+                unfolded_ahb_line_fields.append(
+                    (
+                        {
+                            "index": index,
+                            "segment_name": section_name,
+                            "segment_gruppe": segment_gruppe or None,
+                            "segment": segment or None,
+                            "datenelement": datenelement or None,
+                            "code": value_pool_entry,
+                            "qualifier": "",
+                            "beschreibung": description,
+                            "bedingung": beschreibung,
+                        },
+                        index,
                     )
                 )
                 continue
 
-            if UnfoldedAhb._is_dataelement(ahb_row=row):
+            if row_type in (FlatAhbRowType.DATAELEMENT, FlatAhbRowType.SEGMENTGROUP):
                 value_pool_entry, description = FlatAhbCsvReader.separate_value_pool_entry_and_name(
-                    row["Codes und Qualifier"], row["Beschreibung"]
+                    codes_und_qualifier, beschreibung
                 )
-
-                if _segment_group_pattern.match(row["Segment Gruppe"]):
-                    segment_group_key = row["Segment Gruppe"]
-                else:
-                    segment_group_key = None
-
-                unfolded_ahb_lines.append(
-                    UnfoldedAhbLine(
-                        index=index,
-                        segment_name=current_section_name,
-                        segment_gruppe=segment_group_key,
-                        segment=row["Segment"] or None,
-                        datenelement=row["Datenelement"] or None,
-                        code=value_pool_entry,
-                        qualifier="",
-                        beschreibung=description,
-                        bedinung_ausdruck=row[pruefi] or None,
-                        bedingung=row["Beschreibung"],
+                unfolded_ahb_line_fields.append(
+                    (
+                        {
+                            "index": index,
+                            "segment_name": section_name,
+                            "segment_gruppe": (
+                                segment_gruppe if _segment_group_pattern.match(segment_gruppe) else None
+                            ),
+                            "segment": segment or None,
+                            "datenelement": datenelement or None,
+                            "code": value_pool_entry,
+                            "qualifier": "",
+                            "beschreibung": description,
+                            "bedingung": beschreibung,
+                        },
+                        index,
                     )
                 )
                 continue
-            if any(unfolded_ahb_lines) and UnfoldedAhb._is_just_value_pool_entry(ahb_row=row):
-                unfolded_ahb_lines.append(
-                    UnfoldedAhbLine(
-                        index=index,
-                        segment_name=current_section_name,
-                        segment_gruppe=unfolded_ahb_lines[-1].segment_gruppe,
-                        segment=unfolded_ahb_lines[-1].segment,
-                        datenelement=unfolded_ahb_lines[-1].datenelement,
-                        code=row["Codes und Qualifier"],
-                        qualifier="",
-                        beschreibung=row["Beschreibung"],
-                        bedinung_ausdruck=row[pruefi] or None,
-                        bedingung=row["Bedingung"],
+
+            if row_type is FlatAhbRowType.VALUEPOOLENTRY and any(unfolded_ahb_line_fields):
+                previous_line_fields = unfolded_ahb_line_fields[-1][0]
+                unfolded_ahb_line_fields.append(
+                    (
+                        {
+                            "index": index,
+                            "segment_name": section_name,
+                            "segment_gruppe": previous_line_fields["segment_gruppe"],
+                            "segment": previous_line_fields["segment"],
+                            "datenelement": previous_line_fields["datenelement"],
+                            "code": codes_und_qualifier,
+                            "qualifier": "",
+                            "beschreibung": beschreibung,
+                            "bedingung": bedingung,
+                        },
+                        index,
                     )
                 )
 
-        return cls(
-            unfolded_ahb_lines=unfolded_ahb_lines,
-            meta_data=UnfoldedAhbTableMetaData(
-                pruefidentifikator=pruefi,
-            ),
-        )
+        return unfolded_ahb_line_fields
 
     @staticmethod
-    def _get_section_name(segment_gruppe_or_section_name: str, last_section_name: str) -> str:
+    def _get_row_types(table: StringTable) -> list[FlatAhbRowType]:
         """
-        This function reads the section name if there is one.
-        If the given string 'segment_gruppe_or_section_name' does not contain a section name,
-        the 'last_section_name' will be returned.
+        Returns the FlatAhbRowType of each row of the given AHB table.
+        If a row matches multiple row types, the first matching type (in the order of the checks below) is returned.
         """
-        if not (segment_gruppe_or_section_name.startswith("SG") or segment_gruppe_or_section_name == ""):
-            return segment_gruppe_or_section_name
-        return last_section_name
+        conditions_and_row_types: list[tuple[list[bool], FlatAhbRowType]] = [
+            (UnfoldedAhb._is_section_name(ahb_table=table), FlatAhbRowType.SECTIONNAME),
+            (UnfoldedAhb._is_segment_group(ahb_table=table), FlatAhbRowType.SEGMENTGROUP),
+            (UnfoldedAhb._is_segment_opening_line(ahb_table=table), FlatAhbRowType.SEGMENTOPENINGLINE),
+            (UnfoldedAhb._is_just_segment(ahb_table=table), FlatAhbRowType.SEGMENT),
+            (UnfoldedAhb._is_dataelement(ahb_table=table), FlatAhbRowType.DATAELEMENT),
+            (UnfoldedAhb._is_just_value_pool_entry(ahb_table=table), FlatAhbRowType.VALUEPOOLENTRY),
+        ]
+        row_types: list[FlatAhbRowType] = [FlatAhbRowType.OTHER] * len(table)
+        # the checks are applied in reversed order, so that the first matching check wins
+        for condition, row_type in reversed(conditions_and_row_types):
+            for index, row_matches_condition in enumerate(condition):
+                if row_matches_condition:
+                    row_types[index] = row_type
+        return row_types
+
+    @staticmethod
+    def _get_section_names(segment_gruppe: list[str]) -> list[str]:
+        """
+        This function returns the section name of each row.
+        If the "Segment Gruppe" of a row does not contain a section name, the section name of the previous rows
+        is used.
+        """
+        section_names: list[str] = []
+        section_name = ""
+        for value in segment_gruppe:
+            if not (value.startswith("SG") or value == ""):
+                section_name = value
+            section_names.append(section_name)
+        return section_names
 
     @staticmethod
-    def _is_section_name(ahb_row: pd.Series) -> bool:
+    def _is_section_name(ahb_table: StringTable) -> list[bool]:
         """
-        Checks if the current AHB row is a section name.
-        It uses the same logic as the function 'line_contains_only_segment_gruppe'
+        Checks which AHB rows are section names.
+        It uses the same logic as the function 'lines_contain_only_segment_gruppe'
         So to avoid duplicate code, this function just calls the other function.
         """
-        return AhbTable.line_contains_only_segment_gruppe(ahb_row)
+        return AhbTable.lines_contain_only_segment_gruppe(ahb_table)
 
     @staticmethod
-    def _is_segment_group(ahb_row: pd.Series) -> bool:
-        """Checks if the current AHB row is a segment group."""
+    def _is_segment_group(ahb_table: StringTable) -> list[bool]:
+        """Checks which AHB rows are segment groups."""
 
-        if _segment_group_pattern.match(ahb_row["Segment Gruppe"]) and not ahb_row["Segment"]:
-            return True
-        return False
+        return [
+            matches_segment_group_pattern and not segment
+            for matches_segment_group_pattern, segment in zip(
+                _matches_segment_group_pattern(ahb_table.column("Segment Gruppe")), ahb_table.column("Segment")
+            )
+        ]
 
     @staticmethod
-    def _is_segment_opening_line(ahb_row: pd.Series) -> bool:
-        """Checks if the current AHB row is a segment opening line.
+    def _is_segment_opening_line(ahb_table: StringTable) -> list[bool]:
+        """Checks which AHB rows are segment opening lines.
         Example:
 
         SG3    CTA                                         Muss    Muss    Muss
@@ -258,53 +384,57 @@ class UnfoldedAhb:
         The first line in the example is a segment opening line
         """
 
-        if (
-            _segment_group_pattern.match(ahb_row["Segment Gruppe"])
-            and not ahb_row["Segment"]
-            and ahb_row["Segment"]
-            and not ahb_row["Datenelement"]
-        ):
-            return True
-        return False
+        return [
+            matches_segment_group_pattern and not segment and bool(segment) and not datenelement
+            for matches_segment_group_pattern, segment, datenelement in zip(
+                _matches_segment_group_pattern(ahb_table.column("Segment Gruppe")),
+                ahb_table.column("Segment"),
+                ahb_table.column("Datenelement"),
+            )
+        ]
 
     @staticmethod
-    def _is_just_segment(ahb_row: pd.Series) -> bool:
+    def _is_just_segment(ahb_table: StringTable) -> list[bool]:
         """
-        Checks if the given AHB row is a segment
+        Checks which AHB rows are segments
         """
 
-        if (
-            _segment_group_pattern.match(ahb_row["Segment Gruppe"])
-            and ahb_row["Segment"]
-            and not ahb_row["Datenelement"]
-        ):
-            return True
-        return False
+        return [
+            matches_segment_group_pattern and bool(segment) and not datenelement
+            for matches_segment_group_pattern, segment, datenelement in zip(
+                _matches_segment_group_pattern(ahb_table.column("Segment Gruppe")),
+                ahb_table.column("Segment"),
+                ahb_table.column("Datenelement"),
+            )
+        ]
 
     @staticmethod
-    def _is_dataelement(ahb_row: pd.Series) -> bool:
+    def _is_dataelement(ahb_table: StringTable) -> list[bool]:
         """
-        Checks if the given AHB row is a dataelement
+        Checks which AHB rows are dataelements
         """
-        if ahb_row["Datenelement"]:
-            return True
-        return False
+        return [bool(datenelement) for datenelement in ahb_table.column("Datenelement")]
 
     @staticmethod
-    def _is_just_value_pool_entry(ahb_row: pd.Series) -> bool:
+    def _is_just_value_pool_entry(ahb_table: StringTable) -> list[bool]:
         """
-        Checks if the given AHB row contains only a value pool entry (w/o Segment (group) and data element)
+        Checks which AHB rows contain only a value pool entry (w/o Segment (group) and data element)
         """
-        return (
-            (not ahb_row["Segment Gruppe"])
-            and (not ahb_row["Segment"])
-            and (not ahb_row["Datenelement"])
-            and ahb_row["Codes und Qualifier"]
-        )
+        return [
+            not segment_gruppe and not segment and not datenelement and bool(codes_und_qualifier)
+            for segment_gruppe, segment, datenelement, codes_und_qualifier in zip(
+                ahb_table.column("Segment Gruppe"),
+                ahb_table.column("Segment"),
+                ahb_table.column("Datenelement"),
+                ahb_table.column("Codes und Qualifier"),
+            )
+        ]
 
-    def convert_to_flat_ahb(self) -> FlatAnwendungshandbuch:
+    def convert_to_flat_ahb(self, deterministic_guids: bool = False) -> FlatAnwendungshandbuch:
         """
         Converts the unfolded AHB to a flat AHB.
+        By default, each line gets a random guid. If deterministic_guids is True, the guid of each line is derived
+        from the Prüfidentifikator, the position and the content of the line instead.
         """
         meta = AhbMetaInformation(pruefidentifikator=self.meta_data.pruefidentifikator)
         lines: list[AhbLine] = []
@@ -323,6 +453,11 @@ class UnfoldedAhb:
                     index=unfolded_ahb_line.index,
                 )
             )
+        if deterministic_guids:
+            for position, line in enumerate(lines):
+                line.guid = _get_deterministic_guid(
+                    pruefi=self.meta_data.pruefidentifikator, position=position, line=line
+                )
         try:
             return FlatAnwendungshandbuch(meta=meta, lines=lines)
         except ValueError:
@@ -332,39 +467,45 @@ class UnfoldedAhb:
             )
             raise
 
-    def dump_flatahb_json(self, output_directory_path: Path) -> None:
+    def dump_flatahb_json(self, output_directory_path: Path, deterministic_guids: bool = False) -> Optional[Path]:
         """
         Converts the unfolded AHB to a flat AHB and writes it to a json file.
         The file will be stored in the directory:
             'output_directory_path/<edifact_format>/flatahb/<pruefidentifikator>.json'
+        If the file exists already, the guids of the unchanged lines are taken from the existing file.
+        With deterministic_guids the guids do not depend on previous runs, so the existing file is not read.
+        The file is only written if its content changed. Returns the path of the file.
         """
         edifact_format = get_format_of_pruefidentifikator(self.meta_data.pruefidentifikator)
         if edifact_format is None:
             logger.warning("'%s' is not a pruefidentifikator", self.meta_data.pruefidentifikator)
-            return
+            return None
 
         flatahb_output_directory_path = output_directory_path / str(edifact_format) / "flatahb"
         flatahb_output_directory_path.mkdir(parents=True, exist_ok=True)
-        flat_ahb = self.convert_to_flat_ahb()
+        flat_ahb = self.convert_to_flat_ahb(deterministic_guids=deterministic_guids)
 
         file_path = flatahb_output_directory_path / f"{self.meta_data.pruefidentifikator}.json"
-        if file_path.exists():
+        if not deterministic_guids and file_path.exists():
             with open(file_path, "r", encoding="utf-8") as file:
                 existing_flat_ahb = FlatAnwendungshandbuchSchema().load(json.load(file))
             _keep_guids_of_unchanged_lines_stable(flat_ahb, existing_flat_ahb)
         dump_data = FlatAnwendungshandbuchSchema().dump(flat_ahb)
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(dump_data, file, ensure_ascii=False, indent=2, sort_keys=True)
+        content = json.dumps(dump_data, ensure_ascii=False, indent=2, sort_keys=True)
+        write_file_if_changed(file_path, content.encode("utf-8"))
         logger.info(
             "The flatahb file for %s is saved at %s",
             self.meta_data.pruefidentifikator,
             flatahb_output_directory_path / f"{self.meta_data.pruefidentifikator}.json",
         )
+        return file_path
 
-    def convert_to_dataframe(self) -> pd.DataFrame:
+    def convert_to_dataframe(self) -> "pd.DataFrame":
         """
         Converts the unfolded AHB to a pandas dataframe.
         """
+        import pandas as pd  # pylint:disable=import-outside-toplevel
+
         unfolded_ahb_lines = [
             {
                 "Segmentname": unfolded_ahb_line.segment_name,
@@ -384,35 +525,39 @@ class UnfoldedAhb:
         df.fillna(value="", inplace=True)
         return df
 
-    def dump_csv(self, path_to_output_directory: Path) -> None:
+    def dump_csv(self, path_to_output_directory: Path) -> Optional[Path]:
         """
         Dump a UnfoldedAHB table into a csv file.
         The file will be stored in the directory:
             'path_to_output_directory/<edifact_format>/csv/<pruefidentifikator>.csv'
+        The file is only written if its content changed. Returns the path of the file.
         """
         df = self.convert_to_dataframe()
 
         edifact_format = get_format_of_pruefidentifikator(self.meta_data.pruefidentifikator)
         if edifact_format is None:
             logger.warning("'%s' is not a pruefidentifikator", self.meta_data.pruefidentifikator)
-            return
+            return None
 
         csv_output_directory_path = path_to_output_directory / str(edifact_format) / "csv"
         csv_output_directory_path.mkdir(parents=True, exist_ok=True)
 
-        df.to_csv(csv_output_directory_path / f"{self.meta_data.pruefidentifikator}.csv")
+        file_path = csv_output_directory_path / f"{self.meta_data.pruefidentifikator}.csv"
+        write_file_if_changed(file_path, df.to_csv().encode("utf-8"))
         logger.info(
             "The csv file for %s is saved at %s",
             self.meta_data.pruefidentifikator,
-            csv_output_directory_path / f"{self.meta_data.pruefidentifikator}.csv",
+            file_path,
         )
         del df
+        return file_path
 
-    def dump_xlsx(self, path_to_output_directory: Path) -> None:
+    def dump_xlsx(self, path_to_output_directory: Path) -> Optional[Path]:
         """
         Dump a AHB table of a given pruefi into an excel file.
         The file will be stored in the directory:
             'path_to_output_directory/<edifact_format>/xlsx/<pruefidentifikator>.xlsx'
+        The file is only written if its content changed. Returns the path of the file.
         """
         edifact_format = get_format_of_pruefidentifikator(self.meta_data.pruefidentifikator)
         xlsx_output_directory_path: Path = path_to_output_directory / str(edifact_format) / "xlsx"
@@ -422,24 +567,34 @@ class UnfoldedAhb:
 
         df = self.convert_to_dataframe()
 
+        import pandas as pd  # pylint:disable=import-outside-toplevel
+
+        # the workbook is created in memory first, so that an unchanged file does not get written again
+        xlsx_content = BytesIO()
+        # https://github.com/PyCQA/pylint/issues/3060
+        # pylint: disable=abstract-class-instantiated
+        with pd.ExcelWriter(xlsx_content, engine="xlsxwriter") as writer:
+            df.to_excel(writer, sheet_name=f"{self.meta_data.pruefidentifikator}")
+            # pylint: disable=no-member
+            workbook = writer.book
+            # a fixed creation date makes the content of the workbook reproducible
+            workbook.set_properties({"created": _xlsx_creation_date})
+            worksheet = writer.sheets[f"{self.meta_data.pruefidentifikator}"]
+            wrap_format = workbook.add_format({"text_wrap": True})
+            for column_letter, column_width in _column_letter_width_mapping.items():
+                excel_header = f"{column_letter}:{column_letter}"
+                worksheet.set_column(excel_header, column_width, wrap_format)
+        file_path = xlsx_output_directory_path / excel_file_name
         try:
-            # https://github.com/PyCQA/pylint/issues/3060
-            # pylint: disable=abstract-class-instantiated
-            with pd.ExcelWriter(xlsx_output_directory_path / excel_file_name, engine="xlsxwriter") as writer:
-                df.to_excel(writer, sheet_name=f"{self.meta_data.pruefidentifikator}")
-                # pylint: disable=no-member
-                workbook = writer.book
-                worksheet = writer.sheets[f"{self.meta_data.pruefidentifikator}"]
-                wrap_format = workbook.add_format({"text_wrap": True})
-                for column_letter, column_width in _column_letter_width_mapping.items():
-                    excel_header = f"{column_letter}:{column_letter}"
-                    worksheet.set_column(excel_header, column_width, wrap_format)
-                logger.info("💾 Saved file(s) for Pruefidentifikator %s", self.meta_data.pruefidentifikator)
+            write_file_if_changed(file_path, xlsx_content.getvalue())
+            logger.info("💾 Saved file(s) for Pruefidentifikator %s", self.meta_data.pruefidentifikator)
         except PermissionError:
             logger.error("The Excel file %s is open. Please close this file and try again.", excel_file_name)
+            return None
 
         logger.info(
             "The xlsx file for %s is saved at %s",
             self.meta_data.pruefidentifikator,
-            xlsx_output_directory_path / f"{self.meta_data.pruefidentifikator}.json",
+            file_path,
         )
+        return file_path
@@ -1,3 +1,4 @@
+import zipfile
 from itertools import groupby
 from pathlib import Path
 
@@ -66,3 +67,48 @@ class TestAhbFileFinder:
         ahb_file_finder.filter_for_latest_ahb_docx_files()
 
         assert len(ahb_file_finder.paths_to_docx_files) == 18
+
+    @pytest.mark.parametrize(
+        "pruefis, expected_pruefis",
+        [
+            pytest.param(["11042", "11039", "55001"], {"11042", "11039"}, id="some pruefis in text"),
+            pytest.param(["55001"], set(), id="no pruefi in text"),
+            pytest.param([], set(), id="no pruefis"),
+        ],
+    )
+    def test_get_pruefis_in_docx_file(self, pruefis: list[str], expected_pruefis: set[str]):
+        path_to_ahb_document: Path = (
+            Path.cwd()
+            / "unittests"
+            / "docx_files"
+            / "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+        )
+        assert AhbFileFinder.get_pruefis_in_docx_file(path_to_ahb_document, pruefis) == expected_pruefis
+
+    @pytest.mark.parametrize(
+        "chunk_size", [pytest.param(chunk_size, id=str(chunk_size)) for chunk_size in [3, 7, 1024]]
+    )
+    def test_get_pruefis_in_docx_file_with_pruefi_split_over_runs(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, chunk_size: int
+    ):
+        """
+        The digits of a pruefi may be split over several runs and the pruefi may span several chunks.
+        """
+        monkeypatch.setattr("kohlrahbi.ahbfilefinder._CHUNK_SIZE", chunk_size)
+        path_to_ahb_document = tmp_path / "UTILMDAHB-test.docx"
+        with zipfile.ZipFile(path_to_ahb_document, "w") as package:
+            package.writestr(
+                "_rels/.rels",
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                '<Relationship Id="rId1" Target="word/document.xml" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+                "</Relationships>",
+            )
+            package.writestr(
+                "word/document.xml",
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body><w:p>'
+                '<w:r><w:t>Prüfidentifikator</w:t><w:tab/><w:t>110</w:t></w:r><w:r><w:rPr><w:b val="11043"/></w:rPr>'
+                "<w:t>42</w:t></w:r></w:p></w:body></w:document>",
+            )
+
+        assert AhbFileFinder.get_pruefis_in_docx_file(path_to_ahb_document, ["11042", "11043"]) == {"11042"}
@@ -2,9 +2,10 @@ from pathlib import Path
 
 import docx  # type:ignore[import]
 from docx.table import Table  # type:ignore[import]
+from lxml import etree  # type:ignore[import]
 
 from kohlrahbi.ahb.ahbsubtable import AhbSubTable
-from kohlrahbi.read_functions import get_all_paragraphs_and_tables
+from kohlrahbi.read_functions import get_ahb_tables, get_all_paragraphs_and_tables
 
 
 class TestAhbSubTable:
@@ -30,3 +31,19 @@ class TestAhbSubTable:
             assert isinstance(ahb_sub_table, AhbSubTable)
         else:
             raise TypeError("You did not pass a docx table instance.")
+
+    def test_parsing_does_not_modify_the_document(self) -> None:
+        """
+        The parsers work on the features of the cells only, so a python-docx document can be reused for
+        further Prüfidentifikatoren (or shared between processes) as it was read.
+        """
+        ahb_file_path: Path = Path.cwd() / Path("unittests/docx_files/UTILMD-11042-test.docx")
+        doc = docx.Document(ahb_file_path)
+        body_before_parsing = etree.tostring(doc.element.body)
+
+        ahb_tables = get_ahb_tables(document=doc, pruefis=["11042"])
+
+        assert "11042" in ahb_tables
+        # the test table contains non-breaking spaces which are removed in the parsed table, but not in the document
+        assert "\xa0" in etree.tostring(doc.element.body, encoding="unicode")
+        assert etree.tostring(doc.element.body) == body_before_parsing
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest  # type:ignore[import]
+
+from kohlrahbi.ahb.ahbsubtablecache import AhbSubTableCache
+from kohlrahbi.enums import ExtractionEngine, RowType
+from kohlrahbi.read_functions import get_ahb_tables, open_ahb_document
+
+_docx_file_name = "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+
+
+class TestAhbSubTableCache:
+    def test_save_and_load(self, tmp_path: Path):
+        ahb_sub_table_cache = AhbSubTableCache(path=tmp_path / "ahb_sub_tables")
+        assert ahb_sub_table_cache.load("abc") is None
+
+        ahb_sub_table_cache.save("abc", rows=[["SG2", "NAD", ""]], last_two_row_types=[RowType.SEGMENT, RowType.EMPTY])
+
+        assert ahb_sub_table_cache.load("abc") == ([["SG2", "NAD", ""]], [RowType.SEGMENT, RowType.EMPTY])
+
+    def test_broken_entry_is_ignored(self, tmp_path: Path):
+        ahb_sub_table_cache = AhbSubTableCache(path=tmp_path)
+        (tmp_path / "ab").mkdir()
+        (tmp_path / "ab" / "abc.json").write_text("this is no json", encoding="utf-8")
+        assert ahb_sub_table_cache.load("abc") is None
+
+    @pytest.mark.parametrize(
+        "entry",
+        [
+            pytest.param('["SG2", "NAD", ""]', id="no object"),
+            pytest.param('{"rows": [["SG2", "NAD", ""]]}', id="missing row types"),
+            pytest.param('{"rows": [["SG2", "NAD", ""]], "last_two_row_types": ["FOO"]}', id="unknown row type"),
+            pytest.param('{"rows": [["SG2", 12]], "last_two_row_types": []}', id="broken row"),
+            pytest.param('{"rows": [["SG2", "NAD", ""]], "last_two_row_types": 12}', id="no list of row types"),
+        ],
+    )
+    def test_malformed_entry_is_ignored(self, tmp_path: Path, entry: str):
+        ahb_sub_table_cache = AhbSubTableCache(path=tmp_path)
+        (tmp_path / "ab").mkdir()
+        (tmp_path / "ab" / "abc.json").write_text(entry, encoding="utf-8")
+        assert ahb_sub_table_cache.load("abc") is None
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_cached_ahb_tables_equal_parsed_ahb_tables(self, datafiles):
+        """
+        The sub tables are cached independently of the engine, so the second run only reads from the cache.
+        """
+        docx_file_path = Path(datafiles) / _docx_file_name
+        pruefis = ["11042", "11043", "11051"]
+        ahb_sub_table_cache = AhbSubTableCache(path=Path(datafiles) / "ahb_sub_tables")
+
+        parsed_ahb_tables = get_ahb_tables(
+            document=open_ahb_document(path=docx_file_path, engine=ExtractionEngine.PYTHON_DOCX), pruefis=pruefis
+        )
+        first_run_ahb_tables = get_ahb_tables(
+            document=open_ahb_document(path=docx_file_path, engine=ExtractionEngine.PYTHON_DOCX),
+            pruefis=pruefis,
+            ahb_sub_table_cache=ahb_sub_table_cache,
+        )
+        cache_entries = set(ahb_sub_table_cache.path.glob("*/*.json"))
+        second_run_ahb_tables = get_ahb_tables(
+            document=open_ahb_document(path=docx_file_path, engine=ExtractionEngine.LXML),
+            pruefis=pruefis,
+            ahb_sub_table_cache=ahb_sub_table_cache,
+        )
+
+        assert any(cache_entries)
+        assert set(ahb_sub_table_cache.path.glob("*/*.json")) == cache_entries
+        assert set(first_run_ahb_tables.keys()) == set(second_run_ahb_tables.keys()) == set(pruefis)
+        for pruefi, parsed_ahb_table in parsed_ahb_tables.items():
+            assert first_run_ahb_tables[pruefi].table == parsed_ahb_table.table
+            assert second_run_ahb_tables[pruefi].table == parsed_ahb_table.table
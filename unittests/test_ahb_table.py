@@ -3,7 +3,10 @@ from pathlib import Path
 import pandas as pd
 import pytest  # type:ignore[import]
 
+from kohlrahbi.ahb.ahbsubtable import AhbSubTable
 from kohlrahbi.ahb.ahbtable import AhbTable
+from kohlrahbi.ahb.stringtable import StringTable
+from kohlrahbi.seed import Seed
 from kohlrahbi.unfoldedahb import UnfoldedAhb
 
 
@@ -16,7 +19,21 @@ class TestAhbTable:
         """
         Test appending of an AHB subtable
         """
-        pass
+        ahb_table = AhbTable(
+            table=StringTable.from_dataframe(pd.DataFrame({"Segment": ["UNH"], "Datenelement": ["0062"]}))
+        )
+        for segment in ["BGM", "DTM"]:
+            ahb_table.append_ahb_sub_table(
+                ahb_sub_table=AhbSubTable(
+                    table_meta_data=Seed(),
+                    table=StringTable.from_dataframe(pd.DataFrame({"Segment": [segment], "Datenelement": [""]})),
+                )
+            )
+
+        expected_ahb_table_dataframe = pd.DataFrame(
+            {"Segment": ["UNH", "BGM", "DTM"], "Datenelement": ["0062", "", ""]}
+        )
+        assert ahb_table.table.to_dataframe().equals(expected_ahb_table_dataframe)
 
     @pytest.mark.parametrize(
         "ahb_table_dataframe, expected_ahb_table_dataframe",
@@ -50,7 +67,33 @@ class TestAhbTable:
                         "Bedingung": ["", "", ""],
                     }
                 ),
-            )
+            ),
+            pytest.param(
+                pd.DataFrame(
+                    {
+                        "Segment Gruppe": ["SG8", "Referenz auf die ID einer", "Messlokation", "SG9", "Tranche "],
+                        "Segment": ["SEQ", "", "", "", ""],
+                        "Datenelement": ["1229", "", "", "", ""],
+                        "Codes und Qualifier": ["Z50", "", "", "", ""],
+                        "Beschreibung": ["Messdatenregistriergerätedaten", "", "", "", ""],
+                        "11042": ["", "", "", "", ""],
+                        "Bedingung": ["", "", "", "", ""],
+                    }
+                ),
+                pd.DataFrame(
+                    {
+                        # the last line has no successor to be merged with, so it is only stripped
+                        "Segment Gruppe": ["SG8", "Referenz auf die ID einer Messlokation", "SG9 Tranche"],
+                        "Segment": ["SEQ", "", ""],
+                        "Datenelement": ["1229", "", ""],
+                        "Codes und Qualifier": ["Z50", "", ""],
+                        "Beschreibung": ["Messdatenregistriergerätedaten", "", ""],
+                        "11042": ["", "", ""],
+                        "Bedingung": ["", "", ""],
+                    }
+                ),
+                id="merge with the last line",
+            ),
         ],
     )
     def test_sanitize_ahb_table_dataframe(self, ahb_table_dataframe, expected_ahb_table_dataframe):
@@ -58,12 +101,12 @@ class TestAhbTable:
         test the sanitize method of the AhbTable class
         """
 
-        ahb_table = AhbTable(table=ahb_table_dataframe)
+        ahb_table = AhbTable(table=StringTable.from_dataframe(ahb_table_dataframe))
 
         ahb_table.sanitize()
 
         assert len(ahb_table.table) == len(expected_ahb_table_dataframe)
-        assert ahb_table.table.equals(expected_ahb_table_dataframe)
+        assert ahb_table.table.to_dataframe().equals(expected_ahb_table_dataframe)
 
     def test_sanitize_ahb_table_dataframe_44001(self):
         """
@@ -72,12 +115,12 @@ class TestAhbTable:
         df_file = Path(__file__).parent / "dataframes" / "44001_before_sanitizing.json"
         assert df_file.exists()
         df_table = pd.read_json(df_file)
-        ahb_table = AhbTable(table=df_table)
-        assert "E02" in ahb_table.table["Codes und Qualifier"].values
-        assert "ZD2" in ahb_table.table["Codes und Qualifier"].values
+        ahb_table = AhbTable(table=StringTable.from_dataframe(df_table))
+        assert "E02" in ahb_table.table.column("Codes und Qualifier")
+        assert "ZD2" in ahb_table.table.column("Codes und Qualifier")
         ahb_table.sanitize()
-        assert "E02" in ahb_table.table["Codes und Qualifier"].values
-        assert "ZD2" in ahb_table.table["Codes und Qualifier"].values
+        assert "E02" in ahb_table.table.column("Codes und Qualifier")
+        assert "ZD2" in ahb_table.table.column("Codes und Qualifier")
         unfolded_ahb = UnfoldedAhb.from_ahb_table(ahb_table=ahb_table, pruefi="44001")
         assert unfolded_ahb is not None
         for expected_transaktionsgrund, expected_beschreibung in [
@@ -614,8 +657,8 @@ class TestAhbTable:
             }
         )
 
-        actual_ahb_table = AhbTable(table=example_dataframe)
-        expected_ahb_table = AhbTable(table=expected_dataframe)
+        actual_ahb_table = AhbTable(table=StringTable.from_dataframe(example_dataframe))
+        expected_ahb_table = AhbTable(table=StringTable.from_dataframe(expected_dataframe))
 
         actual_ahb_table.fill_segment_gruppe_segment_dataelement()
 
@@ -626,4 +669,4 @@ class TestAhbTable:
         # true if the field of the two dataframes at the same position are equal
         # and false if not.
 
-        assert actual_ahb_table.table.equals(expected_ahb_table.table)
+        assert actual_ahb_table.table == expected_ahb_table.table
@@ -0,0 +1,166 @@
+from pathlib import Path
+
+import pytest  # type:ignore[import]
+
+from kohlrahbi.buildcache import BuildCache
+
+
+class TestBuildCache:
+    @pytest.fixture
+    def output_file_path(self, tmp_path: Path) -> Path:
+        output_file_path = tmp_path / "output" / "UTILMD" / "csv" / "11042.csv"
+        output_file_path.parent.mkdir(parents=True)
+        output_file_path.write_text("foo", encoding="utf-8")
+        return output_file_path
+
+    def test_save_and_load(self, tmp_path: Path, output_file_path: Path):
+        output_path = tmp_path / "output"
+        build_cache = BuildCache.from_file(tmp_path / "cache" / "build_cache.json")
+        build_cache.add_build(
+            pruefi="11042",
+            source_fingerprints=["abc"],
+            output_path=output_path,
+            output_file_paths={"csv": output_file_path},
+            deterministic_guids=False,
+        )
+        build_cache.save()
+
+        loaded_build_cache = BuildCache.from_file(tmp_path / "cache" / "build_cache.json")
+
+        assert loaded_build_cache.get_up_to_date_output_file_paths(
+            pruefi="11042",
+            source_fingerprints=["abc"],
+            output_path=output_path,
+            file_types=["csv"],
+            deterministic_guids=False,
+        ) == [output_file_path]
+
+    @pytest.mark.parametrize(
+        "pruefi, source_fingerprints, file_types, deterministic_guids, kohlrahbi_version, output_file_content",
+        [
+            pytest.param("11043", ["abc"], ["csv"], False, "1.0.0", "foo", id="unknown pruefi"),
+            pytest.param("11042", ["def"], ["csv"], False, "1.0.0", "foo", id="changed docx file"),
+            pytest.param("11042", ["def", "abc"], ["csv"], False, "1.0.0", "foo", id="new candidate docx file"),
+            pytest.param("11042", ["abc"], ["csv", "xlsx"], False, "1.0.0", "foo", id="new file type"),
+            pytest.param("11042", ["abc"], ["csv"], True, "1.0.0", "foo", id="deterministic guids"),
+            pytest.param("11042", ["abc"], ["csv"], False, "1.0.1", "foo", id="new kohlrahbi version"),
+            pytest.param("11042", ["abc"], ["csv"], False, "1.0.0", "bar", id="changed output file"),
+        ],
+    )
+    def test_pruefi_is_not_up_to_date(
+        self,
+        tmp_path: Path,
+        output_file_path: Path,
+        pruefi: str,
+        source_fingerprints: list[str],
+        file_types: list[str],
+        deterministic_guids: bool,
+        kohlrahbi_version: str,
+        output_file_content: str,
+    ):
+        output_path = tmp_path / "output"
+        build_cache = BuildCache(path=tmp_path / "build_cache.json", kohlrahbi_version="1.0.0")
+        build_cache.add_build(
+            pruefi="11042",
+            source_fingerprints=["abc"],
+            output_path=output_path,
+            output_file_paths={"csv": output_file_path},
+            deterministic_guids=False,
+        )
+        build_cache.kohlrahbi_version = kohlrahbi_version
+        output_file_path.write_text(output_file_content, encoding="utf-8")
+
+        assert (
+            build_cache.get_up_to_date_output_file_paths(
+                pruefi=pruefi,
+                source_fingerprints=source_fingerprints,
+                output_path=output_path,
+                file_types=file_types,
+                deterministic_guids=deterministic_guids,
+            )
+            == []
+        )
+
+    def test_output_files_of_other_file_types_are_kept(self, tmp_path: Path, output_file_path: Path):
+        output_path = tmp_path / "output"
+        xlsx_file_path = output_path / "UTILMD" / "xlsx" / "11042.xlsx"
+        xlsx_file_path.parent.mkdir(parents=True)
+        xlsx_file_path.write_bytes(b"bar")
+        build_cache = BuildCache(path=tmp_path / "build_cache.json")
+        for file_type, file_path in [("csv", output_file_path), ("xlsx", xlsx_file_path)]:
+            build_cache.add_build(
+                pruefi="11042",
+                source_fingerprints=["abc"],
+                output_path=output_path,
+                output_file_paths={file_type: file_path},
+                deterministic_guids=False,
+            )
+
+        assert build_cache.get_up_to_date_output_file_paths(
+            pruefi="11042",
+            source_fingerprints=["abc"],
+            output_path=output_path,
+            file_types=["csv", "xlsx"],
+            deterministic_guids=False,
+        ) == [output_file_path, xlsx_file_path]
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param("this is no json", id="no json"),
+            pytest.param("[]", id="no json object"),
+        ],
+    )
+    def test_broken_build_cache_file_results_in_empty_cache(self, tmp_path: Path, content: str):
+        build_cache_path = tmp_path / "build_cache.json"
+        build_cache_path.write_text(content, encoding="utf-8")
+        assert BuildCache.from_file(build_cache_path).entries == {}
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param('{"11042": {"output_files": {}}}', id="missing inputs"),
+            pytest.param('{"11042": "foo"}', id="no json object"),
+            pytest.param(
+                '{"11042": {"source_fingerprints": ["abc"], "kohlrahbi_version": "1.0.0", "deterministic_guids": false}}',
+                id="missing output files",
+            ),
+            pytest.param(
+                '{"11042": {"source_fingerprints": ["abc"], "kohlrahbi_version": "1.0.0", "deterministic_guids": false,'
+                ' "output_files": {"csv": {"fingerprint": "abc"}}}}',
+                id="missing output file path",
+            ),
+        ],
+    )
+    def test_unexpected_entries_are_not_up_to_date(self, tmp_path: Path, output_file_path: Path, content: str):
+        output_path = tmp_path / "output"
+        build_cache_path = tmp_path / "build_cache.json"
+        build_cache_path.write_text(content, encoding="utf-8")
+        build_cache = BuildCache.from_file(build_cache_path)
+        build_cache.kohlrahbi_version = "1.0.0"
+
+        assert (
+            build_cache.get_up_to_date_output_file_paths(
+                pruefi="11042",
+                source_fingerprints=["abc"],
+                output_path=output_path,
+                file_types=["csv"],
+                deterministic_guids=False,
+            )
+            == []
+        )
+        # the entry is replaced by the next build
+        build_cache.add_build(
+            pruefi="11042",
+            source_fingerprints=["abc"],
+            output_path=output_path,
+            output_file_paths={"csv": output_file_path},
+            deterministic_guids=False,
+        )
+        build_cache.save()
+
+        assert list(tmp_path.glob("*.tmp")) == []
+        assert (
+            BuildCache.from_file(build_cache_path).entries["11042"]["output_files"]["csv"]["path"]
+            == "UTILMD/csv/11042.csv"
+        )
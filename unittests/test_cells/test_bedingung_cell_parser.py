@@ -2,6 +2,7 @@ import pandas as pd
 import pytest  # type:ignore[import]
 from docx.shared import Twips  # type:ignore[import]
 
+from kohlrahbi.ahb.ahbrowbuffer import AhbRowBuffer
 from kohlrahbi.docxtablecells import BedingungCell
 from unittests.cellparagraph import CellParagraph
 
@@ -58,6 +59,8 @@ class TestBedingungCell:
             }
         )
 
-        df = bc.parse(ahb_row_dataframe=empty_ahb_row)
+        ahb_row_buffer = AhbRowBuffer(column_headers=list(empty_ahb_row.columns))
+        ahb_row_buffer.add_empty_row()
+        bc.parse(ahb_row_buffer=ahb_row_buffer)
 
-        assert df.equals(expected_dataframe)
+        assert ahb_row_buffer.to_dataframe().equals(expected_dataframe)
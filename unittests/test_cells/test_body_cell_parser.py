@@ -2,7 +2,9 @@ import pandas as pd
 import pytest  # type:ignore[import]
 from docx.shared import Length, Twips  # type:ignore[import]
 
+from kohlrahbi.ahb.ahbrowbuffer import AhbRowBuffer
 from kohlrahbi.docxtablecells import BodyCell
+from kohlrahbi.docxtablecells.bodycell import _get_column_indices_by_tabstop_position
 from unittests.cellparagraph import CellParagraph
 
 left_indent_length: Length = Twips(64)
@@ -160,9 +162,11 @@ class TestBodyCell:
             }
         )
 
-        df = bc.parse(ahb_row_dataframe=empty_ahb_row)
+        ahb_row_buffer = AhbRowBuffer(column_headers=list(empty_ahb_row.columns))
+        ahb_row_buffer.add_empty_row()
+        bc.parse(ahb_row_buffer=ahb_row_buffer)
 
-        assert df.equals(expected_dataframe)
+        assert ahb_row_buffer.to_dataframe().equals(expected_dataframe)
 
     @pytest.mark.parametrize(
         ["body_cell_paragraphs", "empty_ahb_row", "expected_dataframe"],
@@ -335,6 +339,21 @@ class TestBodyCell:
             indicator_tabstop_positions=indicator_tabstop_positions,
         )
 
-        df = bc.parse(ahb_row_dataframe=empty_ahb_row)
+        ahb_row_buffer = AhbRowBuffer(column_headers=list(empty_ahb_row.columns))
+        ahb_row_buffer.add_empty_row()
+        bc.parse(ahb_row_buffer=ahb_row_buffer)
 
-        assert df.equals(expected_dataframe)
+        assert ahb_row_buffer.to_dataframe().equals(expected_dataframe)
+
+    @pytest.mark.parametrize(
+        ["indicator_tabstop_positions", "expected"],
+        [
+            pytest.param((), {}, id="no tabstops"),
+            pytest.param((100, 200, 300), {100: (4,), 200: (5,), 300: (6,)}, id="distinct tabstops"),
+            pytest.param((100, 100, 300), {100: (4, 5), 300: (6,)}, id="repeated tabstop"),
+        ],
+    )
+    def test_get_column_indices_by_tabstop_position(
+        self, indicator_tabstop_positions: tuple[int, ...], expected: dict[int, tuple[int, ...]]
+    ):
+        assert _get_column_indices_by_tabstop_position(indicator_tabstop_positions) == expected
@@ -2,6 +2,7 @@ import docx  # type:ignore[import]
 import pytest  # type:ignore[import]
 from docx.shared import RGBColor  # type:ignore[import]
 
+from kohlrahbi.cellfeatures import CellFeatures, EdifactStrukturCellFeatures
 from kohlrahbi.row_type_checker import RowType, get_row_type
 
 
@@ -92,3 +93,16 @@ class TestCheckRowType:
 
         result = get_row_type(edifact_struktur_cell=test_cell, left_indent_position=self.segment_left_indent_position)
         assert result == expected
+
+        # the snapshot of the cell features results in the same row type
+        snapshot = EdifactStrukturCellFeatures.from_cell_features(CellFeatures.from_docx_cell(test_cell))
+        assert get_row_type(edifact_struktur_cell=snapshot, left_indent_position=self.segment_left_indent_position) == (
+            expected
+        )
+
+    def test_row_type_of_unknown_cell_raises(self):
+        cell = EdifactStrukturCellFeatures(
+            text="a\tb\tc\td", joined_text="a\tb\tc\td", tab_count=3, left_indent=None, first_run=None
+        )
+        with pytest.raises(NotImplementedError):
+            get_row_type(edifact_struktur_cell=cell, left_indent_position=self.segment_left_indent_position)
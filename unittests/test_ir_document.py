@@ -0,0 +1,90 @@
+import gzip
+from pathlib import Path
+
+import pytest  # type:ignore[import]
+
+from kohlrahbi.enums import ExtractionEngine
+from kohlrahbi.irdocument import IrDocument, IrTable
+from kohlrahbi.lxmldocument import LxmlDocument, LxmlTable
+from kohlrahbi.read_functions import get_ahb_tables, open_ahb_document
+
+_docx_file_name = "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+
+
+class TestIrDocument:
+    """
+    The intermediate representation has to provide the same features as the docx file.
+    """
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_cells_equal_lxml_cells(self, datafiles):
+        lxml_document = LxmlDocument.from_file(Path(datafiles) / _docx_file_name)
+        ir_document = IrDocument.from_lxml_document(lxml_document)
+
+        lxml_tables = {
+            body_child_index: item
+            for body_child_index, item in lxml_document.iter_paragraphs_and_tables()
+            if isinstance(item, LxmlTable)
+        }
+        ir_tables = {
+            body_child_index: item
+            for body_child_index, item in ir_document.iter_paragraphs_and_tables()
+            if isinstance(item, IrTable)
+        }
+        assert ir_tables.keys() == lxml_tables.keys()
+        for body_child_index, lxml_table in lxml_tables.items():
+            ir_table = ir_tables[body_child_index]
+            assert list(ir_table.iter_rows_of_visible_cells()) == list(lxml_table.iter_rows_of_visible_cells())
+            assert ir_table.column_count == lxml_table.column_count
+            assert ir_table.cell(row_idx=0, col_idx=ir_table.column_count - 1) == lxml_table.cell(
+                row_idx=0, col_idx=lxml_table.column_count - 1
+            )
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_ahb_tables_from_ir_file_equal_python_docx(self, datafiles):
+        docx_file_path = Path(datafiles) / _docx_file_name
+        ir_path = Path(datafiles) / "ir" / "utilmd.json.gz"
+        IrDocument.from_lxml_document(LxmlDocument.from_file(docx_file_path)).to_file(ir_path)
+        ir_document = IrDocument.from_file(ir_path)
+        assert ir_document is not None
+        pruefis = ["11042", "11043", "11051", "99999"]
+
+        python_docx_ahb_tables = get_ahb_tables(
+            document=open_ahb_document(path=docx_file_path, engine=ExtractionEngine.PYTHON_DOCX), pruefis=pruefis
+        )
+        table_locations: dict = {}
+        ir_ahb_tables = get_ahb_tables(document=ir_document, pruefis=pruefis, table_locations=table_locations)
+
+        assert set(ir_ahb_tables.keys()) == set(python_docx_ahb_tables.keys()) == {"11042", "11043", "11051"}
+        for pruefi, python_docx_ahb_table in python_docx_ahb_tables.items():
+            assert ir_ahb_tables[pruefi].table == python_docx_ahb_table.table
+        ir_ahb_table_from_range = get_ahb_tables(
+            document=ir_document, pruefis=["11051"], body_child_index_range=table_locations["11051"]
+        )["11051"]
+        assert ir_ahb_table_from_range.table == python_docx_ahb_tables["11051"].table
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param(b"this is no gzip", id="no gzip"),
+            pytest.param(gzip.compress(b"this is no json"), id="no json"),
+            pytest.param(gzip.compress(b'{"format_version": 0, "items": []}'), id="outdated format"),
+            pytest.param(gzip.compress(b"[1, 2]"), id="no object"),
+            pytest.param(gzip.compress(b'{"format_version": 1}'), id="missing items"),
+            pytest.param(gzip.compress(b'{"format_version": 1, "items": [[0, null]]}'), id="broken item"),
+            pytest.param(
+                gzip.compress(b'{"format_version": 1, "items": [[0, null, {"rows": []}]]}'), id="broken table"
+            ),
+            pytest.param(
+                gzip.compress(
+                    b'{"format_version": 1, "items": [[0, null, {"fingerprint": "abc", "column_count": 1, '
+                    b'"rows": [[[[["text", null, [], [null, "XYZ"]]], 1, false]]]}]]}'
+                ),
+                id="broken font color",
+            ),
+        ],
+    )
+    def test_unreadable_ir_file(self, tmp_path: Path, content: bytes):
+        ir_path = tmp_path / "ir.json.gz"
+        ir_path.write_bytes(content)
+        assert IrDocument.from_file(ir_path) is None
@@ -1,13 +1,48 @@
+import json
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
+from unittest.mock import Mock
 
 import pytest  # type:ignore[import]
 from click.testing import CliRunner, Result
 
-from kohlrahbi import main
+import kohlrahbi
+from kohlrahbi import extract_ir, main
+from kohlrahbi.ahb.ahbsubtable import AhbSubTable
 
 runner: CliRunner = CliRunner()
 
+_wim_docx_file_name = "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+
+
+@pytest.fixture
+def run_kohlrahbi(datafiles) -> Callable[[str, list[str]], Path]:
+    """
+    Returns a function which runs kohlrahbi with the given arguments on the docx files of the test and checks that it
+    succeeds. The output is written into a directory with the given name in the temporary directory of the test;
+    the function returns the path of this output directory.
+    """
+
+    def _run_kohlrahbi(output_folder_name: str, arguments: list[str]) -> Path:
+        output_path: Path = Path(datafiles) / output_folder_name
+        response: Result = runner.invoke(
+            main, arguments + ["-y", "--input_path", str(Path(datafiles)), "--output_path", str(output_path)]
+        )
+        assert response.exit_code == 0
+        return output_path
+
+    return _run_kohlrahbi
+
+
+@pytest.fixture
+def cache_path(datafiles) -> Path:
+    """
+    The cache directory in the temporary directory of the test
+    """
+    return Path(datafiles) / "cache"
+
 
 class TestCli:
     @pytest.mark.parametrize(
@@ -88,6 +123,21 @@ class TestCli:
                 {"exit_code": 0, "output_snippet": ""},
                 id="test assume yes",
             ),
+            pytest.param(
+                [
+                    "-p",
+                    "11042",
+                    "--file-type",
+                    "csv",
+                    "-y",
+                    "--engine",
+                    "lxml",
+                ],
+                "",  # if the folder name is empty, the path will point on the temporary directory which is created by datafiles -> valid path
+                "",  # if the folder name is empty, the path will point on the temporary directory which is created by datafiles -> valid path
+                {"exit_code": 0, "output_snippet": ""},
+                id="test lxml engine",
+            ),
         ],
     )
     def test_kohlrahbi_cli_with_valid_arguments(
@@ -111,3 +161,163 @@ class TestCli:
         path_to_new_fancy_folder = Path("./output/new_and_fancy")
         if path_to_new_fancy_folder.exists() and path_to_new_fancy_folder.is_dir():
             shutil.rmtree(path_to_new_fancy_folder)
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_wim_docx_file_name}")
+    def test_kohlrahbi_cli_reuses_the_pruefi_index(self, run_kohlrahbi, cache_path: Path):
+        """
+        The second run uses the pruefi index which was created in the first run and must create the same files.
+        """
+        output_contents: list[str] = []
+        for run in ["first_run", "second_run"]:
+            output_path = run_kohlrahbi(run, ["-p", "11042", "--file-type", "csv", "--cache-path", str(cache_path)])
+            assert (cache_path / "pruefi_index.json").exists()
+            output_contents.append((output_path / "UTILMD" / "csv" / "11042.csv").read_text(encoding="utf-8"))
+        assert output_contents[0] == output_contents[1]
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_wim_docx_file_name}")
+    def test_kohlrahbi_cli_does_not_index_pruefis_which_failed(self, run_kohlrahbi, cache_path: Path, monkeypatch):
+        """
+        A pruefi whose table could not be parsed must not be stored as 'not in this file' in the pruefi index,
+        so that the next run extracts it again.
+        """
+        for run in ["failing_run", "second_run"]:
+            with monkeypatch.context() as patch:
+                if run == "failing_run":
+                    patch.setattr(
+                        AhbSubTable,
+                        "from_table_with_header",
+                        Mock(side_effect=NotImplementedError("Could not define row type of cell")),
+                    )
+                output_path = run_kohlrahbi(run, ["-p", "11042", "--file-type", "csv", "--cache-path", str(cache_path)])
+            pruefi_index = json.loads((cache_path / "pruefi_index.json").read_text(encoding="utf-8"))
+            if run == "failing_run":
+                assert not any("11042" in entry["pruefis"] for entry in pruefi_index.values())
+                assert not (output_path / "UTILMD" / "csv" / "11042.csv").exists()
+        assert (output_path / "UTILMD" / "csv" / "11042.csv").exists()
+
+    @pytest.mark.datafiles(
+        "./unittests/docx_files/UTILMDAHBEinspeiser-informatorischeLesefassung2.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx",
+        f"./unittests/docx_files/{_wim_docx_file_name}",
+    )
+    def test_kohlrahbi_cli_with_multiple_jobs(self, run_kohlrahbi, monkeypatch):
+        """
+        The parallel extraction must create the same files as the sequential one.
+        Like the sequential one, it searches a pruefi only in the files up to the one which contains its table.
+        The 11043 is mentioned in the Einspeiser AHB, but its table is in the WiM AHB.
+        """
+        output_contents: dict[str, dict[str, str]] = {}
+        searched_files_by_pruefi: dict[str, dict[str, set[str]]] = {}
+        extract_ahb_tables_from_file = kohlrahbi.extract_ahb_tables_from_file
+
+        def extract_ahb_tables_from_file_and_record_pruefis(*args, **kwargs):
+            for pruefi in kwargs["pruefis"]:
+                searched_files_by_pruefi[jobs].setdefault(pruefi, set()).add(kwargs["ahb_file_path"].name)
+            return extract_ahb_tables_from_file(*args, **kwargs)
+
+        monkeypatch.setattr(kohlrahbi, "extract_ahb_tables_from_file", extract_ahb_tables_from_file_and_record_pruefis)
+        # threads instead of processes, so that the extractions can be recorded
+        monkeypatch.setattr(kohlrahbi, "ProcessPoolExecutor", ThreadPoolExecutor)
+        for jobs in ["1", "2"]:
+            searched_files_by_pruefi[jobs] = {}
+            output_path = run_kohlrahbi(
+                f"jobs_{jobs}", ["-p", "11042", "-p", "11043", "--file-type", "csv", "--jobs", jobs]
+            )
+            output_contents[jobs] = {
+                csv_path.name: csv_path.read_text(encoding="utf-8") for csv_path in output_path.rglob("*.csv")
+            }
+        assert len(searched_files_by_pruefi["1"]["11042"]) == 1
+        assert len(searched_files_by_pruefi["1"]["11043"]) == 2
+        assert searched_files_by_pruefi["1"] == searched_files_by_pruefi["2"]
+        assert set(output_contents["1"].keys()) == {"11042.csv", "11043.csv"}
+        assert output_contents["1"] == output_contents["2"]
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_wim_docx_file_name}")
+    def test_kohlrahbi_cli_with_deterministic_guids(self, run_kohlrahbi):
+        """
+        Independent runs with deterministic guids must create the same flatahb files.
+        """
+        output_contents: list[str] = []
+        for run in ["first_run", "second_run"]:
+            output_path = run_kohlrahbi(run, ["-p", "11042", "--file-type", "flatahb", "--deterministic-guids"])
+            output_contents.append((output_path / "UTILMD" / "flatahb" / "11042.json").read_text(encoding="utf-8"))
+        assert output_contents[0] == output_contents[1]
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_wim_docx_file_name}")
+    def test_kohlrahbi_cli_does_not_touch_unchanged_files(self, run_kohlrahbi):
+        """
+        A second run with the same input must not write any of the output files again.
+        """
+        modification_times: list[list[int]] = []
+        for _ in range(2):
+            output_path = run_kohlrahbi(
+                "output", ["-p", "11042", "--file-type", "csv", "--file-type", "xlsx", "--file-type", "flatahb"]
+            )
+            output_file_paths = [
+                output_path / "UTILMD" / "csv" / "11042.csv",
+                output_path / "UTILMD" / "xlsx" / "11042.xlsx",
+                output_path / "UTILMD" / "flatahb" / "11042.json",
+            ]
+            modification_times.append([file_path.stat().st_mtime_ns for file_path in output_file_paths])
+        assert modification_times[0] == modification_times[1]
+
+        manifest = json.loads((output_path / "manifest.json").read_text(encoding="utf-8"))
+        assert set(manifest["files"].keys()) == {
+            "UTILMD/csv/11042.csv",
+            "UTILMD/xlsx/11042.xlsx",
+            "UTILMD/flatahb/11042.json",
+        }
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_wim_docx_file_name}")
+    def test_kohlrahbi_cli_with_build_cache(self, run_kohlrahbi, cache_path: Path, monkeypatch):
+        """
+        The build cache records the output files of each pruefi, so that a second run does not extract it again.
+        If the inputs change (here: the --deterministic-guids flag), the pruefi is extracted again.
+        """
+        extracted_pruefis: list[list[str]] = []
+        extract_ahb_tables_from_file = kohlrahbi.extract_ahb_tables_from_file
+
+        def extract_ahb_tables_from_file_and_record_pruefis(*args, **kwargs):
+            extracted_pruefis.append(kwargs["pruefis"])
+            return extract_ahb_tables_from_file(*args, **kwargs)
+
+        monkeypatch.setattr(kohlrahbi, "extract_ahb_tables_from_file", extract_ahb_tables_from_file_and_record_pruefis)
+        # the second run finds the pruefi in the build cache, the third one has to extract it again
+        for additional_arguments, expected_number_of_extractions in [([], 1), ([], 1), (["--deterministic-guids"], 2)]:
+            output_path = run_kohlrahbi(
+                "output",
+                ["-p", "11042", "--file-type", "csv", "--cache-path", str(cache_path)] + additional_arguments,
+            )
+            assert (output_path / "UTILMD" / "csv" / "11042.csv").exists()
+            manifest = json.loads((output_path / "manifest.json").read_text(encoding="utf-8"))
+            assert set(manifest["files"].keys()) == {"UTILMD/csv/11042.csv"}
+            assert extracted_pruefis == [["11042"]] * expected_number_of_extractions
+
+        build_cache = json.loads((cache_path / "build_cache.json").read_text(encoding="utf-8"))
+        assert set(build_cache.keys()) == {"11042"}
+        assert build_cache["11042"]["output_files"]["csv"]["path"] == "UTILMD/csv/11042.csv"
+        assert build_cache["11042"]["deterministic_guids"] is True
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_wim_docx_file_name}")
+    def test_kohlrahbi_cli_with_intermediate_representation(
+        self, datafiles, run_kohlrahbi, cache_path: Path, monkeypatch
+    ):
+        """
+        kohlrahbi reads the intermediate representation from the cache instead of the docx file.
+        """
+        response: Result = runner.invoke(
+            extract_ir, ["--input_path", str(Path(datafiles)), "--cache-path", str(cache_path)]
+        )
+        assert response.exit_code == 0
+        assert len(list((cache_path / "ir").glob("*.json.gz"))) == 1
+
+        # the calls are recorded, even if kohlrahbi catches the errors of the extraction
+        open_ahb_document = Mock(wraps=kohlrahbi.open_ahb_document)
+        monkeypatch.setattr(kohlrahbi, "open_ahb_document", open_ahb_document)
+        docx_output_path = run_kohlrahbi("docx", ["-p", "11042", "--file-type", "csv"])
+        assert open_ahb_document.call_count == 1
+        ir_output_path = run_kohlrahbi("ir", ["-p", "11042", "--file-type", "csv", "--cache-path", str(cache_path)])
+        assert open_ahb_document.call_count == 1, "The docx file must not be opened if its IR exists"
+
+        assert (ir_output_path / "UTILMD" / "csv" / "11042.csv").read_text(encoding="utf-8") == (
+            docx_output_path / "UTILMD" / "csv" / "11042.csv"
+        ).read_text(encoding="utf-8")
@@ -0,0 +1,123 @@
+from pathlib import Path
+
+import docx  # type:ignore[import]
+import pytest  # type:ignore[import]
+
+from kohlrahbi.ahb.ahbsubtable import AhbSubTable
+from kohlrahbi.cellfeatures import CellFeatures
+from kohlrahbi.enums import ExtractionEngine
+from kohlrahbi.lxmldocument import (
+    LxmlDocument,
+    LxmlParagraph,
+    LxmlTable,
+    StreamingLxmlDocument,
+    filter_body_child_index_range,
+)
+from kohlrahbi.read_functions import get_ahb_tables, get_all_paragraphs_and_tables, open_ahb_document
+
+_docx_file_name = "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+
+
+class TestLxmlDocument:
+    """
+    The lxml engine has to extract the same features as python-docx.
+    """
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_body_items_and_cell_features_equal_python_docx(self, datafiles):
+        docx_file_path = Path(datafiles) / _docx_file_name
+        python_docx_document = docx.Document(docx_file_path)
+        lxml_document = LxmlDocument.from_file(docx_file_path)
+
+        python_docx_body_items = list(get_all_paragraphs_and_tables(parent=python_docx_document))
+        lxml_body_items = [item for _, item in lxml_document.iter_paragraphs_and_tables()]
+
+        assert len(lxml_body_items) == len(python_docx_body_items)
+        for python_docx_item, lxml_item in zip(python_docx_body_items, lxml_body_items):
+            if isinstance(lxml_item, LxmlParagraph):
+                assert lxml_item.text == python_docx_item.text
+                assert lxml_item.style_name == python_docx_item.style.name
+                continue
+            assert isinstance(lxml_item, LxmlTable)
+            assert list(lxml_item.iter_rows_of_visible_cells()) == [
+                [CellFeatures.from_docx_cell(cell) for cell in AhbSubTable._iter_visible_cells(row=row)]
+                for row in python_docx_item.rows
+            ]
+            # the grid cells are used to read the header of the tables
+            for row_index in range(min(len(python_docx_item.rows), 5)):
+                assert lxml_item.row_cells(row_index) == [
+                    CellFeatures.from_docx_cell(cell) for cell in python_docx_item.row_cells(row_index)
+                ]
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_streaming_yields_the_same_items_and_frees_consumed_ones(self, datafiles):
+        docx_file_path = Path(datafiles) / _docx_file_name
+        lxml_items = list(LxmlDocument.from_file(docx_file_path).iter_paragraphs_and_tables())
+
+        number_of_streamed_items = 0
+        for (body_child_index, streamed_item), (expected_body_child_index, lxml_item) in zip(
+            StreamingLxmlDocument.from_file(docx_file_path).iter_paragraphs_and_tables(), lxml_items
+        ):
+            assert body_child_index == expected_body_child_index
+            assert type(streamed_item) is type(lxml_item)
+            if isinstance(streamed_item, LxmlParagraph):
+                assert streamed_item.text == lxml_item.text
+                assert streamed_item.style_name == lxml_item.style_name
+            else:
+                assert list(streamed_item.iter_rows_of_visible_cells()) == list(lxml_item.iter_rows_of_visible_cells())
+            # the body children which have been consumed are removed from the tree
+            assert streamed_item.element.getprevious() is None
+            number_of_streamed_items += 1
+        assert number_of_streamed_items == len(lxml_items)
+
+    @pytest.mark.parametrize(
+        "body_child_index_range, expected_indices",
+        [
+            pytest.param(None, [0, 1, 2, 4, 5], id="no range"),
+            pytest.param((1, 2), [1, 2], id="range"),
+            pytest.param((3, 3), [], id="empty range"),
+        ],
+    )
+    def test_filter_body_child_index_range(self, body_child_index_range, expected_indices: list[int]):
+        body_children = iter([(index, str(index)) for index in [0, 1, 2, 4, 5]])
+        filtered_body_children = list(filter_body_child_index_range(body_children, body_child_index_range))
+        assert filtered_body_children == [(index, str(index)) for index in expected_indices]
+        if body_child_index_range is not None:
+            # the iteration stops right behind the range
+            assert next(body_children, None) == (5, "5")
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_streaming_with_body_child_index_range(self, datafiles):
+        docx_file_path = Path(datafiles) / _docx_file_name
+        expected_body_child_indices = [
+            body_child_index
+            for body_child_index, _ in LxmlDocument.from_file(docx_file_path).iter_paragraphs_and_tables(
+                body_child_index_range=(100, 200)
+            )
+        ]
+        assert [
+            body_child_index
+            for body_child_index, _ in StreamingLxmlDocument.from_file(docx_file_path).iter_paragraphs_and_tables(
+                body_child_index_range=(100, 200)
+            )
+        ] == expected_body_child_indices
+        assert expected_body_child_indices[0] >= 100 and expected_body_child_indices[-1] <= 200
+
+    @pytest.mark.parametrize(
+        "engine", [pytest.param(ExtractionEngine.LXML), pytest.param(ExtractionEngine.LXML_STREAMING)]
+    )
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_engines_produce_the_same_ahb_tables(self, datafiles, engine: ExtractionEngine):
+        docx_file_path = Path(datafiles) / _docx_file_name
+        pruefis = ["11042", "11043", "11051", "99999"]
+
+        python_docx_ahb_tables = get_ahb_tables(
+            document=open_ahb_document(path=docx_file_path, engine=ExtractionEngine.PYTHON_DOCX), pruefis=pruefis
+        )
+        lxml_ahb_tables = get_ahb_tables(
+            document=open_ahb_document(path=docx_file_path, engine=engine), pruefis=pruefis
+        )
+
+        assert set(lxml_ahb_tables.keys()) == set(python_docx_ahb_tables.keys()) == {"11042", "11043", "11051"}
+        for pruefi, python_docx_ahb_table in python_docx_ahb_tables.items():
+            assert lxml_ahb_tables[pruefi].table == python_docx_ahb_table.table
@@ -0,0 +1,32 @@
+import json
+import os
+from pathlib import Path
+
+from kohlrahbi.fingerprint import get_fingerprint_of_content
+from kohlrahbi.outputmanifest import OutputManifest, write_file_if_changed
+
+
+class TestOutputManifest:
+    def test_write_file_if_changed(self, tmp_path: Path):
+        file_path = tmp_path / "11042.csv"
+        assert write_file_if_changed(file_path, b"foo") is True
+        os.utime(file_path, (0, 0))
+
+        assert write_file_if_changed(file_path, b"foo") is False
+        assert file_path.stat().st_mtime == 0
+
+        assert write_file_if_changed(file_path, b"bar") is True
+        assert file_path.read_bytes() == b"bar"
+        assert file_path.stat().st_mtime != 0
+
+    def test_save_manifest(self, tmp_path: Path):
+        file_path = tmp_path / "UTILMD" / "csv" / "11042.csv"
+        file_path.parent.mkdir(parents=True)
+        file_path.write_bytes(b"foo")
+
+        output_manifest = OutputManifest(path=tmp_path / "manifest.json")
+        output_manifest.add_file(file_path)
+        output_manifest.save()
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest == {"files": {"UTILMD/csv/11042.csv": get_fingerprint_of_content(b"foo")}}
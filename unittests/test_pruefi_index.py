@@ -0,0 +1,92 @@
+from pathlib import Path
+from typing import Optional
+
+import docx  # type:ignore[import]
+import pytest  # type:ignore[import]
+
+from kohlrahbi.fingerprint import get_fingerprint_of_file
+from kohlrahbi.pruefiindex import PruefiIndex, TableLocation
+from kohlrahbi.read_functions import get_ahb_tables
+
+
+class TestPruefiIndex:
+    def test_unknown_fingerprint(self, tmp_path: Path):
+        pruefi_index = PruefiIndex.from_file(tmp_path / "pruefi_index.json")
+        assert pruefi_index.get_table_locations("foo") == {}
+
+    def test_save_and_load(self, tmp_path: Path):
+        index_path = tmp_path / "cache" / "pruefi_index.json"
+        pruefi_index = PruefiIndex.from_file(index_path)
+        pruefi_index.add_table_locations(
+            fingerprint="abc", file_name="foo.docx", table_locations={"11042": (12, 20), "99999": None}
+        )
+        pruefi_index.save()
+
+        loaded_pruefi_index = PruefiIndex.from_file(index_path)
+
+        assert loaded_pruefi_index.get_table_locations("abc") == {"11042": (12, 20), "99999": None}
+        assert loaded_pruefi_index.get_table_locations("def") == {}
+
+    def test_broken_index_file_results_in_empty_index(self, tmp_path: Path):
+        index_path = tmp_path / "pruefi_index.json"
+        index_path.write_text("this is no json", encoding="utf-8")
+        assert PruefiIndex.from_file(index_path).entries == {}
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param("[]", id="no json object"),
+            pytest.param('{"abc": "foo"}', id="no entry object"),
+            pytest.param('{"abc": {"kohlrahbi_version": "1.0.0"}}', id="missing pruefis"),
+            pytest.param('{"abc": {"kohlrahbi_version": "1.0.0", "pruefis": {"11042": [12]}}}', id="broken location"),
+            pytest.param('{"abc": {"kohlrahbi_version": "0.9.0", "pruefis": {"11042": null}}}', id="other version"),
+        ],
+    )
+    def test_unexpected_entries_are_not_used(self, tmp_path: Path, content: str):
+        index_path = tmp_path / "pruefi_index.json"
+        index_path.write_text(content, encoding="utf-8")
+        pruefi_index = PruefiIndex.from_file(index_path)
+        pruefi_index.kohlrahbi_version = "1.0.0"
+
+        assert pruefi_index.get_table_locations("abc") == {}
+        # the entry is replaced by the next search
+        pruefi_index.add_table_locations(fingerprint="abc", file_name="foo.docx", table_locations={"11051": (3, 4)})
+        pruefi_index.save()
+
+        assert list(tmp_path.glob("*.tmp")) == []
+        loaded_pruefi_index = PruefiIndex.from_file(index_path)
+        loaded_pruefi_index.kohlrahbi_version = "1.0.0"
+        assert loaded_pruefi_index.get_table_locations("abc") == {"11051": (3, 4)}
+
+    @pytest.mark.datafiles(
+        "./unittests/docx_files/UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+    )
+    def test_reading_the_indexed_range_equals_reading_the_whole_document(self, datafiles):
+        docx_file_path = (
+            Path(datafiles)
+            / "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+        )
+        pruefis = ["11042", "11051", "99999"]
+        table_locations: dict[str, Optional[TableLocation]] = {}
+        ahb_tables = get_ahb_tables(
+            document=docx.Document(docx_file_path), pruefis=pruefis, table_locations=table_locations
+        )
+        assert set(table_locations.keys()) == {"11042", "11051", "99999"}
+        assert table_locations["99999"] is None
+
+        pruefi_index = PruefiIndex.from_file(Path(datafiles) / "pruefi_index.json")
+        fingerprint = get_fingerprint_of_file(docx_file_path)
+        pruefi_index.add_table_locations(
+            fingerprint=fingerprint,
+            file_name=docx_file_path.name,
+            table_locations=table_locations,
+        )
+        assert pruefi_index.get_table_locations(fingerprint)["99999"] is None
+
+        for pruefi, table_location in table_locations.items():
+            if table_location is None:
+                continue
+            ahb_tables_from_range = get_ahb_tables(
+                document=docx.Document(docx_file_path), pruefis=[pruefi], body_child_index_range=table_location
+            )
+            assert ahb_tables_from_range[pruefi].table == ahb_tables[pruefi].table
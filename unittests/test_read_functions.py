@@ -1,11 +1,24 @@
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 
+import docx  # type:ignore[import]
+import pandas as pd
 import pytest  # type:ignore[import]
 import pytz
+from docx.text.paragraph import Paragraph  # type:ignore[import]
 from maus.edifact import EdifactFormatVersion, get_edifact_format_version
 
-from kohlrahbi.read_functions import _get_format_version_from_ahbfile_name
+from kohlrahbi.ahb.ahbsubtable import AhbSubTable
+from kohlrahbi.ahb.stringtable import StringTable
+from kohlrahbi.read_functions import (
+    _get_format_version_from_ahbfile_name,
+    _get_heading_flags_by_style_id,
+    _is_heading,
+    get_ahb_tables,
+    get_all_paragraphs_and_tables,
+)
+from kohlrahbi.seed import Seed
 
 
 class TestReadFunctions:
@@ -27,3 +40,81 @@ class TestReadFunctions:
     def test_get_format_version_from_filename(self, filename: str, expected_result: Optional[EdifactFormatVersion]):
         actual = _get_format_version_from_ahbfile_name(filename)
         assert actual == expected_result
+
+    @pytest.mark.datafiles(
+        "./unittests/docx_files/UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+    )
+    def test_get_ahb_tables_with_several_pruefis(self, datafiles):
+        """
+        Extracting several pruefis in one walk through the document must result in the stored AHB tables
+        (which have been extracted pruefi by pruefi).
+        """
+        docx_file_path = (
+            Path(datafiles)
+            / "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+        )
+        # 11042 and 11043 share their AHB table
+        expected_table_file_names = {
+            "11042": "11042_ahb_table.json",
+            "11043": "11042_ahb_table.json",
+            "11051": "11051_ahb_table.json",
+        }
+
+        ahb_tables = get_ahb_tables(
+            document=docx.Document(docx_file_path), pruefis=["11042", "11043", "11051", "99999"]
+        )
+
+        assert set(ahb_tables.keys()) == set(expected_table_file_names.keys())
+        for pruefi, expected_table_file_name in expected_table_file_names.items():
+            expected_table = pd.read_json(
+                Path(__file__).parent / "dataframes" / expected_table_file_name, orient="records", dtype=False
+            )
+            assert ahb_tables[pruefi].table == StringTable.from_dataframe(expected_table)
+
+    @pytest.mark.datafiles(
+        "./unittests/docx_files/UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+    )
+    def test_get_ahb_tables_with_a_table_which_cannot_be_parsed(self, datafiles, monkeypatch):
+        """
+        If the table of one Prüfidentifikator cannot be parsed, the other Prüfidentifikatoren are still returned.
+        """
+        docx_file_path = (
+            Path(datafiles)
+            / "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+        )
+        expected_table = pd.read_json(
+            Path(__file__).parent / "dataframes" / "11051_ahb_table.json", orient="records", dtype=False
+        )
+        from_table_with_header = AhbSubTable.from_table_with_header
+
+        def from_table_with_header_which_fails_for_11042(docx_table, **kwargs):
+            # 11042 and 11043 start in the same table
+            if "11042" in Seed.from_table(docx_table=docx_table).pruefidentifikatoren:
+                raise NotImplementedError("Could not define row type of cell")
+            return from_table_with_header(docx_table=docx_table, **kwargs)
+
+        monkeypatch.setattr(AhbSubTable, "from_table_with_header", from_table_with_header_which_fails_for_11042)
+
+        ahb_tables = get_ahb_tables(document=docx.Document(docx_file_path), pruefis=["11042", "11043", "11051"])
+
+        assert set(ahb_tables.keys()) == {"11051"}
+        assert ahb_tables["11051"].table == StringTable.from_dataframe(expected_table)
+
+    @pytest.mark.datafiles(
+        "./unittests/docx_files/UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+    )
+    def test_is_heading_equals_style_name_check(self, datafiles):
+        """
+        The lookup of the raw style id in the heading flags of the document must detect the same headings
+        as the style names which are resolved by python-docx.
+        """
+        document = docx.Document(
+            Path(datafiles)
+            / "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+        )
+        heading_flags_by_style_id = _get_heading_flags_by_style_id(document)
+        assert heading_flags_by_style_id is not None
+        paragraphs = [item for item in get_all_paragraphs_and_tables(parent=document) if isinstance(item, Paragraph)]
+        actual = [_is_heading(paragraph, heading_flags_by_style_id) for paragraph in paragraphs]
+        assert actual == ["Heading" in paragraph.style.name for paragraph in paragraphs]
+        assert any(actual)
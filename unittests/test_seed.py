@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import docx  # type:ignore[import]
+import pytest  # type:ignore[import]
+from docx.table import Table  # type:ignore[import]
+
+from kohlrahbi import seed
+from kohlrahbi.enums import RowType
+from kohlrahbi.read_functions import does_the_table_contain_pruefidentifikatoren, get_all_paragraphs_and_tables
+from kohlrahbi.seed import AhbTableHeaderCache, Seed, _read_ahb_table_header, get_tabstop_positions
+
+_docx_file_name = "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+
+
+class TestSeed:
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_seed_from_table_header_equals_seed_from_cell_grid(self, datafiles):
+        """
+        The header sniffer reads the header directly from the table xml.
+        It has to return the same values as reading the header from the python-docx cell grid.
+        """
+        document = docx.Document(Path(datafiles) / _docx_file_name)
+        number_of_header_tables = 0
+        for item in get_all_paragraphs_and_tables(parent=document):
+            if not isinstance(item, Table):
+                continue
+            assert does_the_table_contain_pruefidentifikatoren(table=item) == (
+                item.cell(row_idx=0, col_idx=0).text.strip() == "EDIFACT Struktur"
+            )
+            if not does_the_table_contain_pruefidentifikatoren(table=item):
+                continue
+            number_of_header_tables += 1
+            seed = Seed.from_table(docx_table=item)
+
+            last_header_cell_text = item.row_cells(0)[-1].text
+            expected_pruefis = last_header_cell_text[
+                last_header_cell_text.find("Prüfidentifikator") + 1 + len("Prüfidentifikator") :
+            ].split("\t")
+            assert seed.pruefidentifikatoren == expected_pruefis
+            assert (
+                seed.edifact_struktur_left_indent_position
+                == item.cell(row_idx=4, col_idx=0).paragraphs[0].paragraph_format.left_indent
+            )
+            middle_cell_indicator_paragraph = item.cell(row_idx=4, col_idx=1).paragraphs[0]
+            assert seed.middle_cell_left_indent_position == middle_cell_indicator_paragraph.paragraph_format.left_indent
+            assert seed.tabstop_positions == get_tabstop_positions(middle_cell_indicator_paragraph)
+        assert number_of_header_tables > 0
+
+    @pytest.mark.datafiles(f"./unittests/docx_files/{_docx_file_name}")
+    def test_table_header_is_read_once_per_table(self, datafiles, monkeypatch):
+        document = docx.Document(Path(datafiles) / _docx_file_name)
+        header_table = next(
+            item
+            for item in get_all_paragraphs_and_tables(parent=document)
+            if isinstance(item, Table) and does_the_table_contain_pruefidentifikatoren(table=item)
+        )
+        read_tables: list = []
+
+        def read_ahb_table_header_and_record_table(table):
+            read_tables.append(table)
+            return _read_ahb_table_header(table)
+
+        monkeypatch.setattr(seed, "_read_ahb_table_header", read_ahb_table_header_and_record_table)
+        table_header_cache = AhbTableHeaderCache()
+
+        first_seed = Seed.from_table(docx_table=header_table, table_header_cache=table_header_cache)
+        first_seed.last_two_row_types[0] = RowType.HEADER
+        second_seed = Seed.from_table(docx_table=header_table, table_header_cache=table_header_cache)
+
+        assert read_tables == [header_table]
+        # the seeds are independent of each other, because they are modified during the parsing
+        assert second_seed.last_two_row_types == [RowType.EMPTY, RowType.EMPTY]
+        assert second_seed.pruefidentifikatoren == first_seed.pruefidentifikatoren
+        # without a cache the header is read again
+        assert Seed.from_table(docx_table=header_table) == second_seed
+        assert read_tables == [header_table, header_table]
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest  # type:ignore[import]
+
+from kohlrahbi.ahb.stringtable import StringTable
+
+
+class TestStringTable:
+    """
+    All tests regarding the StringTable class
+    """
+
+    def test_dataframe_round_trip(self):
+        dataframe = pd.DataFrame({"Segment": ["UNH", "BGM"], "Datenelement": ["0062", ""]})
+
+        table = StringTable.from_dataframe(dataframe)
+
+        assert table == StringTable(column_headers=["Segment", "Datenelement"], rows=[["UNH", "0062"], ["BGM", ""]])
+        assert table.to_dataframe().equals(dataframe)
+
+    def test_from_dataframe_with_missing_values(self):
+        dataframe = pd.DataFrame({"Segment": ["UNH", None], "Datenelement": [float("nan"), "0062"]})
+
+        assert StringTable.from_dataframe(dataframe).rows == [["UNH", ""], ["", "0062"]]
+
+    def test_column(self):
+        table = StringTable(column_headers=["Segment", "Datenelement"], rows=[["UNH", "0062"], ["BGM", ""]])
+
+        assert len(table) == 2
+        assert table.column("Datenelement") == ["0062", ""]
+        with pytest.raises(KeyError):
+            table.column("Codes und Qualifier")
+
+    def test_copy_does_not_share_rows(self):
+        table = StringTable(column_headers=["Segment"], rows=[["UNH"]])
+
+        table_copy = table.copy()
+        table_copy.rows[0][0] = "BGM"
+
+        assert table.rows == [["UNH"]]
+
+    @pytest.mark.parametrize(
+        "other, expected",
+        [
+            pytest.param(
+                StringTable(column_headers=["Segment", "Datenelement"], rows=[["BGM", ""]]),
+                StringTable(column_headers=["Segment", "Datenelement"], rows=[["UNH", "0062"], ["BGM", ""]]),
+                id="same columns",
+            ),
+            pytest.param(
+                StringTable(column_headers=["Datenelement", "Codes und Qualifier"], rows=[["1001", "E01"]]),
+                StringTable(
+                    column_headers=["Segment", "Datenelement", "Codes und Qualifier"],
+                    rows=[["UNH", "0062", ""], ["", "1001", "E01"]],
+                ),
+                id="different columns",
+            ),
+        ],
+    )
+    def test_extend(self, other: StringTable, expected: StringTable):
+        table = StringTable(column_headers=["Segment", "Datenelement"], rows=[["UNH", "0062"]])
+
+        other_rows = other.copy().rows
+
+        table.extend(other)
+
+        assert table == expected
+        # the rows are copied, so modifying them does not affect the other table
+        table.rows[-1][-1] = "modified"
+        assert other.rows == other_rows
@@ -1,8 +1,17 @@
+from pathlib import Path
+from uuid import uuid4
+
+import docx  # type:ignore[import]
+import pandas as pd
+import pytest  # type:ignore[import]
 from maus.models.anwendungshandbuch import AhbLine, AhbMetaInformation, FlatAnwendungshandbuch
 
+from kohlrahbi.ahb.stringtable import StringTable
+from kohlrahbi.enums import FlatAhbRowType
+from kohlrahbi.read_functions import get_ahb_table
 from kohlrahbi.unfoldedahb import UnfoldedAhbTableMetaData
 from kohlrahbi.unfoldedahb.unfoldedahbline import UnfoldedAhbLine
-from kohlrahbi.unfoldedahb.unfoldedahbtable import UnfoldedAhb
+from kohlrahbi.unfoldedahb.unfoldedahbtable import UnfoldedAhb, _keep_guids_of_unchanged_lines_stable
 
 
 class TestUnfoldedAhbTable:
@@ -13,8 +22,70 @@ class TestUnfoldedAhbTable:
     def test_from_ahb_table(self):
         pass
 
-    def test_get_section_name(self):
-        pass
+    @pytest.mark.datafiles(
+        "./unittests/docx_files/UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+    )
+    def test_from_ahb_table_multi_equals_from_ahb_table(self, datafiles):
+        """
+        Unfolding all pruefis of an AHB table at once must result in the same unfolded AHBs as unfolding each pruefi
+        on its own.
+        """
+        docx_file_path = (
+            Path(datafiles)
+            / "UTILMDAHBWiM-informatorischeLesefassung3.1eKonsolidierteLesefassungmitFehlerkorrekturenStand25.10.2022_20230930_20221025.docx"
+        )
+        pruefis = ["11042", "11043", "11044"]
+        ahb_table = get_ahb_table(document=docx.Document(docx_file_path), pruefi="11042")
+        assert ahb_table is not None
+
+        unfolded_ahbs = UnfoldedAhb.from_ahb_table_multi(ahb_table=ahb_table, pruefis=pruefis)
+
+        assert list(unfolded_ahbs.keys()) == pruefis
+        for pruefi in pruefis:
+            assert unfolded_ahbs[pruefi] == UnfoldedAhb.from_ahb_table(ahb_table=ahb_table, pruefi=pruefi)
+        assert unfolded_ahbs["11042"].unfolded_ahb_lines != unfolded_ahbs["11043"].unfolded_ahb_lines
+
+    def test_get_section_names(self):
+        segment_gruppe = ["Nachrichten-Kopfsegment", "", "SG2", "MP-ID Absender", "SG2", ""]
+
+        section_names = UnfoldedAhb._get_section_names(segment_gruppe=segment_gruppe)
+
+        assert section_names == [
+            "Nachrichten-Kopfsegment",
+            "Nachrichten-Kopfsegment",
+            "Nachrichten-Kopfsegment",
+            "MP-ID Absender",
+            "MP-ID Absender",
+            "MP-ID Absender",
+        ]
+
+    def test_get_row_types(self):
+        ahb_table = StringTable.from_dataframe(
+            pd.DataFrame(
+                {
+                    "Segment Gruppe": ["Nachrichten-Kopfsegment", "", "", "SG2", "SG2", "SG2", "", ""],
+                    "Segment": ["", "UNH", "UNH", "", "NAD", "NAD", "", ""],
+                    "Datenelement": ["", "", "0062", "", "", "3035", "", ""],
+                    "Codes und Qualifier": ["", "", "", "", "", "MR", "MS", ""],
+                    "Beschreibung": ["", "", "", "", "", "Nachrichtenempfänger", "Absender", ""],
+                    "11042": ["", "Muss", "X", "Muss", "Muss", "X", "X", "X"],
+                    "Bedingung": ["", "", "", "", "", "", "", ""],
+                }
+            )
+        )
+
+        row_types = UnfoldedAhb._get_row_types(table=ahb_table)
+
+        assert row_types == [
+            FlatAhbRowType.SECTIONNAME,
+            FlatAhbRowType.OTHER,
+            FlatAhbRowType.DATAELEMENT,
+            FlatAhbRowType.SEGMENTGROUP,
+            FlatAhbRowType.SEGMENT,
+            FlatAhbRowType.DATAELEMENT,
+            FlatAhbRowType.VALUEPOOLENTRY,
+            FlatAhbRowType.OTHER,
+        ]
 
     def test_is_section_name(self):
         pass
@@ -171,5 +242,80 @@ class TestUnfoldedAhbTable:
 
         assert expected_flat_ahb == flat_ahb
 
+    def test_convert_to_flat_ahb_with_deterministic_guids(self) -> None:
+        unfolded_ahb_lines = [
+            UnfoldedAhbLine(
+                index=index,
+                segment_name="Nachrichten-Kopfsegment",
+                segment_gruppe=None,
+                segment="UNH",
+                datenelement=datenelement,
+                code=None,
+                qualifier="",
+                beschreibung=None,
+                bedinung_ausdruck="X",
+                bedingung=None,
+            )
+            for index, datenelement in enumerate(["0062", "0065", "0065"])
+        ]
+
+        def get_guids(pruefi: str) -> list:
+            unfolded_ahb = UnfoldedAhb(
+                meta_data=UnfoldedAhbTableMetaData(pruefidentifikator=pruefi), unfolded_ahb_lines=unfolded_ahb_lines
+            )
+            return [line.guid for line in unfolded_ahb.convert_to_flat_ahb(deterministic_guids=True).lines]
+
+        guids = get_guids("11042")
+        assert guids == get_guids("11042")
+        assert len(set(guids)) == len(guids)
+        assert set(guids).isdisjoint(get_guids("11043"))
+
     def test_convert_to_dataframe(self):
         pass
+
+
+class TestKeepGuidsOfUnchangedLinesStable:
+    """
+    Tests regarding the reuse of the guids of an existing flat AHB
+    """
+
+    @staticmethod
+    def _create_ahb_line(segment_code: str, ahb_expression: str = "Muss") -> AhbLine:
+        return AhbLine(
+            guid=uuid4(),
+            section_name="Nachrichten-Kopfsegment",
+            segment_group_key=None,
+            segment_code=segment_code,
+            data_element=None,
+            value_pool_entry=None,
+            name=None,
+            ahb_expression=ahb_expression,
+            index=0,
+        )
+
+    def test_keep_guids_of_unchanged_lines_stable(self):
+        meta = AhbMetaInformation(pruefidentifikator="11042")
+        existing_lines = [self._create_ahb_line(segment_code) for segment_code in ["UNH", "BGM", "DTM", "BGM", "UNT"]]
+        existing_ahb = FlatAnwendungshandbuch(meta=meta, lines=existing_lines)
+        updated_lines = [
+            self._create_ahb_line("UNH"),
+            self._create_ahb_line("BGM", ahb_expression="Kann"),  # changed
+            self._create_ahb_line("DTM"),
+            self._create_ahb_line("BGM"),
+            # the only unmatched existing BGM line is before the last match, so this line gets no existing guid
+            self._create_ahb_line("BGM"),
+            self._create_ahb_line("UNT"),
+        ]
+        new_guids = [line.guid for line in updated_lines]
+        updated_ahb = FlatAnwendungshandbuch(meta=meta, lines=updated_lines)
+
+        _keep_guids_of_unchanged_lines_stable(updated_ahb, existing_ahb)
+
+        assert [line.guid for line in updated_ahb.lines] == [
+            existing_lines[0].guid,
+            new_guids[1],
+            existing_lines[2].guid,
+            existing_lines[3].guid,
+            new_guids[4],
+            existing_lines[4].guid,
+        ]